@@ -0,0 +1,19 @@
+from knucklebones_ml.simulation import Entrant, run_tournament
+
+ENTRANTS = {
+    "random": Entrant("RandomAgent"),
+    "column_fill": Entrant("ColumnFillAgent"),
+    "sequential": Entrant("SequentialAgent"),
+    "aggressive": Entrant("AggressiveAgent"),
+    "expectimax_1": Entrant("ExpectimaxAgent", {"depth": 1}),
+}
+
+if __name__ == "__main__":
+    # Rerunning after an interruption only plays the missing matchups
+    result = run_tournament(
+        ENTRANTS,
+        games_per_matchup=200,
+        seed=0,
+        checkpoint_path="tournament_checkpoint.json",
+    )
+    print(result.to_dataframe().round(1).to_string(index=False))
@@ -0,0 +1,26 @@
+import tempfile
+import time
+from pathlib import Path
+
+from knucklebones_ml import tablebase
+from knucklebones_ml.data import DatasetReader, generate_dataset
+from knucklebones_ml.simulation import Entrant
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory)
+        generate_dataset(
+            Entrant("SmartAgent"), Entrant("RandomAgent"), path, 500, seed=0
+        )
+        boards = DatasetReader(path).read(["board"])["board"]
+
+        for max_empty in range(1, 4):
+            start = time.perf_counter()
+            stats = tablebase.generate_tablebase(
+                path / f"tablebase-{max_empty}.npy", boards, max_empty
+            )
+            print(
+                f"K={max_empty}: {stats['entries']:,} entries, "
+                f"{stats['bytes'] / 1024:,.0f} KiB, {stats['exact']:.1%} exact, "
+                f"{time.perf_counter() - start:.1f}s"
+            )
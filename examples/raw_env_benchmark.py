@@ -0,0 +1,35 @@
+import time
+
+import numpy as np
+
+from knucklebones_ml import env, raw_env
+from knucklebones_ml._env import KnucklebonesEnv
+
+
+def play_games(game_env: KnucklebonesEnv, num_games: int) -> tuple[float, int]:
+    rng = np.random.default_rng(0)
+    num_steps = 0
+
+    start = time.perf_counter()
+    for _ in range(num_games):
+        game_env.reset()
+        for _ in game_env.agent_iter():
+            obs, _, terminated, truncated, _ = game_env.last()
+            if terminated or truncated:
+                game_env.step(None)
+                continue
+            game_env.step(rng.choice(np.flatnonzero(obs["action_mask"])))
+            num_steps += 1
+    elapsed = time.perf_counter() - start
+
+    return elapsed, num_steps
+
+
+if __name__ == "__main__":
+    num_games = 2000
+    for name, game_env in (("env()", env()), ("raw_env()", raw_env())):
+        elapsed, num_steps = play_games(game_env, num_games)
+        print(
+            f"{name:<10} {num_games / elapsed:>8,.0f} games/sec "
+            f"{num_steps / elapsed:>10,.0f} steps/sec"
+        )
@@ -0,0 +1,48 @@
+import time
+
+import numpy as np
+
+from knucklebones_ml import VectorKnucklebonesEnv, env
+
+
+def benchmark_single_env(num_steps: int = 20_000) -> float:
+    game_env = env()
+    game_env.reset(seed=0)
+    rng = np.random.default_rng(0)
+
+    start = time.perf_counter()
+    for _ in range(num_steps):
+        obs, _, terminated, truncated, _ = game_env.last()
+        if terminated or truncated:
+            game_env.reset()
+            continue
+        game_env.step(rng.choice(np.flatnonzero(obs["action_mask"])))
+    elapsed = time.perf_counter() - start
+
+    return num_steps / elapsed
+
+
+def benchmark_vector_env(num_envs: int = 4096, num_steps: int = 200) -> float:
+    vector_env = VectorKnucklebonesEnv(num_envs)
+    obs = vector_env.reset(seed=0)
+    rng = np.random.default_rng(0)
+
+    start = time.perf_counter()
+    for _ in range(num_steps):
+        actions = np.argmax(obs["action_mask"] * rng.random((num_envs, 3)), axis=1)
+        obs, *_ = vector_env.step(actions)
+    elapsed = time.perf_counter() - start
+
+    return num_envs * num_steps / elapsed
+
+
+if __name__ == "__main__":
+    single = benchmark_single_env()
+    print(f"KnucklebonesEnv:       {single:>12,.0f} steps/sec")
+
+    for num_envs in (64, 1024, 4096, 16384):
+        vector = benchmark_vector_env(num_envs)
+        print(
+            f"VectorKnucklebonesEnv: {vector:>12,.0f} steps/sec "
+            f"({num_envs} games, {vector / single:.1f}x)"
+        )
@@ -2,10 +2,42 @@ r"""
 Knucklebones ML - Machine learning module for dice game \"Knucklebones\".
 
 This package provides a PettingZoo environment with render functionality,
-core game logic and example agents.
+core game logic, example agents and tools to simulate matchups.
 """
 
-from knucklebones_ml import agents, ui
-from knucklebones_ml._env import KnucklebonesEnv, env, logic
+from knucklebones_ml import agents, data, simulation, ui
+from knucklebones_ml._env import (
+    DiceStream,
+    EnvProfiler,
+    KnucklebonesEnv,
+    KnucklebonesGymEnv,
+    VectorKnucklebonesEnv,
+    env,
+    features,
+    logic,
+    packing,
+    raw_env,
+    symmetry,
+    tablebase,
+    transitions,
+)
 
-__all__ = ["KnucklebonesEnv", "agents", "env", "logic", "ui"]
+__all__ = [
+    "DiceStream",
+    "EnvProfiler",
+    "KnucklebonesEnv",
+    "KnucklebonesGymEnv",
+    "VectorKnucklebonesEnv",
+    "agents",
+    "data",
+    "env",
+    "features",
+    "logic",
+    "packing",
+    "raw_env",
+    "simulation",
+    "symmetry",
+    "tablebase",
+    "transitions",
+    "ui",
+]
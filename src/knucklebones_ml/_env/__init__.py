@@ -1,4 +1,33 @@
 from knucklebones_ml._env import core_logic as logic
-from knucklebones_ml._env.knucklebones_environment import KnucklebonesEnv, env
+from knucklebones_ml._env import (
+    features,
+    packing,
+    symmetry,
+    tablebase,
+    transitions,
+)
+from knucklebones_ml._env.dice import DiceStream
+from knucklebones_ml._env.gym_environment import KnucklebonesGymEnv
+from knucklebones_ml._env.knucklebones_environment import (
+    KnucklebonesEnv,
+    env,
+    raw_env,
+)
+from knucklebones_ml._env.profiling import EnvProfiler
+from knucklebones_ml._env.vector_environment import VectorKnucklebonesEnv
 
-__all__ = ["KnucklebonesEnv", "env", "logic"]
+__all__ = [
+    "DiceStream",
+    "EnvProfiler",
+    "KnucklebonesEnv",
+    "KnucklebonesGymEnv",
+    "VectorKnucklebonesEnv",
+    "env",
+    "features",
+    "logic",
+    "packing",
+    "raw_env",
+    "symmetry",
+    "tablebase",
+    "transitions",
+]
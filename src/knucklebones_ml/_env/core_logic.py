@@ -8,6 +8,7 @@ This module contains vectorized numpy functions for:
  - Initializing the game board
  - Determining valid actions, score, and game over status for a given board state
  - Applying a turn action to the board
+ - Batched variants of the above operating on a leading board dimension
 """
 
 from typing import SupportsInt
@@ -20,24 +21,57 @@ def get_board(size_x: SupportsInt, size_y: SupportsInt) -> np.ndarray:
     return np.zeros((2, int(size_x), int(size_y)), dtype=np.int16)
 
 
+def _build_column_tables() -> tuple[np.ndarray, np.ndarray]:
+    """Enumerate every column state and compute its cells and score."""
+    codes = np.arange(COLUMN_STATES)
+    cells = (codes[:, None] // COLUMN_WEIGHTS[:, 0]) % 7
+    scores = np.zeros(COLUMN_STATES, dtype=np.int16)
+    for die in range(1, 7):
+        column_counts = (cells == die).sum(axis=1)
+        scores += die * column_counts**2
+    return cells.astype(np.int16), scores
+
+
+# Every 3-cell column is encoded in base 7, (top, middle, bottom) -> code
+COLUMN_STATES = 7**3
+COLUMN_WEIGHTS = np.array([[49], [7], [1]], dtype=np.int16)
+COLUMN_CELLS, COLUMN_SCORES = _build_column_tables()
+
+
+def encode_columns(board: np.ndarray) -> np.ndarray:
+    """
+    Encode every column of a board or a batch of boards as an integer code.
+
+    Columns are read as base 7 numbers from top to bottom, giving codes in
+    [0, COLUMN_STATES). Boards must have 3 rows.
+
+    Returns:
+        A numpy array of shape (..., num_players, num_columns) containing the codes.
+
+    """
+    return (board * COLUMN_WEIGHTS).sum(axis=-2, dtype=np.int16)
+
+
+def decode_columns(codes: np.ndarray) -> np.ndarray:
+    """Decode column codes of shape (..., 2, y) into boards of shape (..., 2, 3, y)."""
+    return np.moveaxis(COLUMN_CELLS[codes], -1, -2)
+
+
 def evaluate_column_scores(board: np.ndarray) -> np.ndarray:
     """
     Calculate the score for each column of each player on the board.
 
     Scores are computed by summing the contributions from each die value (1-6),
     where each die value contributes (die_value * count^2) to the column score
-    and count is the number of dice in that column.
+    and count is the number of dice in that column. The scores of all column states
+    are precomputed in COLUMN_SCORES, so scoring is a single lookup.
 
     Returns:
         A 2D numpy array of shape (num_players, num_columns) containing the
         calculated scores for each player's columns.
 
     """
-    scores = np.zeros((2, board.shape[2]), dtype=np.int16)
-    for die in range(1, 7):
-        column_counts = (board == die).sum(axis=1)
-        scores += die * column_counts**2
-    return scores
+    return COLUMN_SCORES[encode_columns(board)]
 
 
 def evaluate_board_scores(board: np.ndarray) -> np.ndarray:
@@ -48,11 +82,7 @@ def evaluate_board_scores(board: np.ndarray) -> np.ndarray:
         A 1D numpy array of length 2 containing the scores for each player.
 
     """
-    scores = np.zeros(2, dtype=np.int16)
-    for die in range(1, 7):
-        column_counts = (board == die).sum(axis=1)
-        scores += (die * column_counts**2).sum(axis=1)
-    return scores
+    return COLUMN_SCORES[encode_columns(board)].sum(axis=-1, dtype=np.int16)
 
 
 def get_valid_actions(board: np.ndarray) -> np.ndarray:
@@ -98,27 +128,20 @@ def apply_action(
     side = int(side)
     action = int(action)
 
-    board_side = board[side]
     # Find the lowest empty cell in the specified column
-    col = board_side[:, action]
-    empty_indices = np.flatnonzero(col == 0)
-    try:
-        idx = empty_indices[-1]  # Bottom-most zero
-        col[idx] = die
-    except IndexError as e:
+    col = board[side, :, action]
+    is_empty = col == 0
+    if not is_empty.any():
         msg = f"Column {action} is full."
-        raise ValueError(msg) from e
-
-    # Delete Enemy Dice
-    enemy_side = board[1 - side]
-    enemy_col = enemy_side[:, action]
-    remaining_dice = enemy_col[(enemy_col != die) & (enemy_col != 0)]
-    num_zeros = enemy_col.size - remaining_dice.size
+        raise ValueError(msg)
+    col[col.size - 1 - is_empty[::-1].argmax()] = die  # Bottom-most zero
 
-    # Reconstruct the column: Zeros on top, remaining dice on bottom
-    enemy_side[:, action] = np.concatenate(
-        [np.zeros(num_zeros, dtype=np.int16), remaining_dice],
-    )
+    # Delete Enemy Dice, a stable sort moves the remaining dice to the bottom
+    enemy_col = board[1 - side, :, action]
+    remaining = (enemy_col != die) & (enemy_col != 0)
+    enemy_col[:] = np.where(remaining, enemy_col, 0)[
+        np.argsort(remaining, kind="stable")
+    ]
 
     return board
 
@@ -126,3 +149,104 @@ def apply_action(
 def board_is_full(board: np.ndarray) -> bool:
     """Check if either side of the board is full."""
     return bool(np.all(board[0, 0, :] != 0)) or bool(np.all(board[1, 0, :] != 0))
+
+
+def get_boards(
+    num_boards: SupportsInt, size_x: SupportsInt, size_y: SupportsInt
+) -> np.ndarray:
+    """Initialize a 4D numpy array of empty boards with shape (n, 2, x, y)."""
+    return np.zeros((int(num_boards), 2, int(size_x), int(size_y)), dtype=np.int16)
+
+
+def evaluate_column_scores_batch(boards: np.ndarray) -> np.ndarray:
+    """
+    Calculate the score for each column of each player on a batch of boards.
+
+    Returns:
+        A 3D numpy array of shape (num_boards, num_players, num_columns) containing
+        the calculated scores for each player's columns on every board.
+
+    """
+    return COLUMN_SCORES[encode_columns(boards)]
+
+
+def evaluate_board_scores_batch(boards: np.ndarray) -> np.ndarray:
+    """
+    Calculate the scores for each player on a batch of boards.
+
+    Returns:
+        A 2D numpy array of shape (num_boards, 2) containing the scores for each
+        player on every board.
+
+    """
+    return COLUMN_SCORES[encode_columns(boards)].sum(axis=-1, dtype=np.int16)
+
+
+def get_valid_actions_batch(boards: np.ndarray) -> np.ndarray:
+    """
+    Determine valid actions for a batch of board states.
+
+    Returns:
+        A 3D numpy array of shape (num_boards, num_players, num_columns) where a value
+        is 1 if the column is a valid action (has empty space), 0 otherwise.
+
+    """
+    return (boards[:, :, 0, :] == 0).astype(np.int8)
+
+
+def apply_action_batch(
+    dice: np.ndarray, boards: np.ndarray, sides: np.ndarray, actions: np.ndarray
+) -> np.ndarray:
+    """
+    Apply one die placement action to every board of a batch.
+
+    Batched equivalent of `apply_action`: board `i` receives `dice[i]` in column
+    `actions[i]` of side `sides[i]`, and the matching enemy dice in that column are
+    removed. All boards are processed at once without a Python loop.
+
+    Args:
+        dice (np.ndarray): The die values being placed, shape (n,) or scalar.
+        boards (np.ndarray): A 4D array of boards with shape (n, 2, 3, 3).
+        sides (np.ndarray): The player side (0 or 1) of each placement,
+            shape (n,) or scalar.
+        actions (np.ndarray): The column index of each placement,
+            shape (n,) or scalar.
+
+    Returns:
+        np.ndarray: The updated boards, modified in place.
+
+    Raises:
+        ValueError: If any of the specified columns is completely full.
+
+    """
+    index = np.arange(boards.shape[0])
+    dice = np.broadcast_to(np.asarray(dice, dtype=np.int16), index.shape)
+    sides = np.broadcast_to(np.asarray(sides, dtype=np.intp), index.shape)
+    actions = np.broadcast_to(np.asarray(actions, dtype=np.intp), index.shape)
+
+    # Find the lowest empty cell in the specified columns
+    cols = boards[index, sides, :, actions]
+    is_empty = cols == 0
+    full = ~is_empty.any(axis=1)
+    if full.any():
+        first = full.argmax()
+        msg = f"Column {actions[first]} is full on board {first}."
+        raise ValueError(msg)
+    rows = cols.shape[1] - 1 - is_empty[:, ::-1].argmax(axis=1)  # Bottom-most zero
+    boards[index, sides, rows, actions] = dice
+
+    # Delete Enemy Dice, a stable sort moves the remaining dice to the bottom
+    enemy_sides = 1 - sides
+    enemy_cols = boards[index, enemy_sides, :, actions]
+    remaining = (enemy_cols != dice[:, None]) & (enemy_cols != 0)
+    order = np.argsort(remaining, axis=1, kind="stable")
+    boards[index, enemy_sides, :, actions] = np.take_along_axis(
+        np.where(remaining, enemy_cols, 0), order, axis=1
+    )
+
+    return boards
+
+
+def board_is_full_batch(boards: np.ndarray) -> np.ndarray:
+    """Check, for every board of a batch, if either side of the board is full."""
+    return (boards[:, :, 0, :] != 0).all(axis=2).any(axis=1)
@@ -0,0 +1,119 @@
+"""
+Block-prefetched dice rolls for the Knucklebones environment.
+
+A `DiceStream` draws raw 64-bit words from a PCG64DXSM bit generator in blocks and
+turns every byte below 252 into a die, rejecting the 4 others so that the 6 faces
+stay equally likely. Rolling a die is then a read from the current block.
+
+Every seed selects a substream of a single fixed bit generator, jumped ahead by
+the seed times the step of `PCG64DXSM.jumped`, so reseeding is one `advance` of the
+bit generator, without building a new generator or hashing the seed. Substreams of
+different seeds are far apart, and the dice of a seed only depend on that seed.
+"""
+
+from __future__ import annotations
+
+import operator
+import sys
+
+import numpy as np
+
+# Step of `PCG64DXSM.jumped`, 2**128 times the golden ratio minus 1
+_JUMP = 0x9E3779B97F4A7C15F39CC0605CEDC835
+_PERIOD = 2**128
+
+# Die of every byte, 0 for the rejected bytes above the largest multiple of 6
+_BYTE_DICE = np.zeros(256, dtype=np.int16)
+_BYTE_DICE[:252] = np.arange(252) % 6 + 1
+
+
+class DiceStream:
+    """A reproducible stream of dice rolls, drawn in blocks."""
+
+    def __init__(
+        self,
+        seed: int | np.random.SeedSequence | None = None,
+        block_size: int = 256,
+    ) -> None:
+        """
+        Initialize the stream.
+
+        Args:
+            seed (int | np.random.SeedSequence | None): The seed of the stream, see
+                `reseed`.
+            block_size (int): Number of bytes drawn at once, each giving a die with
+                probability 63/64. Rounded up to a multiple of 8.
+
+        """
+        if block_size < 1:
+            msg = "block_size must be at least 1."
+            raise ValueError(msg)
+        self.block_size = block_size
+        self._words = -(-block_size // 8)
+        self._bit_generator = np.random.PCG64DXSM(0)
+        self._position = 0
+        self._dice = _BYTE_DICE[:0]
+        self._index = 0
+        self.reseed(seed)
+
+    def reseed(self, seed: int | np.random.SeedSequence | None = None) -> None:
+        """
+        Restart the stream at the substream of a seed.
+
+        Args:
+            seed (int | np.random.SeedSequence | None): A non-negative integer,
+                selecting the substream directly, or a SeedSequence, whose first
+                128 bits of state select it. Defaults to None, a substream picked
+                from fresh entropy.
+
+        """
+        if seed is None:
+            seed = np.random.SeedSequence()
+        if isinstance(seed, np.random.SeedSequence):
+            low, high = seed.generate_state(2, np.uint64)
+            seed = int(high) << 64 | int(low)
+        # NumPy integers would overflow in the jump arithmetic
+        seed = operator.index(seed)
+        if seed < 0:
+            msg = f"Seed must be non-negative, got {seed}."
+            raise ValueError(msg)
+
+        position = seed * _JUMP % _PERIOD
+        self._bit_generator.advance((position - self._position) % _PERIOD)
+        self._position = position
+        self._dice = _BYTE_DICE[:0]
+        self._index = 0
+
+    def roll(self) -> np.int16:
+        """Roll the next die."""
+        index = self._index
+        if index >= len(self._dice):
+            self._refill()
+            index = 0
+        self._index = index + 1
+        return self._dice[index]
+
+    def peek(self, n: int) -> np.ndarray:
+        """
+        Return the next dice without rolling them.
+
+        Args:
+            n (int): Number of dice.
+
+        Returns:
+            np.ndarray: The next `n` dice that `roll` returns, as int16.
+
+        """
+        while len(self._dice) - self._index < n:
+            self._refill()
+        return self._dice[self._index : self._index + n].copy()
+
+    def _refill(self) -> None:
+        """Append a new block to the dice left in the current one."""
+        words = self._bit_generator.random_raw(self._words)
+        self._position = (self._position + self._words) % _PERIOD
+        if sys.byteorder == "big":
+            words = words.byteswap()
+        dice = _BYTE_DICE[words.view(np.uint8)]
+        self._dice = np.concatenate((self._dice[self._index :], dice[dice != 0]))
+        self._index = 0
@@ -0,0 +1,128 @@
+"""
+Neural network feature encodings for Knucklebones observations.
+
+Observations are encoded into flat float32 vectors of FEATURE_SIZE features, from
+the perspective of the player to move. Everything that only depends on a single
+column is read from a table indexed by column code (see
+`core_logic.encode_columns`), so encoding is a few table gathers, and the features
+can be written into a caller-supplied array to avoid allocations in training loops.
+
+Layout of a feature vector:
+ - [0:192]: COLUMN_FEATURES features for each of the 6 columns, in board order
+   (side, column), own side first. For each column:
+   - [0:18]: One-hot cells, a 6 x 3 plane of (face, row), rows from top to bottom.
+   - [18:24]: The count of each face in the column, divided by 3.
+   - [24]: The number of dice in the column, divided by 3.
+   - [25]: The score of the column, divided by 54.
+   - [26:32]: The points the column loses if the other player places each face in
+     the facing column (kill threats), divided by 54.
+ - [192:198]: One-hot die.
+ - [198:201]: The points gained by placing the die in each own column, divided
+   by 54.
+ - [201:204]: The points removed from each enemy column by placing the die in the
+   facing column, divided by 54, or 0 if that column is full.
+ - [204:206]: The scores of both sides, divided by 162.
+ - [206]: The score margin of the player to move, divided by 162.
+ - [207:210]: The action mask.
+"""
+
+import numpy as np
+
+from knucklebones_ml._env import core_logic as logic
+from knucklebones_ml._env import transitions
+
+COLUMN_FEATURES = 32
+FEATURE_SIZE = 6 * COLUMN_FEATURES + 18
+
+_MAX_COLUMN_SCORE = 54
+_MAX_SCORE = 3 * _MAX_COLUMN_SCORE
+_FACES = np.arange(1, 7)
+
+
+def _build_column_table() -> np.ndarray:
+    """Compute the features of every column code."""
+    cells = logic.COLUMN_CELLS
+    one_hot = cells[:, None, :] == _FACES[None, :, None]
+    return np.concatenate(
+        [
+            one_hot.reshape(-1, 18),
+            one_hot.sum(axis=2) / 3,
+            (cells != 0).sum(axis=1, keepdims=True) / 3,
+            logic.COLUMN_SCORES[:, None] / _MAX_COLUMN_SCORE,
+            transitions.REMOVAL_LOSSES[:, 1:] / _MAX_COLUMN_SCORE,
+        ],
+        axis=1,
+        dtype=np.float32,
+    )
+
+
+# Features of every column code, shape (COLUMN_STATES, COLUMN_FEATURES)
+COLUMN_TABLE = _build_column_table()
+_GAINS = (transitions.PLACEMENT_GAINS / _MAX_COLUMN_SCORE).astype(np.float32)
+_LOSSES = (transitions.REMOVAL_LOSSES / _MAX_COLUMN_SCORE).astype(np.float32)
+_SCORES = (logic.COLUMN_SCORES / _MAX_SCORE).astype(np.float32)
+
+
+def encode_codes(
+    codes: np.ndarray, dice: np.ndarray, out: np.ndarray | None = None
+) -> np.ndarray:
+    """
+    Encode boards given as column codes.
+
+    Args:
+        codes (np.ndarray): Column codes of shape (..., 2, 3), from the perspective
+            of the player to move, like `KnucklebonesEnv.column_codes` flipped for
+            player_1.
+        dice (np.ndarray): The dice to place, shape (...).
+        out (np.ndarray | None): Optional contiguous float32 array of shape
+            (..., FEATURE_SIZE) the features are written into.
+
+    Returns:
+        np.ndarray: The features, `out` if it was given.
+
+    """
+    codes = np.asarray(codes, dtype=np.intp)
+    dice = np.asarray(dice, dtype=np.intp)
+    shape = (*codes.shape[:-2], FEATURE_SIZE)
+    if out is None:
+        out = np.empty(shape, dtype=np.float32)
+    elif out.shape != shape or out.dtype != np.float32 or not out.flags.c_contiguous:
+        msg = f"out must be a contiguous float32 array of shape {shape}."
+        raise ValueError(msg)
+
+    columns = out[..., : 6 * COLUMN_FEATURES].reshape(*shape[:-1], 2, 3, -1)
+    np.take(COLUMN_TABLE, codes, axis=0, out=columns, mode="clip")
+
+    own, enemy = codes[..., 0, :], codes[..., 1, :]
+    die = dice[..., None]
+    features = out[..., 6 * COLUMN_FEATURES :]
+    legal = own < logic.COLUMN_WEIGHTS[0, 0]
+    features[..., 0:6] = die == _FACES
+    features[..., 6:9] = _GAINS[own, die]
+    features[..., 9:12] = _LOSSES[enemy, die] * legal
+    scores = _SCORES[codes].sum(axis=-1)
+    features[..., 12:14] = scores
+    features[..., 14] = scores[..., 0] - scores[..., 1]
+    features[..., 15:18] = legal
+    return out
+
+
+def encode_observation(
+    observation: dict[str, np.ndarray], out: np.ndarray | None = None
+) -> np.ndarray:
+    """
+    Encode an observation or a batch of observations.
+
+    Args:
+        observation (dict[str, np.ndarray]): An observation of `KnucklebonesEnv`,
+            or batched observations like those of `VectorKnucklebonesEnv`.
+        out (np.ndarray | None): Optional float32 array of shape
+            (FEATURE_SIZE,), or (n, FEATURE_SIZE) for a batch, the features are
+            written into.
+
+    Returns:
+        np.ndarray: The features, `out` if it was given.
+
+    """
+    board = np.asarray(observation["board"])
+    return encode_codes(logic.encode_columns(board), observation["die"], out)
@@ -0,0 +1,172 @@
+"""
+Single-agent Gymnasium environment for Knucklebones dice game.
+
+This module defines the KnucklebonesGymEnv class, which wraps the unwrapped
+`KnucklebonesEnv` with an embedded opponent agent, so that a learner sees a plain
+`gymnasium.Env`. It is registered as "Knucklebones-v0" for `gymnasium.make` and
+`gymnasium.make_vec`.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+import gymnasium as gym
+import numpy as np
+
+from knucklebones_ml._env.knucklebones_environment import KnucklebonesEnv
+
+if TYPE_CHECKING:
+    from knucklebones_ml.agents import Agent
+    from knucklebones_ml.simulation import AgentFactory
+
+OBSERVATION_SIZE = 22
+
+
+class KnucklebonesGymEnv(gym.Env):
+    """
+    Knucklebones against an embedded opponent, as a single-agent Gymnasium env.
+
+    Every `step` plays the learner's move and then the opponent's reply inline, so
+    the learner is always the player to move when control returns. The reward of a
+    step is the learner's reward for its move plus its reward for the opponent's
+    reply, using the same reward function as `KnucklebonesEnv`.
+
+    Observations are flat int16 vectors of length 22, from the learner's perspective:
+    - [0:18]: The board of shape (2, 3, 3), learner's side first.
+    - [18]: The die to place.
+    - [19:22]: The action mask, which is also given as `info["action_mask"]`.
+
+    The observation is assembled in place in a preallocated buffer, and a copy of it
+    is returned, as Gymnasium requires every call to return new observation data.
+    """
+
+    metadata = {"render_modes": []}  # noqa: RUF012
+
+    def __init__(
+        self,
+        opponent: Agent | AgentFactory | None = None,
+        agent_side: int | None = None,
+        max_steps: int | None = None,
+        illegal_reward: float = -10,
+    ) -> None:
+        """
+        Initialize the environment.
+
+        Args:
+            opponent (Agent | AgentFactory | None): The opponent agent, or a
+                factory building it from a seed drawn from the environment's random
+                generator on the first reset and on every seeded reset. Factories
+                give every copy of the environment in a vector env its own
+                independently seeded opponent.
+                Defaults to a RandomAgent factory.
+            agent_side (int | None): 0 for the learner to play first, 1 to play
+                second. Defaults to None, a random side every game.
+            max_steps (int | None): Maximum number of steps, counting both players,
+                before a game is truncated. Defaults to None (no truncation).
+            illegal_reward (float): Reward for an illegal move, which ends the game.
+
+        """
+        self.observation_space = gym.spaces.Box(
+            low=0, high=6, shape=(OBSERVATION_SIZE,), dtype=np.int16
+        )
+        self.action_space = gym.spaces.Discrete(3)
+
+        # Imported here, as the agents depend on the environment package
+        from knucklebones_ml.agents import Agent, RandomAgent  # noqa: PLC0415
+
+        if opponent is None:
+            opponent = RandomAgent
+        self.opponent = opponent if isinstance(opponent, Agent) else None
+        self._opponent_factory = None if isinstance(opponent, Agent) else opponent
+        self.agent_side = agent_side
+        self.max_steps = max_steps
+
+        self.game = KnucklebonesEnv(
+            illegal_reward=illegal_reward, observation_mode="view"
+        )
+        self.learner = self.game.possible_agents[0]
+
+        self._observation = np.zeros(OBSERVATION_SIZE, dtype=np.int16)
+        self._board = self._observation[:18].reshape(2, 3, 3)
+        self._action_mask = self._observation[19:]
+
+    def reset(
+        self, *, seed: int | None = None, options: dict[str, Any] | None = None
+    ) -> tuple[np.ndarray, dict[str, Any]]:
+        """
+        Start a new game, playing the opponent's first move if it goes first.
+
+        Args:
+            seed (int | None): Seed of the environment's random generator, which
+                seeds every following game and, when given as a factory, the
+                opponent.
+            options (dict | None): Unused.
+
+        Returns:
+            The observation and the info dict.
+
+        """
+        super().reset(seed=seed, options=options)
+        factory = self._opponent_factory
+        if factory is not None and (seed is not None or self.opponent is None):
+            self.opponent = factory(self._draw_seed())
+
+        side = self.agent_side
+        if side is None:
+            side = int(self.np_random.integers(2))
+        self.learner = self.game.possible_agents[side]
+
+        self.game.reset(seed=self._draw_seed(), options={"max_steps": self.max_steps})
+        if self.game.agent_selection != self.learner:
+            self._play_opponent()
+
+        return self._observe(), self._info()
+
+    def step(self, action: int) -> tuple[np.ndarray, float, bool, bool, dict[str, Any]]:
+        """
+        Play the learner's move and the opponent's reply.
+
+        Returns:
+            The observation, reward, terminated and truncated flags, and info dict.
+
+        """
+        game = self.game
+        game.step(int(action))
+        if not self._game_over():
+            self._play_opponent()
+
+        terminated = game.terminations[self.learner]
+        truncated = game.truncations[self.learner] and not terminated
+        reward = float(game._cumulative_rewards[self.learner])  # noqa: SLF001
+        return self._observe(), reward, terminated, truncated, self._info()
+
+    def _draw_seed(self) -> int:
+        return int(self.np_random.integers(2**63))
+
+    def _game_over(self) -> bool:
+        return (
+            self.game.terminations[self.learner] or self.game.truncations[self.learner]
+        )
+
+    def _play_opponent(self) -> None:
+        game = self.game
+        observation = game.observe(game.agent_selection)
+        game.step(self.opponent.select_action(observation))
+
+    def _observe(self) -> np.ndarray:
+        observation = self.game.observe(self.learner)
+        np.copyto(self._board, observation["board"])
+        self._observation[18] = observation["die"]
+        np.copyto(self._action_mask, observation["action_mask"])
+        return self._observation.copy()
+
+    def _info(self) -> dict[str, Any]:
+        return {"action_mask": self._action_mask.astype(np.int8)}
+
+
+if "Knucklebones-v0" not in gym.registry:
+    gym.register(
+        id="Knucklebones-v0",
+        entry_point="knucklebones_ml._env.gym_environment:KnucklebonesGymEnv",
+    )
@@ -10,14 +10,22 @@ from __future__ import annotations
 from collections import defaultdict
 from copy import copy
 from functools import cache
-from typing import Any, Literal, cast, overload
+from typing import TYPE_CHECKING, Any, Literal, cast, overload
 
 import gymnasium as gym
 import numpy as np
 from pettingzoo import AECEnv
 from pettingzoo.utils import AgentSelector, wrappers
+from pettingzoo.utils.env_logger import EnvLogger
 
 from knucklebones_ml._env import core_logic as logic
+from knucklebones_ml._env import transitions
+from knucklebones_ml._env.dice import DiceStream
+
+if TYPE_CHECKING:
+    from knucklebones_ml._env.profiling import EnvProfiler
+
+ObservationMode = Literal["copy", "view"]
 
 
 @cache
@@ -35,7 +43,11 @@ def _action_space() -> gym.spaces.Discrete:
     return gym.spaces.Discrete(3)
 
 
-def env(render_mode: str | None = None) -> KnucklebonesEnv:
+def env(
+    render_mode: str | None = None,
+    observation_mode: ObservationMode = "copy",
+    profiler: EnvProfiler | None = None,
+) -> KnucklebonesEnv:
     """
     Create a new instance of the Knucklebones environment.
 
@@ -43,23 +55,76 @@ def env(render_mode: str | None = None) -> KnucklebonesEnv:
         render_mode (str | None): For compatibility only, use knucklebones_ml.ui
             Renderers instead. String specifying the rendering mode (human or ansi)
             for the environment. If not provided, defaults to None (no rendering).
+        observation_mode (ObservationMode): "copy" (default) returns a new
+            observation on every call, "view" returns read-only views into the
+            environment state. See `KnucklebonesEnv.observe`.
+        profiler (EnvProfiler | None): If given, collects per-phase timings and
+            counters of the environment. Defaults to None (no profiling). Illegal
+            moves are then handled by the inline check of `raw_env`, which the
+            profiler counts, instead of `TerminateIllegalWrapper`.
 
     Returns:
         KnucklebonesEnv: A wrapped instance of the Knucklebones environment.
 
     """
-    env = KnucklebonesEnv(render_mode=render_mode)
+    env = KnucklebonesEnv(
+        render_mode=render_mode,
+        illegal_reward=None if profiler is None else -10,
+        observation_mode=observation_mode,
+        profiler=profiler,
+    )
 
     if render_mode is not None:
         env = wrappers.CaptureStdoutWrapper(env)
 
-    env = wrappers.TerminateIllegalWrapper(env, illegal_reward=-10)
+    if profiler is None:
+        env = wrappers.TerminateIllegalWrapper(env, illegal_reward=-10)
     env = wrappers.AssertOutOfBoundsWrapper(env)
     env = wrappers.OrderEnforcingWrapper(env)
 
     return env  # ty:ignore[invalid-return-type]
 
 
+def raw_env(
+    render_mode: str | None = None,
+    illegal_reward: float | None = -10,
+    observation_mode: ObservationMode = "copy",
+    profiler: EnvProfiler | None = None,
+) -> KnucklebonesEnv:
+    """
+    Create a new unwrapped instance of the Knucklebones environment.
+
+    This is the fast mode of the environment. It plays by the same rules and rewards
+    as `env()`, but skips the PettingZoo wrapper stack and with it all per-call
+    validation of the call order and the action bounds. Illegal moves are handled
+    by a cheap inline check equivalent to `TerminateIllegalWrapper`.
+
+    Args:
+        render_mode (str | None): For compatibility only, see `env()`.
+        illegal_reward (float | None): Reward given to a player making an illegal
+            move, which also ends the game. If None, an illegal move raises a
+            ValueError instead. Defaults to -10, like `env()`.
+        observation_mode (ObservationMode): "copy" or "view", see `env()`.
+        profiler (EnvProfiler | None): Optional profiler, see `env()`.
+
+    Returns:
+        KnucklebonesEnv: An unwrapped instance of the Knucklebones environment.
+
+    """
+    return KnucklebonesEnv(
+        render_mode=render_mode,
+        illegal_reward=illegal_reward,
+        observation_mode=observation_mode,
+        profiler=profiler,
+    )
+
+
+def _read_only(array: np.ndarray) -> np.ndarray:
+    view = array.view()
+    view.flags.writeable = False
+    return view
+
+
 class KnucklebonesEnv(AECEnv):
     """
     Knucklebones game environment using AEC API.
@@ -68,6 +133,9 @@ class KnucklebonesEnv(AECEnv):
     playing actions on a 3x3 board. It follows the PettingZoo AECEnv interface for
     multi-agent reinforcement learning.
 
+    Dice are rolled from `dice_stream`, a `DiceStream` reseeded by seeded resets,
+    whose `peek` gives the upcoming dice of the game.
+
     """
 
     metadata = {  # noqa: RUF012
@@ -75,46 +143,112 @@ class KnucklebonesEnv(AECEnv):
         "render_modes": ["human", "ansi"],
     }
 
-    def __init__(self, render_mode: str | None = None) -> None:
+    def __init__(
+        self,
+        render_mode: str | None = None,
+        illegal_reward: float | None = None,
+        observation_mode: ObservationMode = "copy",
+        profiler: EnvProfiler | None = None,
+    ) -> None:
+        if observation_mode not in ("copy", "view"):
+            msg = f"Unknown observation mode {observation_mode!r}."
+            raise ValueError(msg)
+
         self.possible_agents = ["player_0", "player_1"]
         self.seed = None
         self.render_mode = render_mode
+        self.illegal_reward = illegal_reward
+        self.observation_mode = observation_mode
+        # Opt-in instrumentation, every hook is skipped when it is None
+        self.profiler = profiler
+
+        # State buffers are allocated once and reused across resets
+        self.board = logic.get_board(3, 3)
+        self.column_codes = logic.encode_columns(self.board)
+        self.column_scores = logic.COLUMN_SCORES[self.column_codes]
+        self.scores = self.column_scores.sum(axis=1, dtype=np.int16)
+        self.action_masks = logic.get_valid_actions(self.board)
+        self.dice_stream = DiceStream()
+        self._agent_selector = AgentSelector(self.possible_agents)
+
+        # Per-agent containers, refilled in place on reset. Dead steps remove the
+        # agents from them, so every agent's info dict is also kept here
+        self.options: defaultdict[str, Any] = defaultdict(lambda: None)
+        self.agents = copy(self.possible_agents)
+        self.terminations: dict[str, bool] = {}
+        self.truncations: dict[str, bool] = {}
+        self.rewards: dict[str, float] = {}
+        self._cumulative_rewards: dict[str, float] = {}
+        self.infos: dict[str, dict] = {}
+        self._agent_infos: dict[str, dict] = {agent: {} for agent in self.agents}
+
+        # Read-only views of the state buffers, from each agent's perspective
+        self._observations = {
+            agent: {
+                "die": None,
+                "board": _read_only(self.board if side == 0 else self.board[::-1]),
+                "action_mask": _read_only(self.action_masks[side]),
+            }
+            for side, agent in enumerate(self.possible_agents)
+        }
 
     def reset(self, seed: int | None = None, options: dict | None = None) -> None:
         """
         Reset the environment to the initial state.
 
         Args:
-            seed (int | None): Optional random seed for reproducibility.
+            seed (int | None): Optional random seed for reproducibility, selecting
+                the dice of this game and of the following unseeded games. Defaults
+                to None, continuing the dice stream of the previous game.
             options (dict | None): Optional dictionary of environment
             configuration options. Options can include:
             - "max_steps" (int): Maximum number of steps before the environment
                 is truncated. Defaults to None (no truncation).
 
         """
+        profiler = self.profiler
+        if profiler is not None:
+            profiler.start()
+
         self.timestep = 0
-        self.random_gen = np.random.default_rng(seed)
-        self.options = defaultdict(lambda: None, (options or {}))
+        if seed is not None:
+            self.dice_stream.reseed(seed)
+        self.options.clear()
+        self.options.update(options or {})
+        self._step_limit = self.options["max_steps"] or float("inf")
 
-        self.die = self.random_gen.integers(1, 7, dtype=np.int16)
-        self.board = logic.get_board(3, 3)
+        self.die = self.dice_stream.roll()
         self.previous_die = self.die
-        self.previous_board = self.board.copy()
 
-        self.agents = copy(self.possible_agents)
-
-        self.terminations = dict.fromkeys(self.agents, False)
-        self.truncations = dict.fromkeys(self.agents, False)
-
-        self.rewards = dict.fromkeys(self.agents, 0)
-        self._cumulative_rewards = dict.fromkeys(self.agents, 0)
-
-        self.infos = {key: {} for key in self.agents}
-
-        self._agent_selector = AgentSelector(self.agents)
+        # Incrementally tracked state, only the played column changes each step
+        self.board.fill(0)
+        self.column_codes.fill(0)
+        self.column_scores.fill(0)
+        self.scores.fill(0)
+        self.action_masks.fill(1)
+
+        self.agents[:] = self.possible_agents
+        for flags in (self.terminations, self.truncations):
+            flags.clear()
+            for agent in self.agents:
+                flags[agent] = False
+        for rewards in (self.rewards, self._cumulative_rewards):
+            rewards.clear()
+            for agent in self.agents:
+                rewards[agent] = 0
+        self.infos.clear()
+        for agent, info in self._agent_infos.items():
+            info.clear()
+            self.infos[agent] = info
+
+        self._agent_selector.reinit(self.agents)
         self.agent_selection = self._agent_selector.next()
 
-    def step(self, action: Literal[0, 1, 2] | None) -> None:
+        if profiler is not None:
+            profiler.lap("reset")
+            profiler.count("resets")
+
+    def step(self, action: Literal[0, 1, 2] | None) -> None:  # noqa: C901
         """
         Apply the specified action for the current agent and update environment state.
 
@@ -126,59 +260,97 @@ class KnucklebonesEnv(AECEnv):
         on the change in score for the current player, and check for terminal conditions
         such as a full board or reaching the maximum number of steps.
         """
+        profiler = self.profiler
+        if profiler is not None:
+            profiler.start()
+
         if (
             self.terminations[self.agent_selection]
             or self.truncations[self.agent_selection]
         ):
             self._was_dead_step(action)
+            if profiler is not None:
+                profiler.end_step("dead_steps")
             return
 
         action = cast("Literal[0, 1, 2]", action)
 
         side = self.possible_agents.index(self.agent_selection)
 
+        if self.illegal_reward is not None and not self.action_masks[side, action]:
+            self._terminate_illegal()
+            if profiler is not None:
+                profiler.end_step("illegal_moves", finished=True)
+            return
+
         self._cumulative_rewards[self.agent_selection] = 0
 
-        self.previous_board = self.board.copy()
         self.previous_die = self.die
 
-        self.board = logic.apply_action(self.die, self.board, side, action)
+        previous_r_score = self.scores[side] - self.scores[1 - side]
+        if profiler is not None:
+            profiler.lap("bookkeeping")
+        self._apply_action(side, action)
+        if profiler is not None:
+            profiler.lap("rules")
+
+        finished = self._update_rewards(side, previous_r_score)
+        if profiler is not None:
+            profiler.lap("rewards")
+
+        self._accumulate_rewards()
+
+        if profiler is not None:
+            profiler.lap("bookkeeping")
+        self.die = self.dice_stream.roll()
+        if profiler is not None:
+            profiler.lap("rng")
+
+        self.agent_selection = self._agent_selector.next()
+        self.timestep += 1
 
+        if profiler is not None:
+            profiler.end_step("steps", finished=finished)
+
+    def _update_rewards(self, side: int, previous_r_score: int) -> bool:
+        """
+        Set the rewards of a step and the end of game conditions.
+
+        Returns:
+            bool: Whether the game is over, terminated or truncated.
+
+        """
         # Short Term Reward calculation
         # Change in relative score for the current player, max is 60, scaled linearly
-        current_r_score = (
-            logic.evaluate_board_scores(self.board)[side]
-            - logic.evaluate_board_scores(self.board)[1 - side]
-        )
-        previous_r_score = (
-            logic.evaluate_board_scores(self.previous_board)[side]
-            - logic.evaluate_board_scores(self.previous_board)[1 - side]
-        )
+        current_r_score = self.scores[side] - self.scores[1 - side]
         change = (current_r_score - previous_r_score) / 60
 
         # Absolute score for the current player, max is 162, scaled with tanh
-        abs_score = np.tanh((logic.evaluate_board_scores(self.board)[side]) / 60)
+        abs_score = np.tanh(self.scores[side] / 60)
 
         # Scale short term reward 0.1x for both players
         played_reward = 0.1 * (0.8 * change + 0.2 * abs_score)
         idle_reward = -change * 0.1
 
         # Long Term Reward (win/loss)
-        board_full = logic.board_is_full(self.board)
-        time_out = self.timestep + 1 >= (self.options["max_steps"] or float("inf"))
+        # Only the current player's side can fill up, the enemy side only loses dice
+        board_full = not self.action_masks[side].any()
+        time_out = self.timestep + 1 >= self._step_limit
 
         if board_full:
-            final_scores = logic.evaluate_board_scores(self.board)
+            final_scores = self.scores
             if final_scores[side] > final_scores[1 - side]:
                 played_reward += 10 * abs_score  # Win
                 idle_reward -= 10 * abs_score  # Opponent Loss
             elif final_scores[side] < final_scores[1 - side]:
                 played_reward -= 10 * abs_score  # Loss
                 idle_reward += 10 * abs_score  # Opponent Win
-            self.terminations = dict.fromkeys(self.agents, True)
+            for agent in self.agents:
+                self.terminations[agent] = True
 
         if time_out:
-            self.truncations = dict.fromkeys(self.agents, True)
+            for agent in self.agents:
+                self.truncations[agent] = True
 
         for agent in self.agents:
             if agent == self.agent_selection:
@@ -186,11 +358,7 @@ class KnucklebonesEnv(AECEnv):
             else:
                 self.rewards[agent] = idle_reward
 
-        self._accumulate_rewards()
-
-        self.die = self.random_gen.integers(1, 7, dtype=np.int16)
-        self.agent_selection = self._agent_selector.next()
-        self.timestep += 1
+        return board_full or time_out
 
     def observe(self, agent: str) -> dict[str, np.int_ | np.ndarray]:
         """
@@ -202,16 +370,79 @@ class KnucklebonesEnv(AECEnv):
         - "action_mask": A binary vector indicating valid actions for
             the current board state.
 
+        In the default "copy" observation mode, every call returns a new dict with
+        copies of the board and action mask. In "view" mode, each agent always gets
+        the same dict, holding read-only views into the environment state that stay
+        up to date as moves happen. Nothing is allocated, but observations must be
+        copied by callers that want to keep them across steps.
+
         """
+        profiler = self.profiler
+        if profiler is not None:
+            profiler.start()
+            profiler.count("observations")
+
+        if self.observation_mode == "view":
+            observation = self._observations[agent]
+            observation["die"] = self.die
+            if profiler is not None:
+                profiler.lap("observe")
+            return observation
+
         adjusted_board = self.board.copy()
+        side = 0
         if agent == "player_1":
             adjusted_board = np.flip(adjusted_board, 0)
+            side = 1
 
-        return {
+        observation = {
             "die": self.die,
             "board": adjusted_board,
-            "action_mask": logic.get_valid_actions(adjusted_board)[0],
+            "action_mask": self.action_masks[side].copy(),
         }
+        if profiler is not None:
+            profiler.lap("observe")
+        return observation
+
+    def _terminate_illegal(self) -> None:
+        """End the game after an illegal move, like `TerminateIllegalWrapper`."""
+        EnvLogger.warn_on_illegal_move()
+        self._cumulative_rewards[self.agent_selection] = 0
+        for agent in self.agents:
+            self.terminations[agent] = True
+            self.truncations[agent] = True
+            self.rewards[agent] = 0
+        self.rewards[self.agent_selection] = float(self.illegal_reward)
+        self._accumulate_rewards()
+        self._deads_step_first()
+
+    def _apply_action(self, side: int, action: int) -> None:
+        """
+        Place the current die and update the tracked state of the played column.
+
+        Equivalent to `logic.apply_action` followed by a full re-evaluation of the
+        scores and valid actions, but only looks up the played column pair.
+        """
+        die = int(self.die)
+        enemy = 1 - side
+        own_code, enemy_code, own_delta, enemy_delta = transitions.lookup(
+            self.column_codes[side, action], self.column_codes[enemy, action], die
+        )
+        if own_code < 0:
+            msg = f"Column {action} is full."
+            raise ValueError(msg)
+
+        self.board[side, :, action] = logic.COLUMN_CELLS[own_code]
+        self.board[enemy, :, action] = logic.COLUMN_CELLS[enemy_code]
+
+        self.column_codes[side, action] = own_code
+        self.column_codes[enemy, action] = enemy_code
+        self.column_scores[side, action] += own_delta
+        self.column_scores[enemy, action] += enemy_delta
+        self.scores[side] += own_delta
+        self.scores[enemy] += enemy_delta
+        self.action_masks[side, action] = logic.COLUMN_CELLS[own_code, 0] == 0
+        self.action_masks[enemy, action] = logic.COLUMN_CELLS[enemy_code, 0] == 0
 
     def render(self) -> None:
         """
@@ -0,0 +1,105 @@
+"""
+Packed board encoding for Knucklebones game.
+
+A board of shape (2, 3, 3) has 18 cells holding values 0-6, so every cell fits in
+3 bits and a whole board fits in a single 64-bit integer. The packed form is
+canonical (one code per board) and is meant for replay buffers, transposition
+tables and datasets that need to store millions of positions.
+
+Cells are packed column by column. Column `c` of side `s` occupies the 9 bits
+starting at `9 * (3 * s + c)`, holding (top, middle, bottom) as 3 octal digits.
+Side 0 is stored in the low 27 bits and side 1 in the high 27 bits.
+
+This module contains vectorized numpy functions for:
+ - Encoding boards into packed codes and decoding them back
+ - Determining valid actions and game over status directly on packed codes
+ - Converting packed codes into core logic column codes
+"""
+
+import numpy as np
+
+from knucklebones_ml._env import core_logic as logic
+
+# Bit offset of every cell of a (2, 3, 3) board
+SHIFTS = (
+    9 * (3 * np.arange(2)[:, None, None] + np.arange(3)[None, None, :])
+    + 3 * (2 - np.arange(3)[None, :, None])
+).astype(np.uint64)
+# Bit offset of every column field, shape (2, 3)
+COLUMN_SHIFTS = (9 * np.arange(6).reshape(2, 3)).astype(np.uint64)
+# Bit offset of the top cell of every column, shape (2, 3)
+TOP_SHIFTS = COLUMN_SHIFTS + np.uint64(6)
+
+SIDE_BITS = np.uint64(27)
+SIDE_MASK = np.uint64((1 << 27) - 1)
+
+# Core logic column code of every 9-bit column field
+_FIELDS = (logic.COLUMN_CELLS.astype(np.int64) * [64, 8, 1]).sum(axis=1)
+FIELD_TO_COLUMN_CODE = np.zeros(512, dtype=np.int16)
+FIELD_TO_COLUMN_CODE[_FIELDS] = np.arange(logic.COLUMN_STATES)
+
+
+def encode(board: np.ndarray) -> np.ndarray:
+    """
+    Pack a board or a batch of boards into 64-bit codes.
+
+    Args:
+        board (np.ndarray): A board of shape (2, 3, 3) or a batch of boards with
+            shape (..., 2, 3, 3).
+
+    Returns:
+        np.ndarray: The packed codes as uint64 with shape (...).
+
+    """
+    cells = np.asarray(board).astype(np.uint64) << SHIFTS
+    return np.bitwise_or.reduce(cells.reshape(*cells.shape[:-3], 18), axis=-1)
+
+
+def decode(codes: np.ndarray) -> np.ndarray:
+    """
+    Unpack 64-bit codes into boards.
+
+    Returns:
+        np.ndarray: The boards as int16 with shape (..., 2, 3, 3).
+
+    """
+    codes = np.asarray(codes, dtype=np.uint64)[..., None, None, None]
+    return ((codes >> SHIFTS) & np.uint64(7)).astype(np.int16)
+
+
+def flip_sides(codes: np.ndarray) -> np.ndarray:
+    """Swap the two sides of packed boards, like `np.flip(board, 0)`."""
+    codes = np.asarray(codes, dtype=np.uint64)
+    return ((codes & SIDE_MASK) << SIDE_BITS) | (codes >> SIDE_BITS)
+
+
+def column_codes(codes: np.ndarray) -> np.ndarray:
+    """
+    Convert packed boards into core logic column codes.
+
+    Returns:
+        np.ndarray: The base 7 column codes with shape (..., 2, 3), usable with
+            the column tables of the core logic unit such as COLUMN_SCORES.
+
+    """
+    codes = np.asarray(codes, dtype=np.uint64)[..., None, None]
+    return FIELD_TO_COLUMN_CODE[(codes >> COLUMN_SHIFTS) & np.uint64(511)]
+
+
+def get_valid_actions(codes: np.ndarray) -> np.ndarray:
+    """
+    Determine valid actions for packed boards.
+
+    Returns:
+        np.ndarray: An int8 array of shape (..., 2, 3) that is 1 where a column
+            has empty space and 0 otherwise, like `core_logic.get_valid_actions`.
+
+    """
+    codes = np.asarray(codes, dtype=np.uint64)[..., None, None]
+    return (((codes >> TOP_SHIFTS) & np.uint64(7)) == 0).astype(np.int8)
+
+
+def board_is_full(codes: np.ndarray) -> np.ndarray:
+    """Check if either side of packed boards is full."""
+    codes = np.asarray(codes, dtype=np.uint64)[..., None, None]
+    return (((codes >> TOP_SHIFTS) & np.uint64(7)) != 0).all(axis=-1).any(axis=-1)
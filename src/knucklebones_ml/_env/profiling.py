@@ -0,0 +1,124 @@
+"""
+Opt-in profiling of the Knucklebones environment.
+
+An `EnvProfiler` attached to a `KnucklebonesEnv` collects the time spent in each
+phase of a step, in `reset` and in `observe`, along with event counters. The
+environment only checks whether a profiler is attached, so profiling costs nothing
+beyond that check when it is disabled, which is the default.
+
+Step phases:
+ - "rules": Placing the die and updating the board, scores and action masks.
+ - "rewards": Computing the rewards and the end of game conditions.
+ - "rng": Rolling the next die.
+ - "bookkeeping": Everything else, like reward accumulation and agent selection.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    import os
+
+
+class EnvProfiler:
+    """Accumulate per-phase timers and event counters of an environment."""
+
+    def __init__(
+        self,
+        dump_path: str | os.PathLike | None = None,
+        dump_interval: float = 10.0,
+    ) -> None:
+        """
+        Initialize the profiler.
+
+        Args:
+            dump_path (str | os.PathLike | None): If given, a snapshot is appended
+                to this file as a line of JSON every `dump_interval` seconds, checked
+                at the end of every step.
+            dump_interval (float): Seconds between two dumps.
+
+        """
+        self.dump_path = None if dump_path is None else Path(dump_path)
+        self.dump_interval = dump_interval
+        self.timers: defaultdict[str, int] = defaultdict(int)
+        self.counters: defaultdict[str, int] = defaultdict(int)
+        self._lap_start = 0
+        self._last_dump = time.monotonic()
+
+    def start(self) -> None:
+        """Start timing the first phase."""
+        self._lap_start = time.perf_counter_ns()
+
+    def lap(self, phase: str) -> None:
+        """Add the time since the previous lap, or the start, to a phase."""
+        now = time.perf_counter_ns()
+        self.timers[phase] += now - self._lap_start
+        self._lap_start = now
+
+    def count(self, event: str, n: int = 1) -> None:
+        """Increment the counter of an event."""
+        self.counters[event] += n
+
+    def end_step(self, event: str, finished: bool = False) -> None:
+        """
+        Close the last phase of a step and count it.
+
+        Args:
+            event (str): The kind of step, e.g. "steps" or "illegal_moves".
+            finished (bool): Whether the step ended the game.
+
+        """
+        self.lap("bookkeeping")
+        self.counters[event] += 1
+        if finished:
+            self.counters["games_finished"] += 1
+        self.maybe_dump()
+
+    def snapshot(self) -> dict[str, Any]:
+        """
+        Return the collected statistics.
+
+        Returns:
+            dict[str, Any]: The total nanoseconds of every phase under "timers_ns",
+                the event counts under "counters", and the mean nanoseconds of every
+                phase per step under "ns_per_step".
+
+        """
+        steps = self.counters.get("steps", 0)
+        return {
+            "timers_ns": dict(self.timers),
+            "counters": dict(self.counters),
+            "ns_per_step": {
+                phase: total / steps for phase, total in self.timers.items()
+            }
+            if steps
+            else {},
+        }
+
+    def reset(self) -> None:
+        """Clear all timers and counters."""
+        self.timers.clear()
+        self.counters.clear()
+
+    def maybe_dump(self) -> None:
+        """Append a snapshot to the dump file if the dump interval has passed."""
+        if self.dump_path is None:
+            return
+        now = time.monotonic()
+        if now - self._last_dump >= self.dump_interval:
+            self.dump()
+            self._last_dump = now
+
+    def dump(self) -> None:
+        """Append a timestamped snapshot to the dump file as a line of JSON."""
+        if self.dump_path is None:
+            msg = "The profiler has no dump_path."
+            raise ValueError(msg)
+        record = {"time": time.time(), **self.snapshot()}
+        with self.dump_path.open("a") as file:
+            file.write(json.dumps(record) + "\n")
@@ -0,0 +1,89 @@
+"""
+Symmetry canonicalization for Knucklebones positions.
+
+Two symmetries leave the game unchanged:
+ - Permuting the columns, as long as each player's column moves together with the
+   enemy column it faces.
+ - Reordering the dice within a column, as only the multiset of dice in a column
+   matters for scoring and removal.
+
+Every position is mapped to a canonical representative: the dice of each column
+are sorted with the empty cells on top and the smallest die below them, and the
+column pairs are sorted by their (own, enemy) column codes. The column permutation
+is returned so that actions can be mapped back to the original board.
+
+This module contains vectorized numpy functions for:
+ - Canonicalizing boards, with and without a leading batch dimension
+ - Canonicalizing boards stored as column codes (see `core_logic.encode_columns`)
+"""
+
+import numpy as np
+
+from knucklebones_ml._env import core_logic as logic
+
+
+def _build_canonical_columns() -> np.ndarray:
+    """Map every column code to the code of its sorted column."""
+    cells = logic.COLUMN_CELLS
+    # Empty cells sort first, then dice in increasing order
+    ordered = np.sort(np.where(cells == 0, -1, cells), axis=1)
+    ordered = np.where(ordered == -1, 0, ordered).astype(np.int16)
+    return (ordered * logic.COLUMN_WEIGHTS[:, 0]).sum(axis=1, dtype=np.int16)
+
+
+CANONICAL_COLUMN_CODES = _build_canonical_columns()
+
+
+def canonicalize_codes(codes: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Canonicalize boards stored as column codes.
+
+    Args:
+        codes (np.ndarray): Column codes with shape (..., 2, 3).
+
+    Returns:
+        A tuple (canonical_codes, permutations) where permutations has shape (..., 3)
+        and column `j` of the canonical board is column `permutations[..., j]` of the
+        original board.
+
+    """
+    canonical = CANONICAL_COLUMN_CODES[codes]
+    keys = canonical[..., 0, :].astype(np.int32) * logic.COLUMN_STATES
+    keys += canonical[..., 1, :]
+    permutations = np.argsort(keys, axis=-1, kind="stable")
+    canonical = np.take_along_axis(canonical, permutations[..., None, :], axis=-1)
+    return canonical, permutations
+
+
+def canonicalize(board: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Map a board to the canonical representative of its symmetry class.
+
+    Args:
+        board (np.ndarray): A board of shape (2, 3, 3).
+
+    Returns:
+        A tuple (canonical_board, permutation). Column `j` of the canonical board
+        holds the dice of column `permutation[j]` of the original board, so an
+        action `a` chosen on the canonical board is action `permutation[a]` on the
+        original board.
+
+    """
+    codes, permutation = canonicalize_codes(logic.encode_columns(board))
+    return logic.decode_columns(codes), permutation
+
+
+def canonicalize_batch(boards: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Map a batch of boards to their canonical representatives.
+
+    Args:
+        boards (np.ndarray): A 4D array of boards with shape (n, 2, 3, 3).
+
+    Returns:
+        A tuple (canonical_boards, permutations) with shapes (n, 2, 3, 3) and (n, 3),
+        see `canonicalize`.
+
+    """
+    codes, permutations = canonicalize_codes(logic.encode_columns(boards))
+    return logic.decode_columns(codes), permutations
@@ -0,0 +1,369 @@
+"""
+Endgame tablebase for Knucklebones positions.
+
+Once the player to move has few empty cells left, a position can be solved over
+all dice outcomes. The tablebase stores, for canonical positions (see
+`knucklebones_ml.symmetry`) and every die, the probabilities of winning, drawing
+and losing for the player to move, the expected final score margin, and the best
+column, as a sorted array of records in a `.npy` file. The file is memory-mapped
+and probed with a vectorized binary search over its keys, so lookups read
+O(log n) records and never load the table.
+
+The positions of a tablebase are not enumerated blindly: a side with K empty cells
+can face any of billions of enemy boards, and removals can reopen cells, so the
+game graph below any position is the whole game. Instead, the generator takes a
+corpus of positions, e.g. from a self-play dataset, keeps the canonical positions
+with 1 to K empty cells on the side to move, and solves each of them with an
+expectimax search over dice and moves. Searches are cut after `max_plies` moves,
+where the game is scored by the sign of the current margin, and the probability of
+reaching such a cut is stored as `unresolved`, 0 for exactly solved positions.
+"""
+
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, cast
+
+import numpy as np
+
+from knucklebones_ml._env import core_logic as logic
+from knucklebones_ml._env import packing, symmetry, transitions
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+
+# Records sorted by key, see `position_keys`
+TABLEBASE_DTYPE = np.dtype(
+    [
+        ("key", "<u8"),
+        ("win", "<f4"),
+        ("draw", "<f4"),
+        ("loss", "<f4"),
+        ("margin", "<f4"),
+        ("unresolved", "<f4"),
+        ("action", "i1"),
+    ]
+)
+
+_STATES = logic.COLUMN_STATES
+
+# Python lists of the column tables, for the recursive search
+_PLACEMENTS = transitions.PLACEMENTS.tolist()
+_REMOVALS = transitions.REMOVALS.tolist()
+_GAINS = transitions.PLACEMENT_GAINS.tolist()
+_LOSSES = transitions.REMOVAL_LOSSES.tolist()
+_SCORES = logic.COLUMN_SCORES.tolist()
+_FULL = (logic.COLUMN_CELLS[:, 0] != 0).tolist()
+_CANONICAL = symmetry.CANONICAL_COLUMN_CODES.tolist()
+_EMPTY_CELLS = (logic.COLUMN_CELLS == 0).sum(axis=1)
+
+# (win, draw, loss, margin, unresolved) from the point of view of the player to move
+Value = tuple[float, float, float, float, float]
+Columns = tuple[int, int, int]
+
+
+def position_keys(codes: np.ndarray, dice: np.ndarray) -> np.ndarray:
+    """
+    Compute the tablebase keys of canonical boards stored as column codes.
+
+    Args:
+        codes (np.ndarray): Canonical column codes of shape (..., 2, 3).
+        dice (np.ndarray): The dice to place, shape (...).
+
+    Returns:
+        np.ndarray: The keys as uint64, the column pairs read as base 343 digits
+            followed by the die as a base 6 digit.
+
+    """
+    codes = np.asarray(codes, dtype=np.uint64)
+    keys = np.zeros(codes.shape[:-2], dtype=np.uint64)
+    for column in range(3):
+        keys = keys * np.uint64(_STATES) + codes[..., 0, column]
+        keys = keys * np.uint64(_STATES) + codes[..., 1, column]
+    return keys * np.uint64(6) + (np.asarray(dice, dtype=np.uint64) - np.uint64(1))
+
+
+class Tablebase:
+    """A memory-mapped tablebase file, probed with a vectorized binary search."""
+
+    def __init__(self, path: str | os.PathLike) -> None:
+        """
+        Open a tablebase.
+
+        Args:
+            path (str | os.PathLike): The `.npy` file written by
+                `generate_tablebase`.
+
+        """
+        self.path = Path(path)
+        self.records = np.load(self.path, mmap_mode="r")
+        if self.records.dtype != TABLEBASE_DTYPE:
+            msg = f"{self.path} is not a tablebase file."
+            raise ValueError(msg)
+        self._keys = self.records["key"]
+
+    def __len__(self) -> int:
+        """Return the number of entries, one per position and die."""
+        return self.records.size
+
+    def probe(self, boards: np.ndarray, dice: np.ndarray) -> dict[str, np.ndarray]:
+        """
+        Look up positions, from the perspective of the player to move.
+
+        Args:
+            boards (np.ndarray): A board of shape (2, 3, 3) or boards of shape
+                (..., 2, 3, 3).
+            dice (np.ndarray): The dice to place, shape (...).
+
+        Returns:
+            dict[str, np.ndarray]: "found" tells which positions are in the table.
+                For those, "win", "draw", "loss", "margin" and "unresolved" hold
+                their values, and "action" the best column of the original board.
+                Other positions are filled with NaN and an action of -1.
+
+        """
+        codes, permutations = symmetry.canonicalize_codes(
+            logic.encode_columns(np.asarray(boards))
+        )
+        queries = position_keys(codes, dice)
+        index, found = self._search(queries.reshape(-1))
+        index, found = index.reshape(queries.shape), found.reshape(queries.shape)
+
+        # An empty table has nothing to gather, every query misses a blank record
+        table = self.records if len(self) else np.zeros(1, dtype=TABLEBASE_DTYPE)
+        records = table[index.reshape(-1)].reshape(queries.shape)
+        result: dict[str, np.ndarray] = {"found": found}
+        for name in ("win", "draw", "loss", "margin", "unresolved"):
+            result[name] = np.where(found, records[name], np.nan).astype(np.float32)
+        actions = np.take_along_axis(
+            permutations, records["action"].astype(np.intp)[..., None], axis=-1
+        )[..., 0]
+        result["action"] = np.where(found, actions, -1)
+        return result
+
+    def probe_observation(self, observation: dict[str, Any]) -> dict[str, Any] | None:
+        """Look up the position of an observation, None if it is not in the table."""
+        result = self.probe(observation["board"], observation["die"])
+        if not result["found"]:
+            return None
+        return {name: value.item() for name, value in result.items()}
+
+    def _search(self, queries: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Find the record indices of sorted keys, with a vectorized bisection."""
+        keys = self._keys
+        low = np.zeros(queries.size, dtype=np.intp)
+        high = np.full(queries.size, keys.size, dtype=np.intp)
+        while (active := low < high).any():
+            middle = (low + high) // 2
+            below = np.zeros(queries.size, dtype=np.bool_)
+            below[active] = keys[middle[active]] < queries[active]
+            low = np.where(active & below, middle + 1, low)
+            high = np.where(active & ~below, middle, high)
+
+        index = np.minimum(low, max(keys.size - 1, 0))
+        found = (low < keys.size) & (keys[index] == queries) if keys.size else low < 0
+        return index, found
+
+
+def generate_tablebase(  # noqa: PLR0913
+    path: str | os.PathLike,
+    boards: np.ndarray,
+    max_empty: int = 2,
+    max_plies: int = 4,
+    *,
+    num_workers: int | None = None,
+    chunk_size: int = 256,
+    progress: Callable[[int, int], None] | None = None,
+) -> dict[str, Any]:
+    """
+    Solve the endgame positions of a corpus and write them as a tablebase file.
+
+    Args:
+        path (str | os.PathLike): The `.npy` file to write.
+        boards (np.ndarray): The corpus, as packed boards (see
+            `knucklebones_ml.packing`) from the perspective of the player to move,
+            like the "board" column of a self-play dataset.
+        max_empty (int): The largest number K of empty cells on the side to move.
+        max_plies (int): Number of moves, counting both players, after which a
+            search is cut.
+        num_workers (int | None): Number of worker processes. Defaults to the
+            number of CPUs. With 1 worker, positions are solved in this process.
+        chunk_size (int): Number of positions per unit of work.
+        progress (Callable[[int, int], None] | None): Called with the numbers of
+            solved and total positions after every chunk.
+
+    Returns:
+        dict[str, Any]: Statistics of the table: the number of positions with
+            every number of empty cells up to K, the number of entries, the
+            fraction of exactly solved entries and the file size in bytes.
+
+    """
+    codes = packing.column_codes(np.unique(np.asarray(boards, dtype=np.uint64)))
+    codes = symmetry.canonicalize_codes(codes)[0]
+    empty = _EMPTY_CELLS[codes[:, 0]].sum(axis=1)
+    enemy_empty = _EMPTY_CELLS[codes[:, 1]].sum(axis=1)
+    # Full sides end the game, there is nothing left to solve
+    keep = (empty >= 1) & (empty <= max_empty) & (enemy_empty >= 1)
+    codes = np.unique(codes[keep], axis=0)
+    empty = _EMPTY_CELLS[codes[:, 0]].sum(axis=1)
+
+    chunks = [
+        (codes[start : start + chunk_size].tolist(), max_plies)
+        for start in range(0, len(codes), chunk_size)
+    ]
+    solved: list[np.ndarray] = []
+    for records in _map_chunks(chunks, num_workers):
+        solved.append(records)
+        if progress is not None:
+            progress(sum(r.size for r in solved) // 6, len(codes))
+
+    records = np.concatenate(solved) if solved else np.zeros(0, dtype=TABLEBASE_DTYPE)
+    records = records[np.argsort(records["key"], kind="stable")]
+    path = Path(path)
+    np.save(path, records)
+
+    return {
+        "positions_by_empty": {
+            k: int((empty == k).sum()) for k in range(1, max_empty + 1)
+        },
+        "entries": records.size,
+        "exact": float((records["unresolved"] == 0).mean()) if records.size else 1.0,
+        "bytes": path.stat().st_size,
+    }
+
+
+def _map_chunks(
+    chunks: list[tuple[list, int]], num_workers: int | None
+) -> Iterator[np.ndarray]:
+    """Solve chunks of positions, in a process pool if there is work to share."""
+    num_workers = min(num_workers or os.cpu_count() or 1, len(chunks))
+    if num_workers <= 1:
+        yield from map(_solve_chunk, chunks)
+        return
+
+    with ProcessPoolExecutor(max_workers=num_workers) as executor:
+        yield from executor.map(_solve_chunk, chunks)
+
+
+def _solve_chunk(chunk: tuple[list, int]) -> np.ndarray:
+    """Solve every die of a chunk of canonical positions."""
+    positions, max_plies = chunk
+    solver = _Solver()
+    values, actions = [], []
+    for own, enemy in positions:
+        for die in range(1, 7):
+            value, action = solver.decision(tuple(own), tuple(enemy), die, max_plies)
+            values.append(value)
+            actions.append(action)
+
+    records = np.zeros(len(values), dtype=TABLEBASE_DTYPE)
+    codes = np.array(positions, dtype=np.int64).reshape(-1, 1, 2, 3)
+    records["key"] = position_keys(codes, np.arange(1, 7)).reshape(-1)
+    columns = np.array(values, dtype=np.float32).reshape(-1, 5)
+    for i, name in enumerate(("win", "draw", "loss", "margin", "unresolved")):
+        records[name] = columns[:, i]
+    records["action"] = actions
+    return records
+
+
+def _better(value: Value, other: Value) -> bool:
+    """Compare values by win minus loss probability, then by expected margin."""
+    return (value[0] - value[2], value[3]) > (other[0] - other[2], other[3])
+
+
+class _Solver:
+    """
+    Expectimax over moves and dice, caching chance nodes by canonical position.
+
+    A chance node is cached with the number of plies it was searched with. Its value
+    only depends on that number, unless no search was cut, in which case it holds
+    for any larger number of plies too.
+    """
+
+    def __init__(self) -> None:
+        self.table: dict[int, tuple[Value, int]] = {}
+
+    def decision(
+        self, own: Columns, enemy: Columns, die: int, plies: int
+    ) -> tuple[Value, int]:
+        """Return the value and best column of placing a die, for the mover."""
+        margin = sum(_SCORES[code] for code in own) - sum(
+            _SCORES[code] for code in enemy
+        )
+        best: tuple[Value, int] | None = None
+        for column in range(3):
+            value = self._move_value(own, enemy, margin, die, column, plies)
+            if value is not None and (best is None or _better(value, best[0])):
+                best = (value, column)
+        if best is None:
+            msg = "No legal actions available."
+            raise ValueError(msg)
+        return best
+
+    def _move_value(  # noqa: PLR0913, PLR0917
+        self,
+        own: Columns,
+        enemy: Columns,
+        margin: int,
+        die: int,
+        column: int,
+        plies: int,
+    ) -> Value | None:
+        """Return the value of placing a die in a column, None if it is full."""
+        new_code = _PLACEMENTS[own[column]][die]
+        if new_code < 0:
+            return None
+
+        margin += _GAINS[own[column]][die] + _LOSSES[enemy[column]][die]
+        new_own = list(own)
+        new_own[column] = new_code
+        new_enemy = list(enemy)
+        new_enemy[column] = _REMOVALS[enemy[column]][die]
+
+        finished = _FULL[new_own[0]] and _FULL[new_own[1]] and _FULL[new_own[2]]
+        if finished or plies == 1:
+            unresolved = 0.0 if finished else 1.0
+            if margin > 0:
+                return (1.0, 0.0, 0.0, margin, unresolved)
+            if margin < 0:
+                return (0.0, 0.0, 1.0, margin, unresolved)
+            return (0.0, 1.0, 0.0, 0.0, unresolved)
+
+        # The opponent moves next, from its own perspective
+        win, draw, loss, value_margin, unresolved = self._chance_value(
+            (new_enemy[0], new_enemy[1], new_enemy[2]),
+            (new_own[0], new_own[1], new_own[2]),
+            -margin,
+            plies - 1,
+        )
+        return (loss, draw, win, -value_margin, unresolved)
+
+    def _chance_value(
+        self, own: Columns, enemy: Columns, margin: int, plies: int
+    ) -> Value:
+        """Return the expected value over the next die roll, for the player to move."""
+        pairs = sorted((_CANONICAL[own[i]], _CANONICAL[enemy[i]]) for i in range(3))
+        key = 0
+        for own_code, enemy_code in pairs:
+            key = (key * _STATES + own_code) * _STATES + enemy_code
+        entry = self.table.get(key)
+        if entry is not None:
+            value, searched = entry
+            if searched == plies or (value[4] == 0 and searched < plies):
+                return value
+
+        totals = [0.0] * 5
+        for die in range(1, 7):
+            best: Value | None = None
+            for column in range(3):
+                move = self._move_value(own, enemy, margin, die, column, plies)
+                if move is not None and (best is None or _better(move, best)):
+                    best = move
+            for i, part in enumerate(cast("Value", best)):
+                totals[i] += part / 6
+        value = (totals[0], totals[1], totals[2], totals[3], totals[4])
+        if entry is None or entry[0][4] != 0:
+            self.table[key] = (value, plies)
+        return value
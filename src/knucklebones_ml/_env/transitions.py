@@ -0,0 +1,170 @@
+"""
+Column transition tables for Knucklebones game.
+
+A move only changes the played column on both sides: the die is added to the
+player's column and the matching dice are removed from the enemy column. The new
+player column does not depend on the enemy column and vice versa, so the transition
+of a column pair (own code, enemy code, die) is the combination of two small tables
+indexed by (column code, die). Both tables are generated at import time by running
+`core_logic.apply_action` on every reachable column state.
+
+This module contains vectorized numpy functions for:
+ - Looking up the new column codes and score deltas of a column pair
+ - Applying a turn action to boards stored as column codes (see
+   `core_logic.encode_columns`), with and without a leading batch dimension
+"""
+
+from typing import SupportsInt
+
+import numpy as np
+
+from knucklebones_ml._env import core_logic as logic
+
+
+def _is_reachable(cells: np.ndarray) -> np.ndarray:
+    """Check if columns keep all empty cells on top, like every played column."""
+    filled = cells != 0
+    return (filled[:, 0] <= filled[:, 1]) & (filled[:, 1] <= filled[:, 2])
+
+
+def _build_transition_tables() -> tuple[np.ndarray, np.ndarray]:
+    """Generate the placement and removal tables with `core_logic.apply_action`."""
+    placements = np.full((logic.COLUMN_STATES, 7), -1, dtype=np.int16)
+    removals = np.full((logic.COLUMN_STATES, 7), -1, dtype=np.int16)
+
+    board = logic.get_board(3, 1)
+    for code in np.flatnonzero(REACHABLE_CODES):
+        cells = logic.COLUMN_CELLS[code]
+        for die in range(1, 7):
+            board[:] = 0
+            board[1, :, 0] = cells
+            logic.apply_action(die, board, 0, 0)
+            removals[code, die] = logic.encode_columns(board)[1, 0]
+
+            if cells[0] != 0:
+                continue
+            board[:] = 0
+            board[0, :, 0] = cells
+            logic.apply_action(die, board, 0, 0)
+            placements[code, die] = logic.encode_columns(board)[0, 0]
+
+    return placements, removals
+
+
+# Column codes that can occur in a game (259 of the 343 states)
+REACHABLE_CODES = _is_reachable(logic.COLUMN_CELLS)
+
+# New column code after placing / removing a die, indexed by [code, die].
+# Entries are -1 for full or unreachable columns, and for die 0.
+PLACEMENTS, REMOVALS = _build_transition_tables()
+
+# Score change of the column, indexed by [code, die] like the tables above
+PLACEMENT_GAINS = np.where(
+    PLACEMENTS >= 0, logic.COLUMN_SCORES[PLACEMENTS] - logic.COLUMN_SCORES[:, None], 0
+).astype(np.int16)
+REMOVAL_LOSSES = np.where(
+    REMOVALS >= 0, logic.COLUMN_SCORES[:, None] - logic.COLUMN_SCORES[REMOVALS], 0
+).astype(np.int16)
+
+
+def lookup(
+    own_codes: np.ndarray, enemy_codes: np.ndarray, dice: np.ndarray
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Look up the transition of column pairs when a die is placed.
+
+    Args:
+        own_codes (np.ndarray): Column codes of the player placing the die.
+        enemy_codes (np.ndarray): Column codes of the enemy in the same columns.
+        dice (np.ndarray): The die values being placed.
+
+    Returns:
+        A tuple (new_own_codes, new_enemy_codes, own_deltas, enemy_deltas) with the
+        broadcast shape of the inputs. Score deltas are signed changes of the column
+        scores. New own codes are -1 where the column is full.
+
+    """
+    return (
+        PLACEMENTS[own_codes, dice],
+        REMOVALS[enemy_codes, dice],
+        PLACEMENT_GAINS[own_codes, dice],
+        -REMOVAL_LOSSES[enemy_codes, dice],
+    )
+
+
+def apply_action(
+    die: SupportsInt, codes: np.ndarray, side: SupportsInt, action: SupportsInt
+) -> np.ndarray:
+    """
+    Apply a die placement action to a board of column codes.
+
+    Table lookup equivalent of `core_logic.apply_action` for boards encoded with
+    `core_logic.encode_columns`.
+
+    Args:
+        die (int): The value of the die being placed.
+        codes (np.ndarray): A 2D array of column codes with shape (2, 3).
+        side (int): The player side (0 or 1) where the die is being placed.
+        action (int): The column index (0, 1, or 2) where the die should be placed.
+
+    Returns:
+        np.ndarray: The updated column codes, modified in place.
+
+    Raises:
+        ValueError: If the specified column is completely full.
+
+    """
+    die = int(die)
+    side = int(side)
+    action = int(action)
+
+    new_code = PLACEMENTS[codes[side, action], die]
+    if new_code < 0:
+        msg = f"Column {action} is full."
+        raise ValueError(msg)
+
+    codes[side, action] = new_code
+    codes[1 - side, action] = REMOVALS[codes[1 - side, action], die]
+
+    return codes
+
+
+def apply_action_batch(
+    dice: np.ndarray, codes: np.ndarray, sides: np.ndarray, actions: np.ndarray
+) -> np.ndarray:
+    """
+    Apply one die placement action to every board of a batch of column codes.
+
+    Table lookup equivalent of `core_logic.apply_action_batch`.
+
+    Args:
+        dice (np.ndarray): The die values being placed, shape (n,) or scalar.
+        codes (np.ndarray): A 3D array of column codes with shape (n, 2, 3).
+        sides (np.ndarray): The player side (0 or 1) of each placement,
+            shape (n,) or scalar.
+        actions (np.ndarray): The column index of each placement,
+            shape (n,) or scalar.
+
+    Returns:
+        np.ndarray: The updated column codes, modified in place.
+
+    Raises:
+        ValueError: If any of the specified columns is completely full.
+
+    """
+    index = np.arange(codes.shape[0])
+    dice = np.broadcast_to(np.asarray(dice, dtype=np.intp), index.shape)
+    sides = np.broadcast_to(np.asarray(sides, dtype=np.intp), index.shape)
+    actions = np.broadcast_to(np.asarray(actions, dtype=np.intp), index.shape)
+
+    new_codes = PLACEMENTS[codes[index, sides, actions], dice]
+    full = new_codes < 0
+    if full.any():
+        first = full.argmax()
+        msg = f"Column {actions[first]} is full on board {first}."
+        raise ValueError(msg)
+
+    codes[index, sides, actions] = new_codes
+    codes[index, 1 - sides, actions] = REMOVALS[codes[index, 1 - sides, actions], dice]
+
+    return codes
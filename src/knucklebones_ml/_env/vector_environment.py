@@ -0,0 +1,194 @@
+"""
+Batched environment for Knucklebones dice game.
+
+This module defines the VectorKnucklebonesEnv class, which runs many independent
+games at once in a single numpy array and steps all of them with one call.
+"""
+
+from __future__ import annotations
+
+from typing import SupportsInt
+
+import numpy as np
+
+from knucklebones_ml._env import core_logic as logic
+
+
+class VectorKnucklebonesEnv:
+    """
+    Batched Knucklebones environment stepping many games at once.
+
+    All games are stored as a single board tensor of shape (num_envs, 2, 3, 3),
+    together with vectors for the current die, the player to move and the timestep.
+    A single `step` call applies one action to every
+    game through the batched kernels of the core logic unit, so boards and rewards
+    are identical to the single game `KnucklebonesEnv` given the same dice.
+
+    Finished games are reset automatically within the same `step` call. Their final
+    boards and scores are reported in the returned info dict.
+
+    Illegal actions are handled like `TerminateIllegalWrapper`: the game is ended,
+    the offending player receives `illegal_reward` and the opponent receives 0.
+
+    """
+
+    possible_agents = ("player_0", "player_1")
+
+    def __init__(
+        self,
+        num_envs: SupportsInt,
+        max_steps: int | None = None,
+        illegal_reward: float = -10,
+    ) -> None:
+        """
+        Initialize the batched environment.
+
+        Args:
+            num_envs (SupportsInt): Number of games played in parallel.
+            max_steps (int | None): Maximum number of steps before a game is
+                truncated. Defaults to None (no truncation).
+            illegal_reward (float): Reward given to a player making an illegal move.
+
+        """
+        self.num_envs = int(num_envs)
+        self.max_steps = max_steps
+        self.illegal_reward = illegal_reward
+        self._index = np.arange(self.num_envs)
+
+    def reset(self, seed: int | None = None) -> dict[str, np.ndarray]:
+        """
+        Reset all games to the initial state.
+
+        Args:
+            seed (int | None): Optional random seed for reproducibility.
+
+        Returns:
+            dict[str, np.ndarray]: The batched observations of the players to move.
+
+        """
+        self.random_gen = np.random.default_rng(seed)
+
+        self.boards = logic.get_boards(self.num_envs, 3, 3)
+        self.dice = self._roll()
+        self.turns = np.zeros(self.num_envs, dtype=np.intp)
+        self.timesteps = np.zeros(self.num_envs, dtype=np.int64)
+
+        return self.observe()
+
+    def step(
+        self, actions: np.ndarray
+    ) -> tuple[
+        dict[str, np.ndarray],
+        np.ndarray,
+        np.ndarray,
+        np.ndarray,
+        dict[str, np.ndarray],
+    ]:
+        """
+        Apply one action to every game and update the environment state.
+
+        Args:
+            actions (np.ndarray): The column index (0, 1, or 2) played in each game,
+                shape (num_envs,).
+
+        Returns:
+            A tuple (observations, rewards, terminations, truncations, infos) where
+            rewards has shape (num_envs, 2) and is indexed by player, and infos holds
+            the indices, final boards and final scores of the games that ended.
+
+        """
+        actions = np.asarray(actions, dtype=np.intp)
+        index = self._index
+        sides = self.turns
+
+        legal = self.boards[index, sides, 0, actions] == 0
+        previous_scores = logic.evaluate_board_scores_batch(self.boards)
+
+        if legal.all():
+            logic.apply_action_batch(self.dice, self.boards, sides, actions)
+        else:
+            played = self.boards[legal]
+            logic.apply_action_batch(
+                self.dice[legal], played, sides[legal], actions[legal]
+            )
+            self.boards[legal] = played
+
+        scores = logic.evaluate_board_scores_batch(self.boards)
+        own_scores = scores[index, sides]
+
+        # Short Term Reward calculation, identical to KnucklebonesEnv.step
+        current_r_score = own_scores - scores[index, 1 - sides]
+        previous_r_score = (
+            previous_scores[index, sides] - previous_scores[index, 1 - sides]
+        )
+        change = (current_r_score - previous_r_score) / 60
+
+        abs_score = np.tanh(own_scores / 60)
+
+        played_reward = 0.1 * (0.8 * change + 0.2 * abs_score)
+        idle_reward = -change * 0.1
+
+        # Long Term Reward (win/loss)
+        board_full = logic.board_is_full_batch(self.boards) & legal
+        won = board_full & (own_scores > scores[index, 1 - sides])
+        lost = board_full & (own_scores < scores[index, 1 - sides])
+        played_reward[won] += 10 * abs_score[won]
+        idle_reward[won] -= 10 * abs_score[won]
+        played_reward[lost] -= 10 * abs_score[lost]
+        idle_reward[lost] += 10 * abs_score[lost]
+
+        played_reward[~legal] = self.illegal_reward
+        idle_reward[~legal] = 0
+
+        rewards = np.empty((self.num_envs, 2), dtype=np.float64)
+        rewards[index, sides] = played_reward
+        rewards[index, 1 - sides] = idle_reward
+
+        terminations = board_full | ~legal
+        truncations = ~legal
+        if self.max_steps is not None:
+            truncations |= self.timesteps + 1 >= self.max_steps
+
+        self.dice = self._roll()
+        self.turns = 1 - sides
+        self.timesteps += 1
+
+        done = terminations | truncations
+        infos = {
+            "done_indices": np.flatnonzero(done),
+            "final_boards": self.boards[done],
+            "final_scores": scores[done],
+        }
+        if done.any():
+            self.boards[done] = 0
+            self.turns[done] = 0
+            self.timesteps[done] = 0
+
+        return self.observe(), rewards, terminations, truncations, infos
+
+    def observe(self) -> dict[str, np.ndarray]:
+        """
+        Get the batched observations of the players to move.
+
+        The observations match `KnucklebonesEnv.observe` stacked along a leading
+        game dimension:
+        - "die": The current die roll (1-6) of each game.
+        - "board": The board of each game, adjusted for the perspective of the
+            player to move.
+        - "action_mask": A binary matrix indicating valid actions for each game.
+
+        """
+        flipped = (self.turns == 1)[:, None, None, None]
+        boards = np.where(flipped, self.boards[:, ::-1], self.boards)
+
+        return {
+            "die": self.dice.copy(),
+            "board": boards,
+            "action_mask": logic.get_valid_actions_batch(boards)[:, 0],
+        }
+
+    def close(self) -> None:
+        """Close the environment and release any resources."""
+
+    def _roll(self) -> np.ndarray:
+        return self.random_gen.integers(1, 7, size=self.num_envs, dtype=np.int16)
@@ -1,17 +1,32 @@
 """Agents for the Knucklebones environment."""
 
-from knucklebones_ml.agents._algorithmic_agents import AggressiveAgent
+from knucklebones_ml.agents._algorithmic_agents import (
+    AggressiveAgent,
+    ComboAgent,
+    PupserAgent,
+    SmartAgent,
+    StupidAgent,
+)
 from knucklebones_ml.agents._base_class import Agent
 from knucklebones_ml.agents._basic_agents import (
     ColumnFillAgent,
     RandomAgent,
     SequentialAgent,
 )
+from knucklebones_ml.agents._search_agents import ExpectimaxAgent, MCTSAgent
+from knucklebones_ml.agents._tablebase_agent import TablebaseAgent
 
 __all__ = [
     "Agent",
     "AggressiveAgent",
     "ColumnFillAgent",
+    "ComboAgent",
+    "ExpectimaxAgent",
+    "MCTSAgent",
+    "PupserAgent",
     "RandomAgent",
     "SequentialAgent",
+    "SmartAgent",
+    "StupidAgent",
+    "TablebaseAgent",
 ]
@@ -1,7 +1,9 @@
-from typing import Any, Literal
+from typing import Any, Literal, cast
 
 import numpy as np
 
+from knucklebones_ml._env import core_logic as logic
+from knucklebones_ml._env import transitions
 from knucklebones_ml.agents._base_class import Agent
 
 
@@ -14,8 +16,175 @@ class AggressiveAgent(Agent):
         die = observation["die"]
         board = observation["board"]
 
-        destroyed_dice = (board[1] == die).sum(axis=1)
+        destroyed_dice = (board[1] == die).sum(axis=0)
         valid_actions = np.where(action_mask == 1)[0]
         best_action = valid_actions[np.argmax(destroyed_dice[valid_actions])]
 
         return best_action
+
+    def select_actions(self, observations: dict[str, np.ndarray]) -> np.ndarray:
+        """Select the action that destroys the most dice for each game of a batch."""
+        action_masks = observations["action_mask"]
+        dice = observations["die"]
+        boards = observations["board"]
+
+        destroyed_dice = (boards[:, 1] == dice[:, None, None]).sum(axis=1)
+        return np.argmax(np.where(action_masks == 1, destroyed_dice, -1), axis=1)
+
+
+def _margin_changes(boards: np.ndarray, dice: np.ndarray) -> np.ndarray:
+    """
+    Score the three afterstates of every board with the column transition tables.
+
+    Args:
+        boards (np.ndarray): Boards of shape (..., 2, 3, 3), from the perspective of
+            the player to move.
+        dice (np.ndarray): Dice of shape (...).
+
+    Returns:
+        np.ndarray: The change of the score margin of the player to move for placing
+            the die in each column, with shape (..., 3).
+
+    """
+    codes = logic.encode_columns(boards)
+    dice = np.asarray(dice)[..., None]
+    return (
+        transitions.PLACEMENT_GAINS[codes[..., 0, :], dice].astype(np.int32)
+        + transitions.REMOVAL_LOSSES[codes[..., 1, :], dice]
+    )
+
+
+def _last_argmax(values: np.ndarray) -> np.ndarray:
+    """Return the index of the last maximum along the last axis."""
+    return values.shape[-1] - 1 - np.argmax(values[..., ::-1], axis=-1)
+
+
+class _AfterstateAgent(Agent):
+    """An agent choosing columns with a rule vectorized over games and columns."""
+
+    def select_action(self, observation: dict[str, Any]) -> Literal[0, 1, 2]:
+        """Select an action for a single game."""
+        action = self._choose(
+            np.asarray(observation["board"]),
+            np.asarray(observation["die"]),
+            np.asarray(observation["action_mask"]) == 1,
+        )
+        return cast("Literal[0, 1, 2]", int(action))
+
+    def select_actions(self, observations: dict[str, np.ndarray]) -> np.ndarray:
+        """Select an action for each game of a batch."""
+        return self._choose(
+            observations["board"],
+            observations["die"],
+            observations["action_mask"] == 1,
+        )
+
+    def _choose(
+        self, boards: np.ndarray, dice: np.ndarray, legal: np.ndarray
+    ) -> np.ndarray:
+        """Select the actions of boards (..., 2, 3, 3) with dice and masks (...)."""
+        raise NotImplementedError
+
+
+class SmartAgent(_AfterstateAgent):
+    """
+    An agent that maximizes its score margin after its move.
+
+    Ties go to the rightmost column. Ported from the legacy `Smart_Player`.
+    """
+
+    def _choose(
+        self, boards: np.ndarray, dice: np.ndarray, legal: np.ndarray
+    ) -> np.ndarray:
+        changes = _margin_changes(boards, dice)
+        return _last_argmax(np.where(legal, changes, np.iinfo(np.int32).min))
+
+
+class StupidAgent(_AfterstateAgent):
+    """
+    An agent that minimizes its score margin after its move.
+
+    Ties go to the rightmost column. Ported from the legacy `Stupid_Player`.
+    """
+
+    def _choose(
+        self, boards: np.ndarray, dice: np.ndarray, legal: np.ndarray
+    ) -> np.ndarray:
+        changes = _margin_changes(boards, dice)
+        return _last_argmax(np.where(legal, -changes, np.iinfo(np.int32).min))
+
+
+class ComboAgent(_AfterstateAgent):
+    """
+    An agent that stacks matching dice to build combos.
+
+    It selects the first legal column already holding the die, or the rightmost
+    legal column if there is none. Ported from the legacy `Combo_Player`.
+    """
+
+    def _choose(
+        self, boards: np.ndarray, dice: np.ndarray, legal: np.ndarray
+    ) -> np.ndarray:
+        dice = np.asarray(dice)[..., None, None]
+        combos = legal & (boards[..., 0, :, :] == dice).any(axis=-2)
+        return np.where(
+            combos.any(axis=-1), np.argmax(combos, axis=-1), _last_argmax(legal)
+        )
+
+
+def _roll_probabilities(max_rolls: int) -> np.ndarray:
+    """
+    Return the probability of rolling a given face at least once in n rolls.
+
+    The terms are summed one by one like the legacy player did, so that the points
+    of different columns round, and break ties, identically.
+    """
+    probabilities = []
+    for rolls in range(max_rolls + 1):
+        probability = 0
+        for p in range(rolls):
+            probability += 1 / 6 * (5 / 6) ** p
+        probabilities.append(probability)
+    return np.array(probabilities)
+
+
+_ROLL_PROBABILITIES = _roll_probabilities(18)
+
+
+class PupserAgent(_AfterstateAgent):
+    """
+    An agent weighing the dice it removes and stacks against the risk of losing them.
+
+    Each legal column is worth the points of the enemy dice it removes plus the
+    points of the stack of matching dice it builds, minus the score of the column
+    times the probability that the enemy rolls a die that removes it. The first
+    column with the most points is selected.
+
+    Ported from the legacy `Pupser`, keeping its quirks: the number of enemy rolls
+    counts `9 - n0 + n1 + n2` plus the matching enemy dice, where `ni` is the number
+    of enemy dice in column `i`, and the risk only depends on the whole column score.
+    """
+
+    def _choose(
+        self, boards: np.ndarray, dice: np.ndarray, legal: np.ndarray
+    ) -> np.ndarray:
+        own, enemy = boards[..., 0, :, :], boards[..., 1, :, :]
+        die = np.asarray(dice)[..., None]
+        enemy_matches = (enemy == die[..., None]).sum(axis=-2)
+        own_matches = (own == die[..., None]).sum(axis=-2)
+        points = (enemy_matches**2 * die + (own_matches + 1) ** 2 * die).astype(float)
+
+        enemy_dice = (enemy != 0).sum(axis=-2)
+        rolls = (
+            9
+            - enemy_dice[..., :1]
+            + enemy_dice[..., 1:2]
+            + enemy_dice[..., 2:]
+            + enemy_matches
+        )
+        probability = _ROLL_PROBABILITIES[np.maximum(rolls, 0)]
+        for face in range(1, 7):
+            counts = (own == face).sum(axis=-2)
+            points -= probability * (face * counts**2)
+
+        return np.argmax(np.where(legal, points, -np.inf), axis=-1)
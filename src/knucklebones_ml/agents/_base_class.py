@@ -1,5 +1,7 @@
 from typing import Any, Literal
 
+import numpy as np
+
 
 class Agent:
     def __init__(self, seed: int | None = None) -> None:
@@ -8,3 +10,28 @@ class Agent:
     def select_action(self, observation: dict[str, Any]) -> Literal[0, 1, 2]:
         msg = "select_action method must be implemented by Agents"
         raise NotImplementedError(msg)
+
+    def select_actions(self, observations: dict[str, np.ndarray]) -> np.ndarray:
+        """
+        Select an action for each game of a batch.
+
+        The observations are stacked along a leading game dimension, as returned by
+        `VectorKnucklebonesEnv.observe`. This default implementation calls
+        `select_action` once per game, agents override it with a vectorized version.
+
+        Returns:
+            np.ndarray: The action of each game, with shape (n,).
+
+        """
+        boards = observations["board"]
+        dice = observations["die"]
+        action_masks = observations["action_mask"]
+        return np.array(
+            [
+                self.select_action(
+                    {"board": boards[i], "die": dice[i], "action_mask": action_masks[i]}
+                )
+                for i in range(len(boards))
+            ],
+            dtype=np.int64,
+        )
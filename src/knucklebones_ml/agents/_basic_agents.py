@@ -1,3 +1,4 @@
+from collections.abc import Sequence
 from typing import Any, Literal, cast
 
 import numpy as np
@@ -20,13 +21,37 @@ class RandomAgent(Agent):
 
         return action
 
+    def select_actions(self, observations: dict[str, np.ndarray]) -> np.ndarray:
+        """Select a random legal action for each game of a batch."""
+        legal = observations["action_mask"] == 1
+        if not legal.any(axis=1).all():
+            msg = "No legal actions available."
+            raise ValueError(msg)
+        # The largest of uniform draws over the legal actions is uniformly placed
+        draws = self.rng.random(legal.shape) * legal
+        return np.argmax(draws, axis=1)
+
 
 class ColumnFillAgent(Agent):
     """An agent that fills columns in a randomised order."""
 
-    def __init__(self, seed: int | None = None) -> None:
+    def __init__(
+        self, seed: int | None = None, column_order: Sequence[int] | None = None
+    ) -> None:
+        """
+        Initialize the agent.
+
+        Args:
+            seed (int | None): Seed of the random column order.
+            column_order (Sequence[int] | None): A fixed column order to use
+                instead of a random one.
+
+        """
         rng = default_rng(seed)
-        self.column_order = rng.permutation(3)
+        if column_order is None:
+            self.column_order = rng.permutation(3)
+        else:
+            self.column_order = np.array(column_order)
 
     def select_action(self, observation: dict[str, Any]) -> Literal[0, 1, 2]:
         """Select the first available column in the randomised column fill order."""
@@ -38,6 +63,15 @@ class ColumnFillAgent(Agent):
         msg = "No legal actions available."
         raise ValueError(msg)
 
+    def select_actions(self, observations: dict[str, np.ndarray]) -> np.ndarray:
+        """Select the first available column in the fill order for each game."""
+        legal = observations["action_mask"] == 1
+        if not legal.any(axis=1).all():
+            msg = "No legal actions available."
+            raise ValueError(msg)
+        ranks = np.argsort(self.column_order)
+        return np.argmin(np.where(legal, ranks, ranks.size), axis=1)
+
 
 class SequentialAgent(Agent):
     """An agent that cycles through columns in a randomised order."""
@@ -46,6 +80,7 @@ class SequentialAgent(Agent):
         rng = default_rng(seed)
         self.column_order = rng.permutation(3)
         self.next_column = -1
+        self.next_columns = np.zeros(0, dtype=np.int64)
 
     def select_action(self, observation: dict[str, Any]) -> Literal[0, 1, 2]:
         """Cycle through legal actions in the randomised column order."""
@@ -55,3 +90,30 @@ class SequentialAgent(Agent):
             action = self.column_order[self.next_column]
             if action_mask[action] == 1:
                 return cast("Literal[0, 1, 2]", action)
+
+    def select_actions(self, observations: dict[str, np.ndarray]) -> np.ndarray:
+        """
+        Cycle through legal actions in the column order, separately for each game.
+
+        The position in the cycle is kept per game in `next_columns`, and restarts
+        when the batch size changes.
+        """
+        action_masks = observations["action_mask"]
+        num_games = action_masks.shape[0]
+        if self.next_columns.size != num_games:
+            self.next_columns = np.full(num_games, -1, dtype=np.int64)
+
+        games = np.arange(num_games)
+        actions = np.full(num_games, -1, dtype=np.int64)
+        pending = np.ones(num_games, dtype=bool)
+        for _ in range(3):
+            self.next_columns[pending] = (self.next_columns[pending] + 1) % 3
+            candidates = self.column_order[self.next_columns]
+            legal = pending & (action_masks[games, candidates] == 1)
+            actions[legal] = candidates[legal]
+            pending &= ~legal
+
+        if pending.any():
+            msg = "No legal actions available."
+            raise ValueError(msg)
+        return actions
@@ -0,0 +1,403 @@
+import math
+from collections import OrderedDict
+from typing import Any, Literal, cast
+
+import numpy as np
+from numpy.random import default_rng
+
+from knucklebones_ml._env import core_logic as logic
+from knucklebones_ml._env import symmetry, transitions
+from knucklebones_ml.agents._base_class import Agent
+from knucklebones_ml.agents._basic_agents import RandomAgent
+
+# Python lists of the column tables, indexing them is much faster than numpy
+# scalar indexing inside the recursive search
+_PLACEMENTS = transitions.PLACEMENTS.tolist()
+_REMOVALS = transitions.REMOVALS.tolist()
+_GAINS = transitions.PLACEMENT_GAINS.tolist()
+_LOSSES = transitions.REMOVAL_LOSSES.tolist()
+_FULL = (logic.COLUMN_CELLS[:, 0] != 0).tolist()
+_CANONICAL = symmetry.CANONICAL_COLUMN_CODES.tolist()
+
+_STATES = logic.COLUMN_STATES
+
+Columns = tuple[int, int, int]
+
+
+class TranspositionTable:
+    """A bounded position cache evicting the least recently used entries."""
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[int, float] = OrderedDict()
+
+    def __len__(self) -> int:
+        """Return the number of cached positions."""
+        return len(self._entries)
+
+    def get(self, key: int) -> float | None:
+        """Return the cached value of a position, or None if it is not cached."""
+        value = self._entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: int, value: float) -> None:
+        """Cache the value of a position, evicting the oldest entry if full."""
+        self._entries[key] = value
+        if len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all cached positions."""
+        self._entries.clear()
+
+
+class ExpectimaxAgent(Agent):
+    """
+    An agent searching moves and die rolls to a fixed depth with expectimax.
+
+    The search alternates between the player to move maximising its score margin,
+    and a chance node averaging over the six rolls of the next die. The opponent is
+    assumed to minimise the agent's margin. Leaves are scored by the score margin,
+    and finished games add a bonus of `win_value` for the winner.
+
+    Positions are stored as column codes and moves are applied with the column
+    transition tables, updating the margin incrementally. Chance nodes are cached
+    in a bounded transposition table keyed by the canonical board (see
+    `knucklebones_ml.symmetry`) and the remaining depth, so equivalent positions
+    share entries. The table is kept across moves.
+    """
+
+    def __init__(
+        self,
+        seed: int | None = None,
+        depth: int = 2,
+        table_size: int = 2**20,
+        win_value: float = 100,
+    ) -> None:
+        """
+        Initialize the agent.
+
+        Args:
+            seed (int | None): Unused, the search is deterministic.
+            depth (int): Number of moves searched, counting both players.
+                A depth of 1 is a greedy search over the agent's own move.
+            table_size (int): Maximum number of positions in the
+                transposition table.
+            win_value (float): Bonus added to the margin of a won game.
+
+        """
+        super().__init__(seed)
+        if depth < 1:
+            msg = "depth must be at least 1"
+            raise ValueError(msg)
+        self.depth = depth
+        self.win_value = win_value
+        self.table = TranspositionTable(table_size)
+
+    def select_action(self, observation: dict[str, Any]) -> Literal[0, 1, 2]:
+        """Select the action with the highest expectimax value."""
+        values = self.action_values(observation)
+        action_mask = observation["action_mask"]
+        best = max(
+            (a for a in range(3) if action_mask[a] == 1), key=lambda a: values[a]
+        )
+        return cast("Literal[0, 1, 2]", best)
+
+    def action_values(self, observation: dict[str, Any]) -> list[float]:
+        """
+        Compute the expectimax value of every action.
+
+        Returns:
+            list[float]: The value of each column, -inf for full columns.
+
+        """
+        codes = logic.encode_columns(observation["board"]).tolist()
+        own, enemy = cast("Columns", tuple(codes[0])), cast("Columns", tuple(codes[1]))
+        scores = logic.COLUMN_SCORES[[own, enemy]].sum(axis=1).tolist()
+        margin = scores[0] - scores[1]
+        die = int(observation["die"])
+
+        return [
+            self._move_value(own, enemy, margin, die, column, self.depth)
+            for column in range(3)
+        ]
+
+    def _move_value(  # noqa: PLR0913, PLR0917
+        self,
+        own: Columns,
+        enemy: Columns,
+        margin: int,
+        die: int,
+        column: int,
+        depth: int,
+    ) -> float:
+        """Return the value of placing a die in a column, for the player to move."""
+        new_code = _PLACEMENTS[own[column]][die]
+        if new_code < 0:
+            return float("-inf")
+
+        margin += _GAINS[own[column]][die] + _LOSSES[enemy[column]][die]
+        new_own = list(own)
+        new_own[column] = new_code
+        new_enemy = list(enemy)
+        new_enemy[column] = _REMOVALS[enemy[column]][die]
+
+        if _FULL[new_own[0]] and _FULL[new_own[1]] and _FULL[new_own[2]]:
+            if margin > 0:
+                return margin + self.win_value
+            if margin < 0:
+                return margin - self.win_value
+            return margin
+        if depth == 1:
+            return margin
+
+        # The opponent moves next, from its own perspective
+        return -self._chance_value(
+            cast("Columns", tuple(new_enemy)),
+            cast("Columns", tuple(new_own)),
+            -margin,
+            depth - 1,
+        )
+
+    def _chance_value(
+        self, own: Columns, enemy: Columns, margin: int, depth: int
+    ) -> float:
+        """Return the expected value over the next die roll, for the player to move."""
+        # Canonical key: sorted dice within columns, column pairs sorted
+        pairs = sorted((_CANONICAL[own[i]], _CANONICAL[enemy[i]]) for i in range(3))
+        key = depth
+        for own_code, enemy_code in pairs:
+            key = (key * _STATES + own_code) * _STATES + enemy_code
+        value = self.table.get(key)
+        if value is not None:
+            return value
+
+        total = 0.0
+        for die in range(1, 7):
+            total += max(
+                self._move_value(own, enemy, margin, die, column, depth)
+                for column in range(3)
+            )
+        value = total / 6
+        self.table.put(key, value)
+        return value
+
+
+class _ChanceNode:
+    """A position after a move, before the next die is rolled."""
+
+    __slots__ = ("children", "codes", "mover", "terminal", "value_sum", "visits")
+
+    def __init__(self, codes: tuple[Columns, Columns], mover: int) -> None:
+        self.codes = codes
+        self.mover = mover
+        self.terminal = all(_FULL[code] for code in codes[mover])
+        self.children: dict[int, _DecisionNode] = {}
+        self.visits = 0
+        self.value_sum = 0.0
+
+
+class _DecisionNode:
+    """A position with a known die, where a player chooses a column."""
+
+    __slots__ = ("children", "codes", "die", "side", "untried", "visits")
+
+    def __init__(self, codes: tuple[Columns, Columns], side: int, die: int) -> None:
+        self.codes = codes
+        self.side = side
+        self.die = die
+        self.untried = [a for a in range(3) if _PLACEMENTS[codes[side][a]][die] >= 0]
+        self.children: dict[int, _ChanceNode] = {}
+        self.visits = 0
+
+    def play(self, action: int) -> _ChanceNode:
+        """Expand the child reached by placing the die in a column."""
+        side, die = self.side, self.die
+        own, enemy = list(self.codes[side]), list(self.codes[1 - side])
+        own[action] = _PLACEMENTS[own[action]][die]
+        enemy[action] = _REMOVALS[enemy[action]][die]
+        codes = (tuple(own), tuple(enemy)) if side == 0 else (tuple(enemy), tuple(own))
+        child = _ChanceNode(cast("tuple[Columns, Columns]", codes), side)
+        self.children[action] = child
+        return child
+
+
+class MCTSAgent(Agent):
+    """
+    An agent searching with Monte Carlo tree search and random playouts.
+
+    The tree alternates between decision nodes, where the player to move picks a
+    column with UCT, and chance nodes, where the next die is sampled uniformly.
+    Every simulation selects a path down the tree, expands one new node and scores
+    it with a playout of `rollout_policy` to the end of the game. A won playout
+    counts as 1, a draw as 0 and a lost playout as -1 for the player who moved.
+
+    Simulations are run in batches of `batch_size`. The leaves of a batch are
+    selected first, counting their pending visits so the batch spreads over the
+    tree, and their playouts then advance together through the batched kernels
+    of `knucklebones_ml.logic`, with the rollout policy's `select_actions`.
+    """
+
+    def __init__(
+        self,
+        seed: int | None = None,
+        rollout_policy: Agent | None = None,
+        simulations: int = 1000,
+        batch_size: int = 64,
+        exploration: float = 1.4,
+    ) -> None:
+        """
+        Initialize the agent.
+
+        Args:
+            seed (int | None): Seed of the dice sampled during the search, also used
+                for the default rollout policy.
+            rollout_policy (Agent | None): Agent playing both sides of the
+                playouts. Defaults to a RandomAgent.
+            simulations (int): Number of simulations per move.
+            batch_size (int): Number of playouts advanced together.
+            exploration (float): UCT exploration constant.
+
+        """
+        super().__init__(seed)
+        if simulations < 1 or batch_size < 1:
+            msg = "simulations and batch_size must be at least 1"
+            raise ValueError(msg)
+        self.rng = default_rng(seed)
+        self.rollout_policy = rollout_policy or RandomAgent(seed)
+        self.simulations = simulations
+        self.batch_size = batch_size
+        self.exploration = exploration
+
+    def select_action(self, observation: dict[str, Any]) -> Literal[0, 1, 2]:
+        """Select the most visited action after the search."""
+        visits = self.action_visits(observation)
+        return cast("Literal[0, 1, 2]", int(np.argmax(visits)))
+
+    def action_visits(self, observation: dict[str, Any]) -> np.ndarray:
+        """
+        Run the search from an observation.
+
+        Returns:
+            np.ndarray: The number of simulations through each column, 0 for full
+                columns.
+
+        """
+        codes = logic.encode_columns(observation["board"]).tolist()
+        root = _DecisionNode(
+            (tuple(codes[0]), tuple(codes[1])), 0, int(observation["die"])
+        )
+
+        remaining = self.simulations
+        while remaining > 0:
+            batch = min(self.batch_size, remaining)
+            paths, leaves = zip(
+                *(self._select(root) for _ in range(batch)), strict=True
+            )
+            outcomes = self._evaluate(leaves)
+            for path, outcome in zip(paths, outcomes.tolist(), strict=True):
+                for node in path:
+                    node.value_sum += outcome[node.mover]
+            remaining -= batch
+
+        visits = np.zeros(3, dtype=np.int64)
+        for action, child in root.children.items():
+            visits[action] = child.visits
+        return visits
+
+    def _select(
+        self, root: _DecisionNode
+    ) -> tuple[list[_ChanceNode], _ChanceNode | _DecisionNode]:
+        """
+        Select a path and expand a leaf, counting the visits along the way.
+
+        Returns:
+            The chance nodes on the path, and the leaf to evaluate. The leaf is a
+            terminal chance node or a newly expanded decision node.
+
+        """
+        path: list[_ChanceNode] = []
+        node = root
+        while True:
+            node.visits += 1
+            if node.untried:
+                action = node.untried.pop(self.rng.integers(len(node.untried)))
+                chance = node.play(action)
+            else:
+                chance = self._best_child(node)
+            chance.visits += 1
+            path.append(chance)
+            if chance.terminal:
+                return path, chance
+
+            die = int(self.rng.integers(1, 7))
+            child = chance.children.get(die)
+            if child is None:
+                child = _DecisionNode(chance.codes, 1 - chance.mover, die)
+                chance.children[die] = child
+                child.visits += 1
+                return path, child
+            node = child
+
+    def _best_child(self, node: _DecisionNode) -> _ChanceNode:
+        """Return the child with the highest upper confidence bound."""
+        log_visits = math.log(node.visits)
+        return max(
+            node.children.values(),
+            key=lambda child: (
+                child.value_sum / child.visits
+                + self.exploration * math.sqrt(log_visits / child.visits)
+            ),
+        )
+
+    def _evaluate(self, leaves: tuple[_ChanceNode | _DecisionNode, ...]) -> np.ndarray:
+        """
+        Play out a batch of leaves to the end of the game.
+
+        Returns:
+            np.ndarray: The outcome of each playout for both sides, with shape
+                (n, 2).
+
+        """
+        codes = np.array([leaf.codes for leaf in leaves], dtype=np.int16)
+        boards = logic.decode_columns(codes)
+        # Terminal leaves are not played, their side and die are unused
+        sides = np.array([getattr(leaf, "side", 0) for leaf in leaves], dtype=np.int64)
+        dice = np.array([getattr(leaf, "die", 0) for leaf in leaves], dtype=np.int16)
+        active = np.array([isinstance(leaf, _DecisionNode) for leaf in leaves])
+
+        while active.any():
+            playing = np.flatnonzero(active)
+            played = boards[playing]
+            actions = self._rollout_actions(played, sides[playing], dice[playing])
+            logic.apply_action_batch(dice[playing], played, sides[playing], actions)
+            boards[playing] = played
+
+            active[playing] = ~logic.board_is_full_batch(played)
+            sides[playing] ^= 1
+            dice[playing] = self.rng.integers(1, 7, size=playing.size)
+
+        scores = logic.evaluate_board_scores_batch(boards)
+        outcome = np.sign(scores[:, 0] - scores[:, 1]).astype(np.float64)
+        return np.stack([outcome, -outcome], axis=1)
+
+    def _rollout_actions(
+        self, boards: np.ndarray, sides: np.ndarray, dice: np.ndarray
+    ) -> np.ndarray:
+        """Select the actions of the rollout policy for a batch of playouts."""
+        flipped = (sides == 1)[:, None, None, None]
+        boards = np.where(flipped, boards[:, ::-1], boards)
+        return self.rollout_policy.select_actions(
+            {
+                "board": boards,
+                "die": dice,
+                "action_mask": logic.get_valid_actions_batch(boards)[:, 0],
+            }
+        )
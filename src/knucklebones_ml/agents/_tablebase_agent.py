@@ -0,0 +1,75 @@
+import os
+from typing import Any, Literal, cast
+
+import numpy as np
+
+from knucklebones_ml._env.tablebase import Tablebase
+from knucklebones_ml.agents._base_class import Agent
+
+
+class TablebaseAgent(Agent):
+    """
+    An agent playing the best tablebase move, and another agent's move otherwise.
+
+    Positions found in the tablebase (see `knucklebones_ml.tablebase`) are played
+    from the table, other positions are left to the fallback agent. Batches of
+    observations are probed with a single vectorized lookup.
+    """
+
+    def __init__(
+        self,
+        seed: int | None = None,
+        path: str | os.PathLike | None = None,
+        fallback: str = "ExpectimaxAgent",
+        fallback_kwargs: dict[str, Any] | None = None,
+    ) -> None:
+        """
+        Initialize the agent.
+
+        Args:
+            seed (int | None): Seed of the fallback agent.
+            path (str | os.PathLike | None): The tablebase file.
+            fallback (str): Name of the agent class in `knucklebones_ml.agents`
+                playing positions missing from the table.
+            fallback_kwargs (dict[str, Any] | None): Keyword arguments of the
+                fallback agent.
+
+        """
+        super().__init__(seed)
+        if path is None:
+            msg = "path of the tablebase is required"
+            raise ValueError(msg)
+        self.tablebase = Tablebase(path)
+
+        from knucklebones_ml import agents  # noqa: PLC0415
+
+        if fallback not in agents.__all__:
+            msg = f"Unknown fallback agent {fallback!r}."
+            raise ValueError(msg)
+        self.fallback: Agent = getattr(agents, fallback)(
+            seed, **(fallback_kwargs or {})
+        )
+        self.hits = 0
+        self.misses = 0
+
+    def select_action(self, observation: dict[str, Any]) -> Literal[0, 1, 2]:
+        """Select the tablebase move, or the fallback move if the table misses."""
+        result = self.tablebase.probe(observation["board"], observation["die"])
+        if result["found"]:
+            self.hits += 1
+            return cast("Literal[0, 1, 2]", int(result["action"]))
+        self.misses += 1
+        return self.fallback.select_action(observation)
+
+    def select_actions(self, observations: dict[str, np.ndarray]) -> np.ndarray:
+        """Select tablebase moves for a batch, and fallback moves for the misses."""
+        result = self.tablebase.probe(observations["board"], observations["die"])
+        actions = result["action"].astype(np.int64)
+        missing = ~result["found"]
+        self.hits += int(result["found"].sum())
+        self.misses += int(missing.sum())
+        if missing.any():
+            actions[missing] = self.fallback.select_actions(
+                {name: value[missing] for name, value in observations.items()}
+            )
+        return actions
@@ -0,0 +1,32 @@
+"""
+Performance benchmarks for the Knucklebones package.
+
+The suite times the core logic kernels, the environments with and without wrappers,
+the built-in agents, whole games and terminal rendering. Run it with
+`python -m knucklebones_ml.benchmarks` or `knucklebones-benchmark`, see `--help`.
+Results are saved as JSON and compared with a stored baseline, and the command
+fails when a benchmark is slower than its baseline beyond a threshold.
+"""
+
+from knucklebones_ml.benchmarks._cli import main
+from knucklebones_ml.benchmarks._runner import (
+    Comparison,
+    compare,
+    load_results,
+    run_benchmarks,
+    save_results,
+    time_benchmark,
+)
+from knucklebones_ml.benchmarks._suite import BENCHMARKS, Benchmark
+
+__all__ = [
+    "BENCHMARKS",
+    "Benchmark",
+    "Comparison",
+    "compare",
+    "load_results",
+    "main",
+    "run_benchmarks",
+    "save_results",
+    "time_benchmark",
+]
@@ -0,0 +1,5 @@
+"""Run the benchmark suite with `python -m knucklebones_ml.benchmarks`."""
+
+from knucklebones_ml.benchmarks import main
+
+raise SystemExit(main())
@@ -0,0 +1,84 @@
+"""Command-line entry point of the benchmark suite."""
+
+import argparse
+
+from knucklebones_ml.benchmarks._runner import (
+    compare,
+    load_results,
+    run_benchmarks,
+    save_results,
+)
+
+
+def _format_time(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:8.2f} {unit}"
+    return f"{seconds / 1e-9:8.2f} ns"
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Run the benchmark suite from the command line.
+
+    Returns:
+        int: The exit code, 1 if a benchmark regressed beyond the threshold.
+
+    """
+    parser = argparse.ArgumentParser(
+        prog="knucklebones-benchmark",
+        description="Time the knucklebones_ml kernels, environments, agents and UI.",
+    )
+    parser.add_argument(
+        "-k", "--filter", default="*", help="shell-style pattern on benchmark names"
+    )
+    parser.add_argument("-o", "--output", help="write the results to this JSON file")
+    parser.add_argument("-b", "--baseline", help="compare with this results file")
+    parser.add_argument(
+        "--save-baseline", help="also write the results to this baseline file"
+    )
+    parser.add_argument(
+        "-t",
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="allowed slowdown relative to the baseline (default: 0.25)",
+    )
+    parser.add_argument(
+        "--min-time",
+        type=float,
+        default=0.1,
+        help="minimum duration of a measurement in seconds (default: 0.1)",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="measurements per benchmark"
+    )
+    args = parser.parse_args(argv)
+
+    baseline = load_results(args.baseline) if args.baseline else None
+    results = run_benchmarks(
+        args.filter,
+        args.min_time,
+        args.repeat,
+        progress=lambda name, seconds: print(f"{name:<45} {_format_time(seconds)}"),
+    )
+
+    for path in (args.output, args.save_baseline):
+        if path:
+            save_results(results, path)
+
+    if baseline is None:
+        return 0
+
+    regressions = 0
+    print(f"\nCompared with {args.baseline}:")
+    for comparison in compare(results, baseline):
+        regressed = comparison.regressed(args.threshold)
+        regressions += regressed
+        print(
+            f"{comparison.name:<45} {comparison.ratio:6.2f}x"
+            f"{'  REGRESSION' if regressed else ''}"
+        )
+
+    print(f"\n{regressions} regression(s) beyond {args.threshold:.0%}.")
+    return 1 if regressions else 0
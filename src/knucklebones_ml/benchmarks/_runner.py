@@ -0,0 +1,132 @@
+"""Timing of benchmarks and comparison of results with a stored baseline."""
+
+from __future__ import annotations
+
+import datetime as dt
+import fnmatch
+import json
+import platform
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+from knucklebones_ml.benchmarks._suite import BENCHMARKS, Benchmark
+
+if TYPE_CHECKING:
+    import os
+    from collections.abc import Callable
+
+
+@dataclass(frozen=True)
+class Comparison:
+    """The time of a benchmark compared with its baseline."""
+
+    name: str
+    seconds: float
+    baseline_seconds: float
+
+    @property
+    def ratio(self) -> float:
+        """Return the time relative to the baseline, above 1 when slower."""
+        return self.seconds / self.baseline_seconds
+
+    def regressed(self, threshold: float) -> bool:
+        """Check if the benchmark is slower than its baseline beyond a threshold."""
+        return self.ratio > 1 + threshold
+
+
+def time_benchmark(
+    benchmark: Benchmark, min_time: float = 0.1, repeat: int = 5
+) -> float:
+    """
+    Time a benchmark.
+
+    Like `timeit`, the number of calls per measurement grows until a measurement
+    lasts at least `min_time`, and the best of `repeat` measurements is kept, which
+    is the least affected by other processes.
+
+    Returns:
+        float: The best time per operation, in seconds.
+
+    """
+    function = benchmark.setup()
+    loops = 1
+    while (elapsed := _time_calls(function, loops)) < min_time:
+        loops *= max(2, min(10, int(min_time / max(elapsed, 1e-9)) + 1))
+
+    best = min([elapsed, *(_time_calls(function, loops) for _ in range(repeat - 1))])
+    return best / loops / benchmark.ops
+
+
+def _time_calls(function: Callable[[], object], loops: int) -> float:
+    start = time.perf_counter()
+    for _ in range(loops):
+        function()
+    return time.perf_counter() - start
+
+
+def run_benchmarks(
+    pattern: str = "*",
+    min_time: float = 0.1,
+    repeat: int = 5,
+    progress: Callable[[str, float], None] | None = None,
+) -> dict[str, Any]:
+    """
+    Run the benchmarks whose name matches a pattern.
+
+    Args:
+        pattern (str): A shell-style pattern on benchmark names, e.g. "logic.*".
+        min_time (float): Minimum duration of a measurement, in seconds.
+        repeat (int): Number of measurements per benchmark.
+        progress (Callable[[str, float], None] | None): Called with the name and
+            time per operation of every finished benchmark.
+
+    Returns:
+        dict[str, Any]: The results, holding the environment the benchmarks ran in
+            under "metadata" and the time per operation of every benchmark under
+            "results". They can be saved as JSON.
+
+    """
+    results = {}
+    for benchmark in BENCHMARKS:
+        if not fnmatch.fnmatchcase(benchmark.name, pattern):
+            continue
+        seconds = time_benchmark(benchmark, min_time, repeat)
+        results[benchmark.name] = {"seconds": seconds, "ops_per_second": 1 / seconds}
+        if progress is not None:
+            progress(benchmark.name, seconds)
+
+    return {
+        "metadata": {
+            "created": dt.datetime.now(dt.UTC).isoformat(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "min_time": min_time,
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def compare(results: dict[str, Any], baseline: dict[str, Any]) -> list[Comparison]:
+    """Compare the benchmarks found in both the results and the baseline."""
+    return [
+        Comparison(name, result["seconds"], baseline["results"][name]["seconds"])
+        for name, result in results["results"].items()
+        if name in baseline["results"]
+    ]
+
+
+def load_results(path: str | os.PathLike) -> dict[str, Any]:
+    """Load results saved as JSON."""
+    return json.loads(Path(path).read_text())
+
+
+def save_results(results: dict[str, Any], path: str | os.PathLike) -> None:
+    """Save results as JSON."""
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    Path(path).write_text(json.dumps(results, indent=2))
@@ -0,0 +1,283 @@
+"""The benchmarks of the suite, grouped by the part of the package they measure."""
+
+from __future__ import annotations
+
+import contextlib
+import io
+from dataclasses import dataclass
+from functools import partial
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from knucklebones_ml import DiceStream, agents, env, features, logic, raw_env
+from knucklebones_ml._env import KnucklebonesEnv, VectorKnucklebonesEnv
+from knucklebones_ml.ui import TerminalUI
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+BATCH_SIZE = 4096
+
+
+@dataclass(frozen=True)
+class Benchmark:
+    """
+    A benchmark measuring one operation.
+
+    `setup` prepares the state of the benchmark and returns the function being
+    timed. A call of that function performs `ops` operations, so batched kernels
+    report their time per board.
+    """
+
+    name: str
+    setup: Callable[[], Callable[[], object]]
+    ops: int = 1
+
+
+def _sample_boards(num_boards: int, num_moves: int = 8, seed: int = 0) -> np.ndarray:
+    """Play random legal moves on a batch of boards, leaving the games unfinished."""
+    rng = np.random.default_rng(seed)
+    boards = logic.get_boards(num_boards, 3, 3)
+    for turn in range(num_moves):
+        valid = logic.get_valid_actions_batch(boards)[:, turn % 2]
+        actions = np.argmax(valid * rng.random((num_boards, 3)), axis=1)
+        dice = rng.integers(1, 7, size=num_boards)
+        logic.apply_action_batch(dice, boards, turn % 2, actions)
+    return boards
+
+
+def _observation(board: np.ndarray, die: int = 4) -> dict[str, np.ndarray | int]:
+    return {
+        "board": board,
+        "die": die,
+        "action_mask": logic.get_valid_actions(board)[0],
+    }
+
+
+def _batch_observation(boards: np.ndarray) -> dict[str, np.ndarray]:
+    return {
+        "board": boards,
+        "die": np.arange(boards.shape[0], dtype=np.int16) % 6 + 1,
+        "action_mask": logic.get_valid_actions_batch(boards)[:, 0],
+    }
+
+
+# Core logic
+
+
+def _scalar_kernel(kernel: Callable[[np.ndarray], object]) -> Callable[[], object]:
+    board = _sample_boards(1)[0]
+    return partial(kernel, board)
+
+
+def _batch_kernel(kernel: Callable[[np.ndarray], object]) -> Callable[[], object]:
+    boards = _sample_boards(BATCH_SIZE)
+    return partial(kernel, boards)
+
+
+def _apply_action() -> Callable[[], object]:
+    board = _sample_boards(1)[0]
+    action = int(np.argmax(logic.get_valid_actions(board)[0]))
+    return lambda: logic.apply_action(4, board.copy(), 0, action)
+
+
+def _apply_action_batch() -> Callable[[], object]:
+    boards = _sample_boards(BATCH_SIZE)
+    actions = np.argmax(logic.get_valid_actions_batch(boards)[:, 0], axis=1)
+    return lambda: logic.apply_action_batch(4, boards.copy(), 0, actions)
+
+
+# Environment
+
+
+def _roll() -> Callable[[], object]:
+    return DiceStream(0).roll
+
+
+def _reseed() -> Callable[[], object]:
+    stream = DiceStream(0)
+    return partial(stream.reseed, 2**63)
+
+
+def _encode_observation() -> Callable[[], object]:
+    observation = _observation(_sample_boards(1)[0])
+    out = np.empty(features.FEATURE_SIZE, dtype=np.float32)
+    return partial(features.encode_observation, observation, out)
+
+
+def _encode_observation_batch() -> Callable[[], object]:
+    observations = _batch_observation(_sample_boards(BATCH_SIZE))
+    out = np.empty((BATCH_SIZE, features.FEATURE_SIZE), dtype=np.float32)
+    return partial(features.encode_observation, observations, out)
+
+
+def _make_env(wrapped: bool) -> KnucklebonesEnv:
+    return env() if wrapped else raw_env()
+
+
+def _reset(wrapped: bool) -> Callable[[], object]:
+    game_env = _make_env(wrapped)
+    return partial(game_env.reset, seed=0)
+
+
+def _step(wrapped: bool) -> Callable[[], object]:
+    game_env = _make_env(wrapped)
+    game_env.reset(seed=0)
+    state = game_env.unwrapped
+
+    def step() -> None:
+        agent = game_env.agent_selection
+        if game_env.terminations[agent] or game_env.truncations[agent]:
+            game_env.reset()
+            return
+        side = state.possible_agents.index(agent)
+        game_env.step(int(np.argmax(state.action_masks[side])))
+
+    return step
+
+
+def _observe(wrapped: bool) -> Callable[[], object]:
+    game_env = _make_env(wrapped)
+    game_env.reset(seed=0)
+    return partial(game_env.observe, "player_1")
+
+
+def _full_game(wrapped: bool) -> Callable[[], object]:
+    game_env = _make_env(wrapped)
+    players = [agents.RandomAgent(0), agents.RandomAgent(1)]
+
+    def play() -> None:
+        game_env.reset()
+        for agent in game_env.agent_iter():
+            obs, _, terminated, truncated, _ = game_env.last()
+            if terminated or truncated:
+                game_env.step(None)
+                continue
+            side = game_env.possible_agents.index(agent)
+            game_env.step(players[side].select_action(obs))
+
+    return play
+
+
+def _vector_step() -> Callable[[], object]:
+    vector_env = VectorKnucklebonesEnv(BATCH_SIZE)
+    observations = vector_env.reset(seed=0)
+
+    def step() -> None:
+        actions = np.argmax(observations["action_mask"], axis=1)
+        observations.update(vector_env.step(actions)[0])
+
+    return step
+
+
+# Agents
+
+
+def _select_action(factory: Callable[[], agents.Agent]) -> Callable[[], object]:
+    agent = factory()
+    observation = _observation(_sample_boards(1)[0])
+    if isinstance(agent, agents.ExpectimaxAgent):
+        # Search from scratch every time instead of hitting the cache
+        return lambda: (agent.table.clear(), agent.select_action(observation))
+    return partial(agent.select_action, observation)
+
+
+def _select_actions(factory: Callable[[], agents.Agent]) -> Callable[[], object]:
+    agent = factory()
+    observations = _batch_observation(_sample_boards(BATCH_SIZE))
+    return partial(agent.select_actions, observations)
+
+
+# User interface
+
+
+def _render() -> Callable[[], object]:
+    ui = TerminalUI(("player_0", "player_1"))
+    observation = _observation(_sample_boards(1)[0])
+    output = io.StringIO()
+
+    def render() -> None:
+        output.seek(0)
+        output.truncate()
+        with contextlib.redirect_stdout(output):
+            ui.render(observation, "player_0", 1, terminated=False, truncated=False)
+
+    return render
+
+
+_AGENTS: dict[str, Callable[[], agents.Agent]] = {
+    "random": partial(agents.RandomAgent, 0),
+    "column_fill": partial(agents.ColumnFillAgent, 0),
+    "sequential": partial(agents.SequentialAgent, 0),
+    "aggressive": partial(agents.AggressiveAgent, 0),
+    "smart": partial(agents.SmartAgent, 0),
+    "stupid": partial(agents.StupidAgent, 0),
+    "combo": partial(agents.ComboAgent, 0),
+    "pupser": partial(agents.PupserAgent, 0),
+    "expectimax_depth_2": partial(agents.ExpectimaxAgent, 0, depth=2),
+    "mcts_100": partial(agents.MCTSAgent, 0, simulations=100),
+}
+
+_VECTORIZED_AGENTS = (
+    "random",
+    "column_fill",
+    "sequential",
+    "aggressive",
+    "smart",
+    "stupid",
+    "combo",
+    "pupser",
+)
+
+BENCHMARKS = [
+    Benchmark(
+        "logic.evaluate_board_scores",
+        partial(_scalar_kernel, logic.evaluate_board_scores),
+    ),
+    Benchmark(
+        "logic.get_valid_actions", partial(_scalar_kernel, logic.get_valid_actions)
+    ),
+    Benchmark("logic.apply_action", _apply_action),
+    Benchmark(
+        "logic.evaluate_board_scores_batch",
+        partial(_batch_kernel, logic.evaluate_board_scores_batch),
+        BATCH_SIZE,
+    ),
+    Benchmark(
+        "logic.get_valid_actions_batch",
+        partial(_batch_kernel, logic.get_valid_actions_batch),
+        BATCH_SIZE,
+    ),
+    Benchmark("logic.apply_action_batch", _apply_action_batch, BATCH_SIZE),
+    Benchmark("dice.roll", _roll),
+    Benchmark("dice.reseed", _reseed),
+    Benchmark("features.encode_observation", _encode_observation),
+    Benchmark(
+        "features.encode_observation_batch", _encode_observation_batch, BATCH_SIZE
+    ),
+    *(
+        Benchmark(f"{name}.{operation}", partial(setup, wrapped))
+        for name, wrapped in (("env", True), ("raw_env", False))
+        for operation, setup in (
+            ("reset", _reset),
+            ("step", _step),
+            ("observe", _observe),
+            ("full_game", _full_game),
+        )
+    ),
+    Benchmark("vector_env.step", _vector_step, BATCH_SIZE),
+    *(
+        Benchmark(f"agents.{name}.select_action", partial(_select_action, factory))
+        for name, factory in _AGENTS.items()
+    ),
+    *(
+        Benchmark(
+            f"agents.{name}.select_actions",
+            partial(_select_actions, _AGENTS[name]),
+            BATCH_SIZE,
+        )
+        for name in _VECTORIZED_AGENTS
+    ),
+    Benchmark("ui.terminal.render", _render),
+]
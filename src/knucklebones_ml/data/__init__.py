@@ -0,0 +1,25 @@
+"""
+Storage of Knucklebones transitions and positions for training.
+
+Self-play datasets are generated with `python -m knucklebones_ml.data` or
+`knucklebones-dataset`, see `--help`, and read back with `DatasetReader`.
+"""
+
+from knucklebones_ml.data._cli import main
+from knucklebones_ml.data._dataset import (
+    GAME_COLUMNS,
+    POSITION_COLUMNS,
+    DatasetReader,
+    generate_dataset,
+)
+from knucklebones_ml.data._replay import REPLAY_COLUMNS, ReplayBuffer
+
+__all__ = [
+    "GAME_COLUMNS",
+    "POSITION_COLUMNS",
+    "REPLAY_COLUMNS",
+    "DatasetReader",
+    "ReplayBuffer",
+    "generate_dataset",
+    "main",
+]
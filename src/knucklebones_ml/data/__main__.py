@@ -0,0 +1,5 @@
+"""Generate a self-play dataset with `python -m knucklebones_ml.data`."""
+
+from knucklebones_ml.data import main
+
+raise SystemExit(main())
@@ -0,0 +1,73 @@
+"""Command-line entry point of the self-play dataset generator."""
+
+import argparse
+import json
+import time
+from pathlib import Path
+
+from knucklebones_ml.data._dataset import generate_dataset
+from knucklebones_ml.simulation import Entrant
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Generate or resume a self-play dataset from the command line.
+
+    Returns:
+        int: The exit code.
+
+    """
+    parser = argparse.ArgumentParser(
+        prog="knucklebones-dataset",
+        description="Play games between two agents and write their labeled "
+        "positions as a sharded dataset. Rerun to resume an interrupted run.",
+    )
+    parser.add_argument("path", help="directory of the dataset")
+    parser.add_argument(
+        "--player-0", default="RandomAgent", help="agent class of the first player"
+    )
+    parser.add_argument(
+        "--player-1", help="agent class of the second player (default: --player-0)"
+    )
+    parser.add_argument(
+        "--player-0-kwargs", default="{}", help="JSON keyword arguments of player 0"
+    )
+    parser.add_argument("--player-1-kwargs", help="JSON keyword arguments of player 1")
+    parser.add_argument(
+        "-n", "--num-games", type=int, default=10_000, help="total number of games"
+    )
+    parser.add_argument(
+        "--games-per-shard", type=int, default=10_000, help="games per shard file"
+    )
+    parser.add_argument("--max-steps", type=int, help="truncate games after this")
+    parser.add_argument("--seed", type=int, help="seed of the dataset")
+    parser.add_argument("-j", "--workers", type=int, help="worker processes")
+    args = parser.parse_args(argv)
+
+    player_0 = Entrant(args.player_0, json.loads(args.player_0_kwargs))
+    player_1 = Entrant(
+        args.player_1 or args.player_0,
+        json.loads(args.player_1_kwargs or args.player_0_kwargs),
+    )
+
+    start = time.perf_counter()
+    index = generate_dataset(
+        player_0,
+        player_1,
+        args.path,
+        args.num_games,
+        args.max_steps,
+        games_per_shard=args.games_per_shard,
+        seed=args.seed,
+        num_workers=args.workers,
+    )
+    seconds = time.perf_counter() - start
+
+    positions = sum(shard["num_positions"] for shard in index["shards"])
+    size = sum(file.stat().st_size for file in Path(args.path).glob("*.npy"))
+    print(
+        f"{len(index['shards'])} shards, {positions} positions, "
+        f"{size / 2**20:.1f} MiB in {args.path} (seed {index['seed']})"
+    )
+    print(f"Finished in {seconds:.1f} s")
+    return 0
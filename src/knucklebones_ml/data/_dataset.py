@@ -0,0 +1,326 @@
+"""
+Sharded datasets of labeled self-play positions.
+
+Games between two entrants are split into shards of `games_per_shard` games, played
+across worker processes. Every position where a player acts is stored with the
+final outcome of its game from the point of view of that player, back-filled once
+the game ends. Boards are stored in their packed 64-bit form from the perspective
+of the player to move (see `knucklebones_ml.packing`), so a position takes 14 bytes.
+
+A dataset directory contains one `.npy` file per column and shard, named
+`shard-<index>.<column>.npy`, and an `index.json` file listing the finished shards
+with the settings that generated them. The index is rewritten atomically after each
+shard, so an interrupted run resumes by playing only the missing shards, and every
+shard only depends on the seed and its index.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+from knucklebones_ml._env import packing, raw_env
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from knucklebones_ml.simulation import Entrant
+
+POSITION_COLUMNS = {
+    "board": np.uint64,
+    "die": np.int8,
+    "action": np.int8,
+    "player": np.int8,
+    "outcome": np.int8,
+    "margin": np.int16,
+}
+GAME_COLUMNS = {
+    "num_positions": np.int16,
+    "truncated": np.bool_,
+}
+
+
+@dataclass(frozen=True)
+class _ShardTask:
+    """A shard of games still to be played."""
+
+    index: int
+    first_game: int
+    player_0: Entrant
+    player_1: Entrant
+    num_games: int
+    max_steps: int | None
+    seed: int
+    path: Path
+
+
+def generate_dataset(  # noqa: PLR0913
+    player_0: Entrant,
+    player_1: Entrant,
+    path: str | os.PathLike,
+    num_games: int,
+    max_steps: int | None = None,
+    *,
+    games_per_shard: int = 10_000,
+    seed: int | None = None,
+    num_workers: int | None = None,
+) -> dict[str, Any]:
+    """
+    Play games between two entrants and write their positions as a sharded dataset.
+
+    Every position is labeled with the final "outcome" of its game for the player
+    to move (1 for a win, 0 for a draw, -1 for a loss) and the final score
+    "margin" of that player. The "player" column tells which entrant moved.
+
+    If `path` already holds a dataset, it is resumed: shards listed in its index are
+    kept and only the missing ones are played. `num_games` can be raised between
+    runs to extend a dataset, but the other settings must not change.
+
+    Args:
+        player_0 (Entrant): The entrant playing first.
+        player_1 (Entrant): The entrant playing second, the same as `player_0`
+            for self-play.
+        path (str | os.PathLike): Directory of the dataset. It is created if it
+            does not exist.
+        num_games (int): Total number of games of the dataset.
+        max_steps (int | None, optional): Maximum number of steps before a game is
+            truncated. Defaults to None (no truncation).
+        games_per_shard (int, optional): Number of games per shard.
+        seed (int | None, optional): Seed of the dataset. When resuming, defaults to
+            the seed stored in the index.
+        num_workers (int | None, optional): Number of worker processes. Defaults
+            to the number of CPUs. With 1 worker, games run in this process.
+
+    Returns:
+        dict[str, Any]: The index of the dataset.
+
+    """
+    if num_games < 1:
+        msg = "num_games must be at least 1"
+        raise ValueError(msg)
+    for entrant in (player_0, player_1):
+        entrant.factory()  # Fail early on unknown agents
+
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+    index = {
+        "seed": seed,
+        "games_per_shard": games_per_shard,
+        "max_steps": max_steps,
+        # Round-tripped through JSON, to compare equal with a saved index
+        "players": json.loads(json.dumps([asdict(player_0), asdict(player_1)])),
+        "num_games": num_games,
+        "shards": [],
+    }
+    if (path / "index.json").exists():
+        index = _resume(index, path / "index.json")
+    if index["seed"] is None:
+        index["seed"] = np.random.SeedSequence().entropy
+
+    done = {shard["index"] for shard in index["shards"]}
+    tasks = [
+        _ShardTask(
+            index=i,
+            first_game=i * games_per_shard,
+            player_0=player_0,
+            player_1=player_1,
+            num_games=min(games_per_shard, num_games - i * games_per_shard),
+            max_steps=max_steps,
+            seed=index["seed"],
+            path=path,
+        )
+        for i in range(-(-num_games // games_per_shard))
+        if i not in done
+    ]
+
+    for shard in _map_shards(tasks, num_workers):
+        index["shards"] = sorted([*index["shards"], shard], key=lambda s: s["index"])
+        _write_index(index, path / "index.json")
+    return index
+
+
+class DatasetReader:
+    """Memory-map the shards of a dataset directory written by generate_dataset."""
+
+    def __init__(self, path: str | os.PathLike) -> None:
+        """
+        Initialize the reader.
+
+        Args:
+            path (str | os.PathLike): Directory containing the dataset.
+
+        """
+        self.path = Path(path)
+        self.index = json.loads((self.path / "index.json").read_text())
+
+    def __len__(self) -> int:
+        """Return the total number of positions."""
+        return sum(shard["num_positions"] for shard in self.index["shards"])
+
+    def iter_shards(
+        self, columns: list[str] | None = None
+    ) -> Iterator[dict[str, np.ndarray]]:
+        """
+        Iterate over the finished shards in order, without loading them into memory.
+
+        Args:
+            columns (list[str] | None): Position or game columns to map. Defaults to
+                all position columns.
+
+        Yields:
+            dict[str, np.ndarray]: Read-only memory-mapped arrays of one shard.
+
+        """
+        columns = columns or list(POSITION_COLUMNS)
+        for shard in self.index["shards"]:
+            yield {
+                name: np.load(self.path / f"{shard['name']}.{name}.npy", mmap_mode="r")
+                for name in columns
+            }
+
+    def read(self, columns: list[str] | None = None) -> dict[str, np.ndarray]:
+        """
+        Read whole columns into memory.
+
+        Args:
+            columns (list[str] | None): Columns to read. Defaults to all position
+                columns.
+
+        Returns:
+            dict[str, np.ndarray]: The concatenated columns. Boards stay packed,
+                use `knucklebones_ml.packing.decode` to unpack them.
+
+        """
+        columns = columns or list(POSITION_COLUMNS)
+        dtypes = POSITION_COLUMNS | GAME_COLUMNS
+        shards = list(self.iter_shards(columns))
+        return {
+            name: np.concatenate([shard[name] for shard in shards])
+            if shards
+            else np.zeros(0, dtype=dtypes[name])
+            for name in columns
+        }
+
+
+def _resume(index: dict[str, Any], path: Path) -> dict[str, Any]:
+    """Load the index of a dataset, checking it was generated with the same settings."""
+    saved = json.loads(path.read_text())
+    if index["seed"] is None:
+        index["seed"] = saved["seed"]
+
+    settings = ("seed", "games_per_shard", "max_steps", "players")
+    changed = [key for key in settings if saved[key] != index[key]]
+    if changed:
+        msg = (
+            f"Dataset {path.parent} was generated with different {', '.join(changed)}."
+        )
+        raise ValueError(msg)
+
+    # Only full shards can be kept when the number of games changes
+    index["shards"] = [
+        shard
+        for shard in saved["shards"]
+        if shard["num_games"]
+        == min(index["games_per_shard"], index["num_games"] - shard["first_game"])
+    ]
+    return index
+
+
+def _write_index(index: dict[str, Any], path: Path) -> None:
+    """Write the index atomically, so an interruption never corrupts it."""
+    temporary = path.with_name(f"{path.name}.tmp")
+    temporary.write_text(json.dumps(index, indent=2))
+    temporary.replace(path)
+
+
+def _map_shards(
+    tasks: list[_ShardTask], num_workers: int | None
+) -> Iterator[dict[str, Any]]:
+    """Play shards, in a process pool if there is work to share, as they finish."""
+    num_workers = min(num_workers or os.cpu_count() or 1, len(tasks))
+    if num_workers <= 1:
+        yield from map(_play_shard, tasks)
+        return
+
+    with ProcessPoolExecutor(max_workers=num_workers) as executor:
+        futures = [executor.submit(_play_shard, task) for task in tasks]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def _play_shard(task: _ShardTask) -> dict[str, Any]:
+    """Play the games of a shard, write its columns and return its index entry."""
+    sequence = np.random.SeedSequence(task.seed, spawn_key=(task.index,))
+    agent1_seed, agent2_seed, *game_seeds = (
+        int(s) for s in sequence.generate_state(2 + task.num_games, np.uint64)
+    )
+    players = {
+        "player_0": task.player_0.factory()(agent1_seed),
+        "player_1": task.player_1.factory()(agent2_seed),
+    }
+
+    game_env = raw_env(observation_mode="view")
+    options = {"max_steps": task.max_steps}
+
+    boards: list[np.ndarray] = []
+    dice: list[int] = []
+    actions: list[int] = []
+    sides: list[int] = []
+    outcomes: list[np.ndarray] = []
+    margins: list[np.ndarray] = []
+    games = {
+        name: np.zeros(task.num_games, dtype) for name, dtype in GAME_COLUMNS.items()
+    }
+
+    for i, game_seed in enumerate(game_seeds):
+        game_env.reset(seed=game_seed, options=options)
+        first = len(sides)
+        for agent in game_env.agent_iter():
+            obs, _, terminated, truncation, _ = game_env.last()
+            if terminated or truncation:
+                game_env.step(None)
+                continue
+
+            action = players[agent].select_action(obs)
+            boards.append(obs["board"].copy())
+            dice.append(int(obs["die"]))
+            actions.append(int(action))
+            sides.append(game_env.possible_agents.index(agent))
+            game_env.step(action)
+
+        # Back-fill the final outcome of the game for every position
+        game_sides = np.array(sides[first:], dtype=np.intp)
+        final = game_env.scores[game_sides] - game_env.scores[1 - game_sides]
+        margins.append(final)
+        outcomes.append(np.sign(final))
+        games["num_positions"][i] = len(game_sides)
+        games["truncated"][i] = truncation and not terminated
+
+    columns = {
+        "board": packing.encode(np.array(boards).reshape(-1, 2, 3, 3)),
+        "die": np.array(dice),
+        "action": np.array(actions),
+        "player": np.array(sides),
+        "outcome": np.concatenate(outcomes),
+        "margin": np.concatenate(margins),
+    }
+    name = f"shard-{task.index:06d}"
+    for column, values in columns.items():
+        dtype = POSITION_COLUMNS[column]
+        np.save(task.path / f"{name}.{column}.npy", values.astype(dtype))
+    for column, values in games.items():
+        np.save(task.path / f"{name}.{column}.npy", values)
+
+    return {
+        "index": task.index,
+        "name": name,
+        "first_game": task.first_game,
+        "num_games": task.num_games,
+        "num_positions": len(sides),
+    }
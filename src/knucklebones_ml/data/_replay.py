@@ -0,0 +1,560 @@
+"""
+Fixed-capacity replay buffer of Knucklebones transitions.
+
+Transitions are stored in a ring of contiguous numpy columns, one per field, with
+boards in their packed 64-bit form (see `knucklebones_ml.packing`) and action masks
+packed into 3 bits, so a transition takes 30 bytes. With a `path`, every column is
+a `.npy` file memory-mapped from that directory, so a buffer can exceed RAM and is
+reopened where it stopped, along with a `state.json` file holding the ring cursor.
+
+Prioritized sampling is proportional to priorities raised to `alpha`, with a sum
+tree kept in memory and rebuilt from the stored priorities when a buffer is opened.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Self, SupportsFloat, SupportsInt, cast
+
+import numpy as np
+
+from knucklebones_ml._env import packing
+
+if TYPE_CHECKING:
+    import os
+    from types import TracebackType
+
+REPLAY_COLUMNS = {
+    "board": np.uint64,
+    "die": np.int8,
+    "action_mask": np.uint8,
+    "action": np.int8,
+    "reward": np.float32,
+    "next_board": np.uint64,
+    "next_die": np.int8,
+    "next_action_mask": np.uint8,
+    "done": np.bool_,
+    "priority": np.float32,
+}
+
+# Transitions waiting for the next turn of each player of a vector environment
+_PENDING_COLUMNS = {
+    "board": np.uint64,
+    "die": np.int8,
+    "action_mask": np.uint8,
+    "action": np.int8,
+    "reward": np.float64,
+    "active": np.bool_,
+}
+
+# Action mask of every 3-bit packed mask
+_MASKS = ((np.arange(8)[:, None] >> np.arange(3)) & 1).astype(np.int8)
+
+
+def _pack_masks(masks: np.ndarray) -> np.ndarray:
+    """Pack action masks of shape (..., 3) into 3-bit integers."""
+    masks = np.asarray(masks, dtype=np.uint8)
+    return masks[..., 0] | masks[..., 1] << 1 | masks[..., 2] << 2
+
+
+class _SumTree:
+    """A binary tree of sums over a power of 2 leaves, updated in batches."""
+
+    def __init__(self, capacity: int) -> None:
+        self.leaves = 1 << max(capacity - 1, 0).bit_length()
+        self.nodes = np.zeros(2 * self.leaves)
+
+    @property
+    def total(self) -> float:
+        return float(self.nodes[1])
+
+    def update(self, indices: np.ndarray, values: np.ndarray) -> None:
+        """Set leaves and recompute their ancestors, one level at a time."""
+        nodes = np.asarray(indices) + self.leaves
+        self.nodes[nodes] = values
+        while nodes.size and nodes[0] > 1:
+            nodes = np.unique(nodes // 2)
+            self.nodes[nodes] = self.nodes[2 * nodes] + self.nodes[2 * nodes + 1]
+
+    def rebuild(self, values: np.ndarray) -> None:
+        """Set the first leaves and recompute every sum."""
+        self.nodes[:] = 0
+        self.nodes[self.leaves : self.leaves + values.size] = values
+        size = self.leaves
+        while size > 1:
+            size //= 2
+            self.nodes[size : 2 * size] = (
+                self.nodes[2 * size : 4 * size : 2]
+                + self.nodes[2 * size + 1 : 4 * size : 2]
+            )
+
+    def find(self, targets: np.ndarray) -> np.ndarray:
+        """Return the leaves whose prefix sums cover the targets."""
+        targets = np.array(targets, dtype=np.float64)
+        nodes = np.ones(targets.size, dtype=np.int64)
+        while nodes[0] < self.leaves:
+            left = 2 * nodes
+            right = targets >= self.nodes[left]
+            targets -= np.where(right, self.nodes[left], 0)
+            nodes = left + right
+        return nodes - self.leaves
+
+
+class ReplayBuffer:
+    """A ring buffer of transitions with uniform or prioritized sampling."""
+
+    def __init__(  # noqa: PLR0913
+        self,
+        capacity: int,
+        path: str | os.PathLike | None = None,
+        *,
+        prioritized: bool = False,
+        alpha: float = 0.6,
+        epsilon: float = 1e-6,
+        seed: int | None = None,
+    ) -> None:
+        """
+        Initialize the buffer, or reopen the buffer stored at `path`.
+
+        Args:
+            capacity (int): Maximum number of transitions. Once full, the oldest
+                transitions are overwritten.
+            path (str | os.PathLike | None): Directory of the memory-mapped
+                columns. It is created if it does not exist, and an existing buffer
+                in it is reopened. Defaults to None, keeping the buffer in memory.
+            prioritized (bool): Sample transitions proportionally to their
+                priorities instead of uniformly.
+            alpha (float): Exponent applied to the priorities.
+            epsilon (float): Added to the priorities, so that every transition
+                can be sampled.
+            seed (int | None): Seed of the sampling random generator.
+
+        """
+        if capacity < 1:
+            msg = "capacity must be at least 1"
+            raise ValueError(msg)
+        self.capacity = capacity
+        self.path = None if path is None else Path(path)
+        self.prioritized = prioritized
+        self.alpha = alpha
+        self.epsilon = epsilon
+        self.random_gen = np.random.default_rng(seed)
+
+        self.size = 0
+        self.position = 0
+        self.max_priority = 1.0
+        self._pending: dict[str, tuple[int, int, int, int]] = {}
+        self._vector_pending: dict[str, np.ndarray] | None = None
+
+        if self.path is None:
+            self.columns = {
+                name: np.zeros(capacity, dtype=dtype)
+                for name, dtype in REPLAY_COLUMNS.items()
+            }
+        else:
+            self.columns = self._open(self.path)
+
+        self._tree = _SumTree(capacity) if prioritized else None
+        if self._tree is not None:
+            self._tree.rebuild(
+                self.columns["priority"][: self.size].astype(np.float64) ** alpha
+            )
+
+    def __len__(self) -> int:
+        """Return the number of stored transitions."""
+        return self.size
+
+    def add(  # noqa: PLR0913, PLR0917
+        self,
+        observation: dict[str, Any],
+        action: SupportsInt,
+        reward: SupportsFloat,
+        next_observation: dict[str, Any],
+        done: bool,
+        priority: float | None = None,
+    ) -> None:
+        """
+        Add a single transition.
+
+        Args:
+            observation (dict[str, Any]): The observation of the acting player, as
+                returned by `KnucklebonesEnv.last()` or `observe()`.
+            action (SupportsInt): The action taken.
+            reward (SupportsFloat): The reward received for the action.
+            next_observation (dict[str, Any]): The next observation of the same
+                player.
+            done (bool): Whether the game ended, so that the next observation must
+                not be bootstrapped from.
+            priority (float | None): The priority of the transition. Defaults to
+                the highest priority seen so far.
+
+        """
+        self.add_batch(
+            {name: np.asarray(value)[None] for name, value in observation.items()},
+            np.asarray([action]),
+            np.asarray([reward]),
+            {name: np.asarray(value)[None] for name, value in next_observation.items()},
+            np.asarray([done]),
+            None if priority is None else np.asarray([priority]),
+        )
+
+    def add_batch(  # noqa: PLR0913, PLR0917
+        self,
+        observations: dict[str, np.ndarray],
+        actions: np.ndarray,
+        rewards: np.ndarray,
+        next_observations: dict[str, np.ndarray],
+        dones: np.ndarray,
+        priorities: np.ndarray | None = None,
+    ) -> None:
+        """
+        Add a batch of complete transitions.
+
+        The observations a `VectorKnucklebonesEnv` step returns belong to the other
+        player, use `add_vector_step` to record its steps.
+
+        Args:
+            observations (dict[str, np.ndarray]): Batched observations with boards
+                of shape (n, 2, 3, 3), dice of shape (n,) and masks of shape (n, 3).
+            actions (np.ndarray): The actions taken, shape (n,).
+            rewards (np.ndarray): The rewards of the actions, shape (n,).
+            next_observations (dict[str, np.ndarray]): The batched next
+                observations of the acting players, on their following turn.
+            dones (np.ndarray): Whether each game ended, shape (n,).
+            priorities (np.ndarray | None): The priorities of the transitions.
+                Defaults to the highest priority seen so far.
+
+        """
+        self._write(
+            {
+                "board": packing.encode(observations["board"]),
+                "die": observations["die"],
+                "action_mask": _pack_masks(observations["action_mask"]),
+                "action": actions,
+                "reward": rewards,
+                "next_board": packing.encode(next_observations["board"]),
+                "next_die": next_observations["die"],
+                "next_action_mask": _pack_masks(next_observations["action_mask"]),
+                "done": dones,
+            },
+            len(actions),
+            priorities,
+        )
+
+    def add_turn(  # noqa: PLR0913, PLR0917
+        self,
+        agent: str,
+        observation: dict[str, Any],
+        reward: SupportsFloat,
+        terminated: bool,
+        truncated: bool,
+        action: SupportsInt | None,
+    ) -> None:
+        """
+        Record a turn of an `agent_iter` loop, completing the agent's last transition.
+
+        Call it once per iteration with the outputs of `KnucklebonesEnv.last()` and
+        the action passed to `step()`. The reward of `last()` is the reward of the
+        agent's previous action, so the transition started on the agent's previous
+        turn is stored now. Transitions of truncated games are stored as not done.
+
+        Args:
+            agent (str): The agent selected by the iterator.
+            observation (dict[str, Any]): The observation returned by `last()`.
+            reward (SupportsFloat): The reward returned by `last()`.
+            terminated (bool): The termination flag returned by `last()`.
+            truncated (bool): The truncation flag returned by `last()`.
+            action (SupportsInt | None): The action about to be taken, None when
+                the game is over.
+
+        """
+        state = (
+            int(packing.encode(observation["board"])),
+            int(observation["die"]),
+            int(_pack_masks(observation["action_mask"])),
+        )
+        pending = self._pending.pop(agent, None)
+        if pending is not None:
+            board, die, mask, previous_action = pending
+            self._write(
+                {
+                    "board": board,
+                    "die": die,
+                    "action_mask": mask,
+                    "action": previous_action,
+                    "reward": reward,
+                    "next_board": state[0],
+                    "next_die": state[1],
+                    "next_action_mask": state[2],
+                    "done": terminated,
+                },
+                1,
+                None,
+            )
+        if action is not None and not (terminated or truncated):
+            self._pending[agent] = (*state, int(action))
+
+    def add_vector_step(  # noqa: PLR0913, PLR0917
+        self,
+        observations: dict[str, np.ndarray],
+        players: np.ndarray,
+        actions: np.ndarray,
+        rewards: np.ndarray,
+        terminations: np.ndarray,
+        infos: dict[str, np.ndarray],
+    ) -> None:
+        """
+        Record a step of a `VectorKnucklebonesEnv`, completing the movers' transitions.
+
+        Like `add_turn` for a single game, the transition started by a player is
+        stored on its next turn in the same game, with the rewards it received in
+        the meantime. When a game ends, the transitions of both players are stored
+        with the final board from their side. Transitions of truncated games are
+        stored as not done, and the die of final positions is the one the last move
+        was made with. Call `discard_pending` after resetting the environment.
+
+        Args:
+            observations (dict[str, np.ndarray]): The observations the actions were
+                selected from.
+            players (np.ndarray): The player to move in each game, the `turns` of
+                the environment read before the step.
+            actions (np.ndarray): The actions passed to `step()`, shape (n,).
+            rewards (np.ndarray): The rewards returned by `step()`, shape (n, 2).
+            terminations (np.ndarray): The terminations returned by `step()`.
+            infos (dict[str, np.ndarray]): The infos returned by `step()`.
+
+        """
+        num_envs = len(actions)
+        pending = self._vector_pending
+        if pending is None or len(pending["active"]) != num_envs:
+            pending = self._vector_pending = {
+                name: np.zeros((num_envs, 2), dtype=dtype)
+                for name, dtype in _PENDING_COLUMNS.items()
+            }
+        envs = np.arange(num_envs)
+        players = np.asarray(players, dtype=np.intp)
+        state = {
+            "board": packing.encode(observations["board"]),
+            "die": np.asarray(observations["die"]),
+            "action_mask": _pack_masks(observations["action_mask"]),
+        }
+
+        # A mover's previous transition ends in the position it now acts from
+        ready = pending["active"][envs, players]
+        self._write_pending(
+            envs[ready],
+            players[ready],
+            {name: value[ready] for name, value in state.items()},
+            np.zeros(np.count_nonzero(ready), dtype=np.bool_),
+        )
+        for name, value in state.items():
+            pending[name][envs, players] = value
+        pending["action"][envs, players] = actions
+        pending["reward"][envs, players] = 0
+        pending["active"][envs, players] = True
+        pending["reward"] += rewards
+
+        done = infos["done_indices"]
+        final = packing.encode(infos["final_boards"])
+        for player in (0, 1):
+            active = pending["active"][done, player]
+            boards = final[active] if player == 0 else packing.flip_sides(final[active])
+            self._write_pending(
+                done[active],
+                np.full(np.count_nonzero(active), player),
+                {
+                    "board": boards,
+                    "die": state["die"][done[active]],
+                    "action_mask": _pack_masks(packing.get_valid_actions(boards)[:, 0]),
+                },
+                np.asarray(terminations)[done[active]],
+            )
+        pending["active"][done] = False
+
+    def discard_pending(self) -> None:
+        """Forget the transitions waiting for a next turn, e.g. after a reset."""
+        self._pending.clear()
+        self._vector_pending = None
+
+    def _write_pending(
+        self,
+        envs: np.ndarray,
+        players: np.ndarray,
+        next_state: dict[str, np.ndarray],
+        dones: np.ndarray,
+    ) -> None:
+        """Store the pending transitions of players of a vector environment."""
+        if envs.size == 0:
+            return
+        pending = cast("dict[str, np.ndarray]", self._vector_pending)
+        self._write(
+            {
+                "board": pending["board"][envs, players],
+                "die": pending["die"][envs, players],
+                "action_mask": pending["action_mask"][envs, players],
+                "action": pending["action"][envs, players],
+                "reward": pending["reward"][envs, players],
+                "next_board": next_state["board"],
+                "next_die": next_state["die"],
+                "next_action_mask": next_state["action_mask"],
+                "done": dones,
+            },
+            envs.size,
+            None,
+        )
+
+    def sample(self, batch_size: int, beta: float = 0.4) -> dict[str, np.ndarray]:
+        """
+        Sample a minibatch of transitions, with replacement.
+
+        Args:
+            batch_size (int): Number of transitions.
+            beta (float): Exponent of the importance sampling weights correcting
+                the bias of prioritized sampling.
+
+        Returns:
+            dict[str, np.ndarray]: The unpacked transitions: "board" and
+                "next_board" as int16 of shape (batch_size, 2, 3, 3), "die",
+                "next_die" and "action" as int16, "action_mask" and
+                "next_action_mask" as int8 of shape (batch_size, 3), "reward" as
+                float32, "done" as bool, plus the buffer "indices" of the
+                transitions and their importance sampling "weights", scaled so that
+                the largest weight of the batch is 1, and all 1 when sampling
+                uniformly.
+
+        """
+        if self.size == 0:
+            msg = "Cannot sample from an empty buffer."
+            raise ValueError(msg)
+
+        if self._tree is None:
+            indices = self.random_gen.integers(self.size, size=batch_size)
+            weights = np.ones(batch_size, dtype=np.float32)
+        else:
+            # Stratified over equal slices of the total priority
+            total = self._tree.total
+            targets = (np.arange(batch_size) + self.random_gen.random(batch_size)) * (
+                total / batch_size
+            )
+            indices = np.minimum(self._tree.find(targets), self.size - 1)
+            probabilities = self._tree.nodes[indices + self._tree.leaves] / total
+            weights = (self.size * probabilities) ** -beta
+            weights = (weights / weights.max()).astype(np.float32)
+
+        columns = self.columns
+        return {
+            "board": packing.decode(columns["board"][indices]),
+            "die": columns["die"][indices].astype(np.int16),
+            "action_mask": _MASKS[columns["action_mask"][indices]],
+            "action": columns["action"][indices].astype(np.int16),
+            "reward": columns["reward"][indices],
+            "next_board": packing.decode(columns["next_board"][indices]),
+            "next_die": columns["next_die"][indices].astype(np.int16),
+            "next_action_mask": _MASKS[columns["next_action_mask"][indices]],
+            "done": columns["done"][indices],
+            "indices": indices,
+            "weights": weights,
+        }
+
+    def update_priorities(self, indices: np.ndarray, priorities: np.ndarray) -> None:
+        """
+        Set the priorities of sampled transitions, e.g. to their TD errors.
+
+        Args:
+            indices (np.ndarray): The "indices" returned by `sample`.
+            priorities (np.ndarray): The new priorities, used by absolute value.
+
+        """
+        priorities = np.abs(priorities) + self.epsilon
+        self.columns["priority"][indices] = priorities
+        self.max_priority = max(self.max_priority, float(priorities.max()))
+        if self._tree is not None:
+            self._tree.update(np.asarray(indices), priorities**self.alpha)
+
+    def flush(self) -> None:
+        """Write the memory-mapped columns and the ring cursor to disk."""
+        if self.path is None:
+            return
+        for column in self.columns.values():
+            column.flush()
+        self._save_state()
+
+    def _save_state(self) -> None:
+        """Write the ring cursor next to the memory-mapped columns."""
+        state = {
+            "capacity": self.capacity,
+            "size": self.size,
+            "position": self.position,
+            "max_priority": self.max_priority,
+        }
+        (cast("Path", self.path) / "state.json").write_text(json.dumps(state))
+
+    def close(self) -> None:
+        """Flush the buffer to disk."""
+        self.flush()
+
+    def __enter__(self) -> Self:
+        """Use the buffer as a context manager that closes on exit."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Close the buffer."""
+        self.close()
+
+    def _open(self, path: Path) -> dict[str, np.ndarray]:
+        """Memory-map the columns of a buffer directory, creating it if needed."""
+        state_file = path / "state.json"
+        if not state_file.exists():
+            path.mkdir(parents=True, exist_ok=True)
+            columns = {
+                name: np.lib.format.open_memmap(
+                    path / f"{name}.npy", mode="w+", dtype=dtype, shape=(self.capacity,)
+                )
+                for name, dtype in REPLAY_COLUMNS.items()
+            }
+            self._save_state()
+            return columns
+
+        state = json.loads(state_file.read_text())
+        if state["capacity"] != self.capacity:
+            msg = (
+                f"Replay buffer {path} has capacity {state['capacity']}, "
+                f"not {self.capacity}."
+            )
+            raise ValueError(msg)
+        self.size = state["size"]
+        self.position = state["position"]
+        self.max_priority = state["max_priority"]
+        return {
+            name: np.load(path / f"{name}.npy", mmap_mode="r+")
+            for name in REPLAY_COLUMNS
+        }
+
+    def _write(
+        self, values: dict[str, Any], n: int, priorities: np.ndarray | None
+    ) -> None:
+        """Write n transitions at the cursor, wrapping around the ring."""
+        if priorities is None:
+            priorities = np.full(n, self.max_priority)
+        else:
+            priorities = np.abs(priorities) + self.epsilon
+            self.max_priority = max(self.max_priority, float(priorities.max()))
+
+        # Only the last `capacity` transitions of an oversized batch survive
+        start = max(n - self.capacity, 0)
+        indices = (self.position + np.arange(start, n)) % self.capacity
+        for name, value in values.items():
+            array = np.asarray(value)
+            self.columns[name][indices] = array[start:] if array.ndim else array
+        self.columns["priority"][indices] = priorities[start:]
+
+        if self._tree is not None:
+            self._tree.update(indices, priorities[start:] ** self.alpha)
+        self.position = (self.position + n) % self.capacity
+        self.size = min(self.size + n, self.capacity)
@@ -0,0 +1,47 @@
+"""Simulation of games between agents for the Knucklebones environment."""
+
+from knucklebones_ml.simulation._history import (
+    HISTORY_COLUMNS,
+    HistoryReader,
+    HistoryRecorder,
+)
+from knucklebones_ml.simulation._matchup import (
+    AgentFactory,
+    SimulationHistory,
+    collect_matchup_statistics,
+    simulate_matchup,
+)
+from knucklebones_ml.simulation._stats import (
+    STATISTIC_RANGES,
+    Histogram,
+    MatchupReport,
+    MatchupStatistics,
+    RunningMoments,
+)
+from knucklebones_ml.simulation._tournament import (
+    Entrant,
+    MatchupResult,
+    TournamentResult,
+    fit_ratings,
+    run_tournament,
+)
+
+__all__ = [
+    "HISTORY_COLUMNS",
+    "STATISTIC_RANGES",
+    "AgentFactory",
+    "Entrant",
+    "Histogram",
+    "HistoryReader",
+    "HistoryRecorder",
+    "MatchupReport",
+    "MatchupResult",
+    "MatchupStatistics",
+    "RunningMoments",
+    "SimulationHistory",
+    "TournamentResult",
+    "collect_matchup_statistics",
+    "fit_ratings",
+    "run_tournament",
+    "simulate_matchup",
+]
@@ -0,0 +1,225 @@
+"""
+Streaming storage of per-turn game histories.
+
+Turns are buffered in fixed-width numpy columns and written to disk in chunks, one
+`.npy` file per column and chunk, so memory stays bounded however long a run is.
+Boards are stored in their packed 64-bit form, see `knucklebones_ml.packing`.
+
+A history directory contains files named `<prefix>-<chunk>.<column>.npy`. Several
+recorders can share a directory as long as they use different prefixes, and a new
+recorder replaces the chunks left by an earlier recorder with the same prefix.
+"""
+
+from __future__ import annotations
+
+import re
+from pathlib import Path
+from typing import TYPE_CHECKING, Self, SupportsInt
+
+import numpy as np
+
+from knucklebones_ml._env import packing
+
+if TYPE_CHECKING:
+    import os
+    from collections.abc import Iterator
+    from types import TracebackType
+
+    import pandas as pd
+
+HISTORY_COLUMNS = {
+    "game_id": np.int64,
+    "turn_number": np.int32,
+    "board": np.uint64,
+    "die": np.int8,
+    "action": np.int8,
+    "a1_score": np.int16,
+    "a2_score": np.int16,
+}
+
+
+class HistoryRecorder:
+    """Buffer turns in memory and write them to disk in fixed-size chunks."""
+
+    def __init__(
+        self,
+        path: str | os.PathLike,
+        chunk_size: int = 65536,
+        prefix: str = "history",
+    ) -> None:
+        """
+        Initialize the recorder.
+
+        Args:
+            path (str | os.PathLike): Directory the chunks are written to. It is
+                created if it does not exist.
+            chunk_size (int): Number of turns per chunk.
+            prefix (str): Name prefix of the chunk files of this recorder.
+                Existing chunks with this prefix are removed.
+
+        """
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        remove_chunks(self.path, re.escape(prefix))
+        self.chunk_size = chunk_size
+        self.prefix = prefix
+
+        self.num_chunks = 0
+        self._size = 0
+        self._buffers = {
+            name: np.zeros(chunk_size, dtype=dtype)
+            for name, dtype in HISTORY_COLUMNS.items()
+        }
+
+    def record(  # noqa: PLR0913, PLR0917
+        self,
+        game_id: SupportsInt,
+        turn_number: SupportsInt,
+        board: np.ndarray,
+        die: SupportsInt,
+        action: SupportsInt | None,
+        scores: np.ndarray,
+    ) -> None:
+        """
+        Record a single turn.
+
+        Args:
+            game_id (SupportsInt): Identifier of the game.
+            turn_number (SupportsInt): Index of the turn within the game.
+            board (np.ndarray): The board of shape (2, 3, 3) before the action.
+            die (SupportsInt): The die to be placed.
+            action (SupportsInt | None): The action taken, None (stored as -1)
+                for the final state of a game.
+            scores (np.ndarray): The scores of both players before the action.
+
+        """
+        i = self._size
+        buffers = self._buffers
+        buffers["game_id"][i] = game_id
+        buffers["turn_number"][i] = turn_number
+        buffers["board"][i] = packing.encode(board)
+        buffers["die"][i] = die
+        buffers["action"][i] = -1 if action is None else action
+        buffers["a1_score"][i] = scores[0]
+        buffers["a2_score"][i] = scores[1]
+
+        self._size += 1
+        if self._size == self.chunk_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the buffered turns to disk as a new chunk."""
+        if self._size == 0:
+            return
+
+        for name, buffer in self._buffers.items():
+            file = self.path / f"{self.prefix}-{self.num_chunks:06d}.{name}.npy"
+            np.save(file, buffer[: self._size])
+
+        self.num_chunks += 1
+        self._size = 0
+
+    def close(self) -> None:
+        """Write any remaining turns to disk."""
+        self.flush()
+
+    def __enter__(self) -> Self:
+        """Use the recorder as a context manager that closes on exit."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Close the recorder."""
+        self.close()
+
+
+def remove_chunks(path: str | os.PathLike, prefix_pattern: str) -> int:
+    """
+    Remove the chunk files of a history directory whose prefix matches a pattern.
+
+    Args:
+        path (str | os.PathLike): The history directory.
+        prefix_pattern (str): Regular expression matching whole prefixes.
+
+    Returns:
+        int: The number of removed files.
+
+    """
+    name = re.compile(rf"(?:{prefix_pattern})-\d{{6}}\.\w+\.npy")
+    files = [file for file in Path(path).glob("*.npy") if name.fullmatch(file.name)]
+    for file in files:
+        file.unlink()
+    return len(files)
+
+
+class HistoryReader:
+    """Memory-map the chunks of a history directory written by HistoryRecorder."""
+
+    def __init__(self, path: str | os.PathLike) -> None:
+        """
+        Initialize the reader.
+
+        Args:
+            path (str | os.PathLike): Directory containing the chunks.
+
+        """
+        self.path = Path(path)
+        self.chunks = sorted(
+            file.name.removesuffix(".game_id.npy")
+            for file in self.path.glob("*.game_id.npy")
+        )
+
+    def __len__(self) -> int:
+        """Return the total number of recorded turns."""
+        return sum(chunk["game_id"].size for chunk in self.iter_chunks(["game_id"]))
+
+    def iter_chunks(
+        self, columns: list[str] | None = None
+    ) -> Iterator[dict[str, np.ndarray]]:
+        """
+        Iterate over the chunks in order, without loading them into memory.
+
+        Args:
+            columns (list[str] | None): Columns to map. Defaults to all columns.
+
+        Yields:
+            dict[str, np.ndarray]: Read-only memory-mapped arrays of one chunk.
+
+        """
+        columns = columns or list(HISTORY_COLUMNS)
+        for chunk in self.chunks:
+            yield {
+                name: np.load(self.path / f"{chunk}.{name}.npy", mmap_mode="r")
+                for name in columns
+            }
+
+    def read(self, columns: list[str] | None = None) -> dict[str, np.ndarray]:
+        """
+        Read whole columns into memory.
+
+        Args:
+            columns (list[str] | None): Columns to read. Defaults to all columns.
+
+        Returns:
+            dict[str, np.ndarray]: The concatenated columns. Boards stay packed,
+                use `knucklebones_ml.packing.decode` to unpack them.
+
+        """
+        columns = columns or list(HISTORY_COLUMNS)
+        chunks = list(self.iter_chunks(columns))
+        return {
+            name: np.concatenate([chunk[name] for chunk in chunks])
+            if chunks
+            else np.zeros(0, dtype=HISTORY_COLUMNS[name])
+            for name in columns
+        }
+
+    def to_dataframe(self, columns: list[str] | None = None) -> pd.DataFrame:
+        """Read whole columns into a pandas DataFrame with one row per turn."""
+        import pandas as pd  # noqa: PLC0415
+
+        return pd.DataFrame(self.read(columns))
@@ -0,0 +1,313 @@
+"""Parallel simulation of matchups between two agents."""
+
+from __future__ import annotations
+
+import os
+from collections.abc import Callable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+from knucklebones_ml._env import raw_env
+from knucklebones_ml.simulation._history import HistoryRecorder, remove_chunks
+from knucklebones_ml.simulation._stats import MatchupStatistics
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+    from knucklebones_ml.agents import Agent
+
+AgentFactory = Callable[[int | None], "Agent"]
+
+# Chunk prefixes of the shards of simulate_matchup, see _play_shard
+_SHARD_PREFIX_PATTERN = r"shard-\d{12}"
+
+
+@dataclass
+class SimulationHistory:
+    """Per-game summaries of a simulated matchup, stored as columnar arrays."""
+
+    game_id: np.ndarray = field(default_factory=lambda: np.zeros(0, np.int64))
+    num_turns: np.ndarray = field(default_factory=lambda: np.zeros(0, np.int32))
+
+    a1_score: np.ndarray = field(default_factory=lambda: np.zeros(0, np.int16))
+    a2_score: np.ndarray = field(default_factory=lambda: np.zeros(0, np.int16))
+
+    truncated: np.ndarray = field(default_factory=lambda: np.zeros(0, np.bool_))
+
+    def __len__(self) -> int:
+        """Return the number of games in the history."""
+        return self.game_id.size
+
+    @classmethod
+    def concatenate(cls, histories: list[SimulationHistory]) -> SimulationHistory:
+        """Merge several histories into one, keeping their order."""
+        if not histories:
+            return cls()
+        return cls(
+            game_id=np.concatenate([h.game_id for h in histories]),
+            num_turns=np.concatenate([h.num_turns for h in histories]),
+            a1_score=np.concatenate([h.a1_score for h in histories]),
+            a2_score=np.concatenate([h.a2_score for h in histories]),
+            truncated=np.concatenate([h.truncated for h in histories]),
+        )
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """Convert the history into a pandas DataFrame with one row per game."""
+        import pandas as pd  # noqa: PLC0415
+
+        return pd.DataFrame(
+            {
+                "game_id": self.game_id,
+                "num_turns": self.num_turns,
+                "a1_score": self.a1_score,
+                "a2_score": self.a2_score,
+                "truncated": self.truncated,
+            }
+        )
+
+
+@dataclass(frozen=True)
+class _Shard:
+    """A contiguous block of games played by a single worker."""
+
+    agent1: AgentFactory
+    agent2: AgentFactory
+    first_game_id: int
+    num_games: int
+    max_steps: int | None
+    seed: np.random.SeedSequence
+    history_path: str | os.PathLike | None = None
+
+
+def simulate_matchup(  # noqa: PLR0913
+    agent1: AgentFactory,
+    agent2: AgentFactory,
+    num_games: int = 1000,
+    max_steps: int | None = None,
+    *,
+    seed: int | None = None,
+    num_workers: int | None = None,
+    games_per_shard: int = 1000,
+    history_path: str | os.PathLike | None = None,
+) -> SimulationHistory:
+    """
+    Simulate matches between two agents across a pool of worker processes.
+
+    Games are split into shards of `games_per_shard` games. Every shard gets its own
+    child of `SeedSequence(seed)`, from which it seeds both agents and every game,
+    so results only depend on `seed` and not on the number of workers.
+
+    Agents are passed as factories called with a seed, so each shard builds its own
+    independently seeded agents. Agent classes can be passed directly, use
+    `functools.partial` for agents that need more arguments.
+
+    Args:
+        agent1 (AgentFactory): Factory of the first agent, playing as player_0.
+        agent2 (AgentFactory): Factory of the second agent, playing as player_1.
+        num_games (int, optional): The number of games to simulate.
+            Must be at least 1. Defaults to 1000.
+        max_steps (int | None, optional): Maximum number of steps before a game is
+            truncated. Defaults to None (no truncation).
+        seed (int | None, optional): Seed of the whole simulation.
+        num_workers (int | None, optional): Number of worker processes. Defaults
+            to the number of CPUs. With 1 worker, games run in this process.
+        games_per_shard (int, optional): Number of games per unit of work.
+        history_path (str | os.PathLike | None, optional): If given, every turn is
+            streamed to this directory with a `HistoryRecorder`, one file prefix
+            per shard, replacing the history of an earlier simulation. Read it
+            back with `HistoryReader`.
+
+    Returns:
+        SimulationHistory: An object containing the per-game matchup results.
+
+    """
+    shards = _split_shards(
+        agent1, agent2, num_games, max_steps, seed, games_per_shard, history_path
+    )
+    if history_path is not None:
+        remove_chunks(history_path, _SHARD_PREFIX_PATTERN)
+    histories = list(_map_shards(_play_shard, shards, num_workers))
+    return SimulationHistory.concatenate(histories)
+
+
+def collect_matchup_statistics(  # noqa: PLR0913
+    agent1: AgentFactory,
+    agent2: AgentFactory,
+    num_games: int = 1000,
+    max_steps: int | None = None,
+    *,
+    seed: int | None = None,
+    num_workers: int | None = None,
+    games_per_shard: int = 1000,
+) -> MatchupStatistics:
+    """
+    Simulate matches between two agents, keeping only streaming statistics.
+
+    Games are played exactly like `simulate_matchup` with the same arguments, but
+    every shard is reduced to a `MatchupStatistics` in its worker, and shards are
+    merged in order as they finish. Memory does not grow with `num_games`, and
+    the results still only depend on `seed`. Call `report` on the result for a
+    summary.
+
+    Args:
+        agent1 (AgentFactory): Factory of the first agent, playing as player_0.
+        agent2 (AgentFactory): Factory of the second agent, playing as player_1.
+        num_games (int, optional): The number of games to simulate.
+            Must be at least 1. Defaults to 1000.
+        max_steps (int | None, optional): Maximum number of steps before a game is
+            truncated. Defaults to None (no truncation).
+        seed (int | None, optional): Seed of the whole simulation.
+        num_workers (int | None, optional): Number of worker processes. Defaults
+            to the number of CPUs. With 1 worker, games run in this process.
+        games_per_shard (int, optional): Number of games per unit of work.
+
+    Returns:
+        MatchupStatistics: The merged statistics of all games.
+
+    """
+    shards = _split_shards(
+        agent1, agent2, num_games, max_steps, seed, games_per_shard, None
+    )
+    statistics = MatchupStatistics()
+    for shard_statistics in _map_shards(_collect_shard, shards, num_workers):
+        statistics.merge(shard_statistics)
+    return statistics
+
+
+def _split_shards(  # noqa: PLR0913, PLR0917
+    agent1: AgentFactory,
+    agent2: AgentFactory,
+    num_games: int,
+    max_steps: int | None,
+    seed: int | None,
+    games_per_shard: int,
+    history_path: str | os.PathLike | None,
+) -> list[_Shard]:
+    """Split the games of a matchup into independently seeded shards."""
+    if num_games < 1:
+        msg = "num_games must be at least 1"
+        raise ValueError(msg)
+
+    num_shards = -(-num_games // games_per_shard)
+    seeds = np.random.SeedSequence(seed).spawn(num_shards)
+    return [
+        _Shard(
+            agent1=agent1,
+            agent2=agent2,
+            first_game_id=i * games_per_shard,
+            num_games=min(games_per_shard, num_games - i * games_per_shard),
+            max_steps=max_steps,
+            seed=shard_seed,
+            history_path=history_path,
+        )
+        for i, shard_seed in enumerate(seeds)
+    ]
+
+
+def _map_shards(
+    function: Callable[[Any], Any], shards: list[Any], num_workers: int | None
+) -> Iterator[Any]:
+    """
+    Apply a function to every shard, in a process pool if there is work to share.
+
+    Results are yielded in the order of the shards, as soon as they are available.
+    """
+    num_workers = min(num_workers or os.cpu_count() or 1, len(shards))
+    if num_workers <= 1:
+        yield from map(function, shards)
+        return
+
+    with ProcessPoolExecutor(max_workers=num_workers) as executor:
+        yield from executor.map(function, shards)
+
+
+def _shard_seeds(seed: np.random.SeedSequence, num_games: int) -> tuple[int, ...]:
+    """Draw the agent seeds followed by one seed per game from a shard seed."""
+    return tuple(int(s) for s in seed.generate_state(2 + num_games, np.uint64))
+
+
+def _collect_shard(shard: _Shard) -> MatchupStatistics:
+    """Play all games of a shard and reduce them to statistics."""
+    statistics = MatchupStatistics()
+    history = _play_shard(shard, statistics)
+    statistics.update_games(
+        history.num_turns, history.a1_score, history.a2_score, history.truncated
+    )
+    return statistics
+
+
+def _play_shard(
+    shard: _Shard, statistics: MatchupStatistics | None = None
+) -> SimulationHistory:
+    """Play all games of a shard and summarize each game, counting actions if asked."""
+    agent1_seed, agent2_seed, *game_seeds = _shard_seeds(shard.seed, shard.num_games)
+    players = {
+        "player_0": shard.agent1(agent1_seed),
+        "player_1": shard.agent2(agent2_seed),
+    }
+    sides = {"player_0": 0, "player_1": 1}
+
+    game_env = raw_env()
+    options = {"max_steps": shard.max_steps}
+
+    num_turns = np.zeros(shard.num_games, dtype=np.int32)
+    scores = np.zeros((shard.num_games, 2), dtype=np.int16)
+    truncated = np.zeros(shard.num_games, dtype=np.bool_)
+
+    recorder = None
+    if shard.history_path is not None:
+        prefix = f"shard-{shard.first_game_id:012d}"
+        recorder = HistoryRecorder(shard.history_path, prefix=prefix)
+
+    # Buffered turns are written even if a game fails partway through
+    try:
+        for i, game_seed in enumerate(game_seeds):
+            game_id = shard.first_game_id + i
+            game_env.reset(seed=game_seed, options=options)
+            for agent in game_env.agent_iter():
+                obs, _, terminated, truncation, _ = game_env.last()
+                if terminated or truncation:
+                    game_env.step(None)
+                    continue
+
+                action = players[agent].select_action(obs)
+                if statistics is not None:
+                    statistics.record_action(sides[agent], int(obs["die"]), int(action))
+                if recorder is not None:
+                    recorder.record(
+                        game_id,
+                        game_env.timestep,
+                        game_env.board,
+                        game_env.die,
+                        action,
+                        game_env.scores,
+                    )
+                game_env.step(action)
+
+            if recorder is not None:
+                recorder.record(
+                    game_id,
+                    game_env.timestep,
+                    game_env.board,
+                    game_env.die,
+                    None,
+                    game_env.scores,
+                )
+
+            num_turns[i] = game_env.timestep
+            scores[i] = game_env.scores
+            truncated[i] = truncation and not terminated
+    finally:
+        if recorder is not None:
+            recorder.close()
+
+    return SimulationHistory(
+        game_id=np.arange(shard.num_games, dtype=np.int64) + shard.first_game_id,
+        num_turns=num_turns,
+        a1_score=scores[:, 0],
+        a2_score=scores[:, 1],
+        truncated=truncated,
+    )
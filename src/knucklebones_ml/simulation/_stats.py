@@ -0,0 +1,260 @@
+"""
+Streaming statistics of matchups, in constant memory.
+
+`MatchupStatistics` accumulates the results of games as they finish: win, draw and
+loss counts, running means and variances of the game lengths, scores and margins,
+histograms of the same values, and how often each player picks each column for
+each die. Its size does not depend on the number of games, and the statistics of
+separate workers merge into exactly those of the whole run, so matchups of millions
+of games can be summarized without keeping their history.
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Range of every summarized value, longer games are counted in the last bin
+STATISTIC_RANGES = {
+    "num_turns": (0, 255),
+    "a1_score": (0, 162),
+    "a2_score": (0, 162),
+    "margin": (-162, 162),
+}
+
+
+@dataclass
+class RunningMoments:
+    """
+    The count, mean, variance and range of a stream of values.
+
+    Batches are combined with the parallel algorithm of Chan et al., which merges
+    the sums of squared deviations of two parts without revisiting their values.
+    """
+
+    count: int = 0
+    mean: float = 0.0
+    m2: float = 0.0  # Sum of squared deviations from the mean
+    minimum: float = math.inf
+    maximum: float = -math.inf
+
+    @property
+    def variance(self) -> float:
+        """The sample variance, NaN for fewer than 2 values."""
+        return self.m2 / (self.count - 1) if self.count > 1 else math.nan
+
+    @property
+    def std(self) -> float:
+        """The sample standard deviation, NaN for fewer than 2 values."""
+        return math.sqrt(self.variance)
+
+    def update(self, values: np.ndarray) -> None:
+        """Add a batch of values."""
+        values = np.asarray(values, dtype=np.float64).reshape(-1)
+        if values.size == 0:
+            return
+        mean = values.mean()
+        self.merge(
+            RunningMoments(
+                count=values.size,
+                mean=float(mean),
+                m2=float(np.square(values - mean).sum()),
+                minimum=float(values.min()),
+                maximum=float(values.max()),
+            )
+        )
+
+    def merge(self, other: RunningMoments) -> None:
+        """Add the values summarized by other moments."""
+        if other.count == 0:
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta**2 * self.count * other.count / count
+        self.count = count
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+
+
+@dataclass
+class Histogram:
+    """
+    Counts of integer values from `low` to `high`, one bin per value.
+
+    Values outside the range are counted in the first or last bin.
+    """
+
+    low: int
+    high: int
+    counts: np.ndarray = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.counts = np.zeros(self.high - self.low + 1, dtype=np.int64)
+
+    @property
+    def values(self) -> np.ndarray:
+        """The value of every bin."""
+        return np.arange(self.low, self.high + 1)
+
+    def update(self, values: np.ndarray) -> None:
+        """Add a batch of values."""
+        bins = np.clip(np.asarray(values, dtype=np.int64), self.low, self.high)
+        self.counts += np.bincount(
+            bins.reshape(-1) - self.low, minlength=self.counts.size
+        )
+
+    def merge(self, other: Histogram) -> None:
+        """Add the counts of a histogram over the same range."""
+        if (other.low, other.high) != (self.low, self.high):
+            msg = "Histograms must have the same range to be merged."
+            raise ValueError(msg)
+        self.counts += other.counts
+
+    def quantile(self, q: float | np.ndarray) -> np.ndarray:
+        """
+        Compute quantiles, interpolating linearly between values like numpy.
+
+        Quantiles are exact as long as no value was outside the range.
+        """
+        total = int(self.counts.sum())
+        if total == 0:
+            return np.full(np.shape(q), np.nan)
+        position = np.asarray(q, dtype=np.float64) * (total - 1)
+        lower = np.floor(position)
+        cumulative = np.cumsum(self.counts)
+        below = np.searchsorted(cumulative, lower, side="right")
+        above = np.searchsorted(cumulative, np.minimum(lower + 1, total - 1), "right")
+        return self.low + below + (position - lower) * (above - below)
+
+
+@dataclass
+class MatchupStatistics:
+    """Constant-size statistics of the games of a matchup, from player_0's view."""
+
+    wins: int = 0
+    draws: int = 0
+    losses: int = 0
+    truncated: int = 0
+    moments: dict[str, RunningMoments] = field(
+        default_factory=lambda: {name: RunningMoments() for name in STATISTIC_RANGES}
+    )
+    histograms: dict[str, Histogram] = field(
+        default_factory=lambda: {
+            name: Histogram(low, high) for name, (low, high) in STATISTIC_RANGES.items()
+        }
+    )
+    # Number of times each player placed each die in each column
+    action_counts: np.ndarray = field(
+        default_factory=lambda: np.zeros((2, 6, 3), dtype=np.int64)
+    )
+
+    @property
+    def num_games(self) -> int:
+        """The number of games summarized."""
+        return self.wins + self.draws + self.losses
+
+    def update_games(
+        self,
+        num_turns: np.ndarray,
+        a1_score: np.ndarray,
+        a2_score: np.ndarray,
+        truncated: np.ndarray,
+    ) -> None:
+        """Add the results of a batch of finished games."""
+        a1_score = np.asarray(a1_score, dtype=np.int64)
+        a2_score = np.asarray(a2_score, dtype=np.int64)
+        margin = a1_score - a2_score
+        self.wins += int((margin > 0).sum())
+        self.draws += int((margin == 0).sum())
+        self.losses += int((margin < 0).sum())
+        self.truncated += int(np.count_nonzero(truncated))
+        values = {
+            "num_turns": num_turns,
+            "a1_score": a1_score,
+            "a2_score": a2_score,
+            "margin": margin,
+        }
+        for name, batch in values.items():
+            self.moments[name].update(batch)
+            self.histograms[name].update(batch)
+
+    def record_action(self, player: int, die: int, action: int) -> None:
+        """Count a die placed by a player in a column."""
+        self.action_counts[player, die - 1, action] += 1
+
+    def merge(self, other: MatchupStatistics) -> None:
+        """Add the statistics of other games, e.g. those of another worker."""
+        self.wins += other.wins
+        self.draws += other.draws
+        self.losses += other.losses
+        self.truncated += other.truncated
+        for name in STATISTIC_RANGES:
+            self.moments[name].merge(other.moments[name])
+            self.histograms[name].merge(other.histograms[name])
+        self.action_counts += other.action_counts
+
+    def report(self) -> MatchupReport:
+        """Summarize the statistics."""
+        num_games = max(self.num_games, 1)
+        with np.errstate(invalid="ignore"):
+            frequencies = self.action_counts / self.action_counts.sum(
+                axis=2, keepdims=True
+            )
+        quartiles = np.array([0.25, 0.5, 0.75])
+        summary = {}
+        for name in STATISTIC_RANGES:
+            moments = self.moments[name]
+            lower, median, upper = self.histograms[name].quantile(quartiles)
+            summary[name] = {
+                "count": moments.count,
+                "mean": moments.mean if moments.count else math.nan,
+                "std": moments.std,
+                "min": moments.minimum if moments.count else math.nan,
+                "25%": float(lower),
+                "50%": float(median),
+                "75%": float(upper),
+                "max": moments.maximum if moments.count else math.nan,
+            }
+        return MatchupReport(
+            num_games=self.num_games,
+            win_rate=self.wins / num_games,
+            draw_rate=self.draws / num_games,
+            loss_rate=self.losses / num_games,
+            truncated=self.truncated,
+            summary=summary,
+            distributions={
+                name: histogram.counts.copy()
+                for name, histogram in self.histograms.items()
+            },
+            action_frequencies=frequencies,
+        )
+
+
+@dataclass(frozen=True)
+class MatchupReport:
+    """The final summary of a matchup, from player_0's point of view."""
+
+    num_games: int
+    win_rate: float
+    draw_rate: float
+    loss_rate: float
+    truncated: int
+    # Count, mean, std, min, quartiles and max of every statistic
+    summary: dict[str, dict[str, float]]
+    # Histogram counts of every statistic, over the values of STATISTIC_RANGES
+    distributions: dict[str, np.ndarray]
+    # Frequency of each column for each player and die, shape (2, 6, 3)
+    action_frequencies: np.ndarray
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """Convert the summary into a DataFrame laid out like `DataFrame.describe`."""
+        import pandas as pd  # noqa: PLC0415
+
+        return pd.DataFrame(self.summary)
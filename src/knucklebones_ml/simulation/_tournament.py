@@ -0,0 +1,323 @@
+"""
+Round-robin tournaments between agent configurations.
+
+Every pair of entrants plays a matchup in both seat orders. Matchups are played
+across worker processes with `collect_matchup_statistics`, and each finished matchup is
+written to a JSON checkpoint, so an interrupted tournament resumes where it stopped.
+Ratings are fitted with a Bradley-Terry model and reported on the Elo scale.
+"""
+
+from __future__ import annotations
+
+import itertools
+import json
+import os
+import zlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
+from functools import partial
+from pathlib import Path
+from statistics import NormalDist
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+from knucklebones_ml import agents
+from knucklebones_ml.simulation._matchup import collect_matchup_statistics
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    import pandas as pd
+
+    from knucklebones_ml.simulation._matchup import AgentFactory
+
+# Rating difference of a 10:1 favourite, as in Elo
+ELO_SCALE = 400 / np.log(10)
+
+
+@dataclass(frozen=True)
+class Entrant:
+    """An agent configuration, naming an agent class of `knucklebones_ml.agents`."""
+
+    agent: str
+    kwargs: dict[str, Any] = field(default_factory=dict)
+
+    def factory(self) -> AgentFactory:
+        """Return a factory building the agent from a seed."""
+        if self.agent not in agents.__all__:
+            msg = f"Unknown agent {self.agent!r}."
+            raise ValueError(msg)
+        return partial(getattr(agents, self.agent), **self.kwargs)
+
+
+@dataclass(frozen=True)
+class MatchupResult:
+    """The outcome of a matchup, from the point of view of the first player."""
+
+    player_0: str
+    player_1: str
+    wins: int
+    losses: int
+    draws: int
+    truncated: int
+
+
+@dataclass
+class TournamentResult:
+    """The matchups of a tournament and the fitted ratings of its entrants."""
+
+    names: list[str]
+    matchups: list[MatchupResult]
+    ratings: np.ndarray
+    lower: np.ndarray
+    upper: np.ndarray
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """Convert the ratings into a pandas DataFrame, best entrant first."""
+        import pandas as pd  # noqa: PLC0415
+
+        df = pd.DataFrame(
+            {
+                "name": self.names,
+                "rating": self.ratings,
+                "lower": self.lower,
+                "upper": self.upper,
+            }
+        )
+        return df.sort_values("rating", ascending=False, ignore_index=True)
+
+
+@dataclass(frozen=True)
+class _MatchupTask:
+    """A matchup still to be played."""
+
+    player_0: str
+    player_1: str
+    agent1: AgentFactory
+    agent2: AgentFactory
+    num_games: int
+    max_steps: int | None
+    seed: int
+
+
+def run_tournament(  # noqa: PLR0913
+    entrants: dict[str, Entrant],
+    games_per_matchup: int = 100,
+    max_steps: int | None = None,
+    *,
+    seed: int | None = None,
+    num_workers: int | None = None,
+    checkpoint_path: str | os.PathLike | None = None,
+    confidence: float = 0.95,
+) -> TournamentResult:
+    """
+    Play a round-robin tournament and rate the entrants.
+
+    Every ordered pair of entrants plays `games_per_matchup` games, so each pairing
+    is played in both seat orders. Matchups are spread over a pool of worker
+    processes, and each one is seeded from `seed` and the names of its players, so
+    results do not depend on the number of workers or on the other entrants.
+
+    With a `checkpoint_path`, finished matchups are saved as they complete and
+    matchups found in an existing checkpoint are not played again. Entrants can be
+    added between runs, but the settings and the existing entrants must not change.
+
+    Args:
+        entrants (dict[str, Entrant]): The entrants by name.
+        games_per_matchup (int, optional): Number of games per seat order.
+        max_steps (int | None, optional): Maximum number of steps before a game is
+            truncated. Defaults to None (no truncation).
+        seed (int | None, optional): Seed of the whole tournament. When resuming,
+            defaults to the seed stored in the checkpoint.
+        num_workers (int | None, optional): Number of worker processes. Defaults
+            to the number of CPUs. With 1 worker, games run in this process.
+        checkpoint_path (str | os.PathLike | None, optional): JSON file storing the
+            finished matchups.
+        confidence (float, optional): Confidence level of the rating intervals.
+
+    Returns:
+        TournamentResult: The matchups and the ratings of the entrants.
+
+    """
+    if len(entrants) < 2:  # noqa: PLR2004
+        msg = "A tournament needs at least 2 entrants."
+        raise ValueError(msg)
+    factories = {name: entrant.factory() for name, entrant in entrants.items()}
+
+    checkpoint = {
+        "seed": seed,
+        "games_per_matchup": games_per_matchup,
+        "max_steps": max_steps,
+        "entrants": {name: asdict(entrant) for name, entrant in entrants.items()},
+        "matchups": [],
+    }
+    if checkpoint_path is not None and Path(checkpoint_path).exists():
+        checkpoint = _resume(checkpoint, Path(checkpoint_path))
+    if checkpoint["seed"] is None:
+        checkpoint["seed"] = np.random.SeedSequence().entropy
+    results = [MatchupResult(**matchup) for matchup in checkpoint["matchups"]]
+
+    played = {(result.player_0, result.player_1) for result in results}
+    tasks = [
+        _MatchupTask(
+            player_0=first,
+            player_1=second,
+            agent1=factories[first],
+            agent2=factories[second],
+            num_games=games_per_matchup,
+            max_steps=max_steps,
+            seed=_matchup_seed(checkpoint["seed"], first, second),
+        )
+        for first, second in itertools.permutations(entrants, 2)
+        if (first, second) not in played
+    ]
+
+    for result in _map_matchups(tasks, num_workers):
+        results.append(result)
+        if checkpoint_path is not None:
+            checkpoint["matchups"] = [asdict(result) for result in results]
+            _write_checkpoint(checkpoint, Path(checkpoint_path))
+
+    names = list(entrants)
+    ratings, errors = fit_ratings(names, results)
+    margin = NormalDist().inv_cdf((1 + confidence) / 2) * errors
+    return TournamentResult(
+        names=names,
+        matchups=[r for r in results if r.player_0 in names and r.player_1 in names],
+        ratings=ratings,
+        lower=ratings - margin,
+        upper=ratings + margin,
+    )
+
+
+def fit_ratings(
+    names: list[str],
+    matchups: list[MatchupResult],
+    prior: float = 0.5,
+    tolerance: float = 1e-9,
+    max_iterations: int = 10_000,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Fit Bradley-Terry ratings to matchup results.
+
+    A draw counts as half a win for both players, and every pair of entrants gets
+    `prior` virtual wins each, which keeps the ratings finite for entrants that never
+    won or never lost. Strengths are fitted with the minorization-maximization
+    algorithm, and their standard errors come from the Fisher information.
+
+    Args:
+        names (list[str]): The names of the entrants to rate. Matchups involving
+            other players are ignored.
+        matchups (list[MatchupResult]): The matchup results.
+        prior (float, optional): Virtual wins of each entrant against every other.
+        tolerance (float, optional): Convergence threshold on the strengths.
+        max_iterations (int, optional): Maximum number of iterations.
+
+    Returns:
+        A tuple (ratings, errors) of arrays on the Elo scale, where the ratings
+        average to 0.
+
+    """
+    index = {name: i for i, name in enumerate(names)}
+    wins = np.full((len(names), len(names)), prior)
+    np.fill_diagonal(wins, 0)
+    for matchup in matchups:
+        if matchup.player_0 in index and matchup.player_1 in index:
+            i, j = index[matchup.player_0], index[matchup.player_1]
+            wins[i, j] += matchup.wins + matchup.draws / 2
+            wins[j, i] += matchup.losses + matchup.draws / 2
+    games = wins + wins.T
+    total_wins = wins.sum(axis=1)
+
+    strengths = np.ones(len(names))
+    for _ in range(max_iterations):
+        updated = total_wins / (games / (strengths[:, None] + strengths)).sum(axis=1)
+        updated /= np.exp(np.log(updated).mean())
+        converged = np.abs(updated - strengths).max() < tolerance
+        strengths = updated
+        if converged:
+            break
+
+    # The information matrix is singular along a common shift of all ratings, its
+    # pseudo-inverse is the covariance of ratings constrained to average to 0
+    p = strengths[:, None] / (strengths[:, None] + strengths)
+    information = -games * p * p.T
+    np.fill_diagonal(information, 0)
+    np.fill_diagonal(information, -information.sum(axis=1))
+    covariance = np.linalg.pinv(information)
+
+    ratings = ELO_SCALE * np.log(strengths)
+    errors = ELO_SCALE * np.sqrt(np.diag(covariance))
+    return ratings, errors
+
+
+def _matchup_seed(seed: int, player_0: str, player_1: str) -> int:
+    """Derive the seed of a matchup from the tournament seed and its players."""
+    key = zlib.crc32(f"{player_0}\0{player_1}".encode())
+    sequence = np.random.SeedSequence(seed, spawn_key=(key,))
+    return int(sequence.generate_state(1, np.uint64)[0])
+
+
+def _resume(checkpoint: dict[str, Any], path: Path) -> dict[str, Any]:
+    """Load a checkpoint, checking it was written by the same tournament."""
+    saved = json.loads(path.read_text())
+    settings = ("games_per_matchup", "max_steps")
+    if checkpoint["seed"] is None:
+        checkpoint["seed"] = saved["seed"]
+
+    changed = [key for key in ("seed", *settings) if saved[key] != checkpoint[key]]
+    changed += [
+        name
+        for name, entrant in checkpoint["entrants"].items()
+        if saved["entrants"].get(name, entrant) != entrant
+    ]
+    if changed:
+        msg = f"Checkpoint {path} was written with different {', '.join(changed)}."
+        raise ValueError(msg)
+
+    checkpoint["entrants"] = saved["entrants"] | checkpoint["entrants"]
+    checkpoint["matchups"] = saved["matchups"]
+    return checkpoint
+
+
+def _write_checkpoint(checkpoint: dict[str, Any], path: Path) -> None:
+    """Write a checkpoint atomically, so an interruption never corrupts it."""
+    temporary = path.with_name(f"{path.name}.tmp")
+    temporary.write_text(json.dumps(checkpoint, indent=2))
+    temporary.replace(path)
+
+
+def _map_matchups(
+    tasks: list[_MatchupTask], num_workers: int | None
+) -> Iterator[MatchupResult]:
+    """Play matchups, in a process pool if there is work to share, as they finish."""
+    num_workers = min(num_workers or os.cpu_count() or 1, len(tasks))
+    if num_workers <= 1:
+        yield from map(_play_matchup, tasks)
+        return
+
+    with ProcessPoolExecutor(max_workers=num_workers) as executor:
+        futures = [executor.submit(_play_matchup, task) for task in tasks]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def _play_matchup(task: _MatchupTask) -> MatchupResult:
+    """Play all games of a matchup in the current process."""
+    statistics = collect_matchup_statistics(
+        task.agent1,
+        task.agent2,
+        num_games=task.num_games,
+        max_steps=task.max_steps,
+        seed=task.seed,
+        num_workers=1,
+    )
+    return MatchupResult(
+        player_0=task.player_0,
+        player_1=task.player_1,
+        wins=statistics.wins,
+        losses=statistics.losses,
+        draws=statistics.draws,
+        truncated=statistics.truncated,
+    )
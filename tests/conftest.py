@@ -1,6 +1,8 @@
 import numpy as np
 import pytest
 
+from knucklebones_ml import logic
+
 
 @pytest.fixture
 def sample_board_empty():
@@ -29,3 +31,23 @@ def sample_board_mixed():
                         [0, 4, 4],
                         [0, 4, 4]]])
     # fmt: on
+
+
+@pytest.fixture
+def random_boards():
+    """Return a function building boards by playing random legal moves."""
+
+    def build(num_boards, num_moves, seed=0):  # noqa: ANN202
+        """Play up to num_moves random legal moves on each board of a batch."""
+        rng = np.random.default_rng(seed)
+        boards = logic.get_boards(num_boards, 3, 3)
+        for board in boards:
+            for _ in range(rng.integers(num_moves + 1)):
+                side = rng.integers(2)
+                actions = np.flatnonzero(logic.get_valid_actions(board)[side])
+                if actions.size == 0:
+                    break
+                logic.apply_action(rng.integers(1, 7), board, side, rng.choice(actions))
+        return boards
+
+    return build
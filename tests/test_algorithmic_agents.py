@@ -1,5 +1,6 @@
 import numpy as np
 
+from knucklebones_ml import VectorKnucklebonesEnv
 from knucklebones_ml.agents import AggressiveAgent
 
 
@@ -26,3 +27,15 @@ def test_aggressive_agent():
     obs["action_mask"] = np.array([1, 1, 1])
     action = agent.select_action(obs)
     assert action == 2
+
+
+def test_aggressive_agent_batch():
+    agent = AggressiveAgent()
+    env = VectorKnucklebonesEnv(num_envs=200)
+    observations = env.reset(seed=0)
+    for _ in range(10):
+        actions = agent.select_actions(observations)
+        for i in range(200):
+            single = {name: value[i] for name, value in observations.items()}
+            assert actions[i] == agent.select_action(single)
+        observations, *_ = env.step(actions)
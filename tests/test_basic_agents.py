@@ -1,4 +1,5 @@
 import numpy as np
+import pytest
 
 from knucklebones_ml.agents import ColumnFillAgent, RandomAgent, SequentialAgent
 
@@ -46,3 +47,40 @@ def test_sequential_agent():
     for i in range(9):
         action = agent.select_action(obs)
         assert action == [2, 1, 0][i % 3]
+
+
+def test_random_agent_batch():
+    agent = RandomAgent(seed=42)
+    masks = np.array([[1, 1, 1], [1, 0, 1], [0, 1, 0]] * 200)
+    actions = agent.select_actions({"action_mask": masks})
+    assert actions.shape == (600,)
+    assert np.all(masks[np.arange(600), actions] == 1)
+    assert np.array_equal(np.bincount(actions[2::3]), [0, 200])
+    assert set(actions[::3]) == {0, 1, 2}
+
+    with pytest.raises(ValueError, match=r"No legal actions available\."):
+        agent.select_actions({"action_mask": np.array([[1, 0, 0], [0, 0, 0]])})
+
+
+def test_column_fill_agent_batch():
+    agent = ColumnFillAgent(seed=42)
+    masks = np.array([[0, 1, 1], [1, 1, 0], [1, 0, 0]])
+    assert agent.select_actions({"action_mask": masks}).tolist() == [2, 1, 0]
+
+    with pytest.raises(ValueError, match=r"No legal actions available\."):
+        agent.select_actions({"action_mask": np.zeros((2, 3))})
+
+
+def test_sequential_agent_batch():
+    agent = SequentialAgent(seed=42)
+    masks = np.array([[1, 1, 1], [1, 1, 1], [0, 1, 1]])
+    actions = [agent.select_actions({"action_mask": masks}).tolist() for _ in range(3)]
+    assert actions == [[2, 2, 2], [1, 1, 1], [0, 0, 2]]
+
+    # Every game matches a scalar agent playing it alone
+    single = SequentialAgent(seed=42)
+    assert [single.select_action({"action_mask": masks[2]}) for _ in range(3)] == [
+        2,
+        1,
+        2,
+    ]
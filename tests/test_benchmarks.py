@@ -0,0 +1,49 @@
+import json
+
+import pytest
+
+from knucklebones_ml.benchmarks import (
+    BENCHMARKS,
+    Benchmark,
+    Comparison,
+    compare,
+    main,
+    time_benchmark,
+)
+
+
+@pytest.mark.parametrize("benchmark", BENCHMARKS, ids=lambda b: b.name)
+def test_benchmark_setup(benchmark):
+    function = benchmark.setup()
+    for _ in range(3):
+        function()
+
+
+def test_time_benchmark():
+    calls = []
+    benchmark = Benchmark("test", lambda: lambda: calls.append(1), ops=10)
+    seconds = time_benchmark(benchmark, min_time=0.001, repeat=2)
+    assert len(calls) > 10
+    assert 0 < seconds < 1e-3
+
+
+def test_compare():
+    results = {"results": {"a": {"seconds": 2.0}, "b": {"seconds": 1.0}}}
+    baseline = {"results": {"a": {"seconds": 1.0}, "c": {"seconds": 1.0}}}
+    assert compare(results, baseline) == [Comparison("a", 2.0, 1.0)]
+    assert Comparison("a", 2.0, 1.0).regressed(0.5)
+    assert not Comparison("a", 1.2, 1.0).regressed(0.5)
+
+
+def test_main(tmp_path, capsys):
+    baseline = tmp_path / "baseline.json"
+    args = ["-k", "logic.get_valid_actions", "--min-time", "0.001", "--repeat", "1"]
+    assert main([*args, "--save-baseline", str(baseline)]) == 0
+    results = json.loads(baseline.read_text())
+    assert list(results["results"]) == ["logic.get_valid_actions"]
+
+    # A much faster baseline flags a regression
+    results["results"]["logic.get_valid_actions"]["seconds"] /= 10
+    baseline.write_text(json.dumps(results))
+    assert main([*args, "--baseline", str(baseline), "--threshold", "0.5"]) == 1
+    assert "REGRESSION" in capsys.readouterr().out
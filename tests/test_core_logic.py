@@ -69,3 +69,80 @@ def test_board_is_full(sample_board_empty, sample_board_full, sample_board_mixed
     assert not logic.board_is_full(sample_board_empty)
     assert logic.board_is_full(sample_board_full)
     assert not logic.board_is_full(sample_board_mixed)
+
+
+def test_get_boards():
+    boards = logic.get_boards(4, 3, 3)
+    assert boards.shape == (4, 2, 3, 3)
+    assert np.all(boards == 0)
+
+
+def test_batch_scores_and_masks(sample_board_empty, sample_board_full, random_boards):
+    boards = random_boards(200, 16)
+    boards[0], boards[1] = sample_board_empty, sample_board_full
+
+    assert np.array_equal(
+        logic.evaluate_column_scores_batch(boards),
+        [logic.evaluate_column_scores(b) for b in boards],
+    )
+    assert np.array_equal(
+        logic.evaluate_board_scores_batch(boards),
+        [logic.evaluate_board_scores(b) for b in boards],
+    )
+    assert np.array_equal(
+        logic.get_valid_actions_batch(boards),
+        [logic.get_valid_actions(b) for b in boards],
+    )
+    assert np.array_equal(
+        logic.board_is_full_batch(boards),
+        [logic.board_is_full(b) for b in boards],
+    )
+
+
+def test_apply_action_batch(random_boards):
+    rng = np.random.default_rng(1)
+    boards = random_boards(500, 12)
+    reference = boards.copy()
+
+    sides = rng.integers(0, 2, size=500)
+    valid = logic.get_valid_actions_batch(boards)[np.arange(500), sides]
+    playable = valid.any(axis=1)
+    boards, reference, sides = boards[playable], reference[playable], sides[playable]
+    dice = rng.integers(1, 7, size=sides.size)
+    actions = np.argmax(valid[playable] * rng.random((sides.size, 3)), axis=1)
+
+    result = logic.apply_action_batch(dice, boards, sides, actions)
+    for i in range(sides.size):
+        logic.apply_action(dice[i], reference[i], sides[i], actions[i])
+
+    assert result is boards
+    assert np.array_equal(boards, reference)
+
+
+def test_apply_action_batch_scalar_arguments(sample_board_empty):
+    boards = np.stack([sample_board_empty] * 3)
+    logic.apply_action_batch(5, boards, 1, np.array([0, 1, 2]))
+    assert np.array_equal(boards[:, 1, 2], np.eye(3) * 5)
+
+
+def test_apply_action_batch_full_column(sample_board_empty, sample_board_full):
+    boards = np.stack([sample_board_empty, sample_board_full])
+    with pytest.raises(ValueError, match=r"Column 2 is full on board 1."):
+        logic.apply_action_batch([1, 1], boards, [0, 0], [2, 2])
+
+
+def test_column_tables():
+    assert logic.COLUMN_CELLS.shape == (logic.COLUMN_STATES, 3)
+    for code, cells in enumerate(logic.COLUMN_CELLS):
+        assert code == cells[0] * 49 + cells[1] * 7 + cells[2]
+        counts = np.bincount(cells, minlength=7)[1:]
+        assert logic.COLUMN_SCORES[code] == (np.arange(1, 7) * counts**2).sum()
+
+
+def test_encode_decode_columns(sample_board_mixed, random_boards):
+    codes = logic.encode_columns(sample_board_mixed)
+    assert np.array_equal(codes, [[0, 6 * 49 + 6 * 7 + 2, 3 * 57], [0, 4 * 8, 4 * 8]])
+    assert np.array_equal(logic.decode_columns(codes), sample_board_mixed)
+
+    boards = random_boards(50, 16)
+    assert np.array_equal(logic.decode_columns(logic.encode_columns(boards)), boards)
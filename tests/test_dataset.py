@@ -0,0 +1,75 @@
+import json
+
+import numpy as np
+import pytest
+
+from knucklebones_ml import packing
+from knucklebones_ml.data import DatasetReader, generate_dataset, main
+from knucklebones_ml.simulation import Entrant
+
+SMART = Entrant("SmartAgent")
+RANDOM = Entrant("RandomAgent")
+
+
+def read_all(path):
+    reader = DatasetReader(path)
+    return reader.read() | reader.read(["num_positions", "truncated"])
+
+
+def test_generate_dataset(tmp_path):
+    index = generate_dataset(
+        SMART, RANDOM, tmp_path, num_games=25, games_per_shard=10, seed=0
+    )
+    assert [shard["num_games"] for shard in index["shards"]] == [10, 10, 5]
+
+    data = read_all(tmp_path)
+    assert len(DatasetReader(tmp_path)) == data["board"].size
+    assert data["num_positions"].sum() == data["board"].size
+    assert np.all(data["num_positions"] >= 17)
+    assert not data["truncated"].any()
+
+    starts = np.cumsum(data["num_positions"]) - data["num_positions"]
+    boards = packing.decode(data["board"])
+    assert not boards[starts].any()
+    assert np.array_equal(data["player"][starts], np.zeros(25))
+    assert np.array_equal(data["outcome"], np.sign(data["margin"]))
+
+    # Both players see the same game from opposite sides
+    assert np.array_equal(data["margin"][starts], -data["margin"][starts + 1])
+
+
+def test_dataset_does_not_depend_on_workers(tmp_path):
+    kwargs = {"num_games": 12, "games_per_shard": 4, "seed": 5}
+    generate_dataset(RANDOM, RANDOM, tmp_path / "a", num_workers=1, **kwargs)
+    generate_dataset(RANDOM, RANDOM, tmp_path / "b", num_workers=2, **kwargs)
+    for name, column in read_all(tmp_path / "a").items():
+        assert np.array_equal(column, read_all(tmp_path / "b")[name])
+
+
+def test_resume_and_extend(tmp_path):
+    kwargs = {"games_per_shard": 10, "seed": 1, "num_workers": 1}
+    expected = generate_dataset(SMART, SMART, tmp_path / "full", 35, **kwargs)
+
+    # An interrupted run, missing its last shards, and a shorter run
+    path = tmp_path / "resumed"
+    generate_dataset(SMART, SMART, path, 25, **kwargs)
+    index = json.loads((path / "index.json").read_text())
+    index["shards"] = index["shards"][:1]
+    (path / "index.json").write_text(json.dumps(index))
+
+    resumed = generate_dataset(SMART, SMART, path, 35, **kwargs)
+    assert resumed["shards"] == expected["shards"]
+    for name, column in read_all(tmp_path / "full").items():
+        assert np.array_equal(column, read_all(path)[name])
+
+    with pytest.raises(ValueError, match="players"):
+        generate_dataset(SMART, RANDOM, path, 35, **kwargs)
+    with pytest.raises(ValueError, match="seed"):
+        generate_dataset(SMART, SMART, path, 35, games_per_shard=10, seed=2)
+
+
+def test_main(tmp_path, capsys):
+    args = [str(tmp_path), "-n", "6", "--games-per-shard", "4", "--seed", "3"]
+    assert main([*args, "--player-0", "ComboAgent", "-j", "1"]) == 0
+    assert "2 shards" in capsys.readouterr().out
+    assert DatasetReader(tmp_path).index["players"][1]["agent"] == "ComboAgent"
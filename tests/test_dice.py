@@ -0,0 +1,89 @@
+import numpy as np
+import pytest
+
+from knucklebones_ml import DiceStream, raw_env
+
+
+def roll_many(stream, n):
+    return np.array([stream.roll() for _ in range(n)])
+
+
+def test_rolls_are_deterministic_per_seed():
+    assert np.array_equal(roll_many(DiceStream(5), 100), roll_many(DiceStream(5), 100))
+    assert not np.array_equal(
+        roll_many(DiceStream(5), 100), roll_many(DiceStream(6), 100)
+    )
+
+
+def test_rolls_do_not_depend_on_block_size():
+    expected = roll_many(DiceStream(7), 200)
+    assert np.array_equal(roll_many(DiceStream(7, block_size=1), 200), expected)
+    assert np.array_equal(roll_many(DiceStream(7, block_size=4096), 200), expected)
+
+
+def test_seeds_select_jumped_substreams():
+    seed = 2**70 + 3
+    words = np.random.PCG64DXSM(0).jumped(seed).random_raw(4)
+    faces = words.astype("<u8").view(np.uint8)
+    expected = faces[faces < 252] % 6 + 1
+    assert np.array_equal(DiceStream(seed).peek(len(expected)), expected)
+
+
+def test_reseed_ignores_previous_rolls():
+    stream = DiceStream(1, block_size=8)
+    roll_many(stream, 50)
+    stream.reseed(3)
+    assert np.array_equal(roll_many(stream, 50), roll_many(DiceStream(3), 50))
+
+
+def test_seed_sequences_and_fresh_entropy():
+    sequence = np.random.SeedSequence(11)
+    assert np.array_equal(DiceStream(sequence).peek(20), DiceStream(sequence).peek(20))
+    assert not np.array_equal(DiceStream().peek(50), DiceStream().peek(50))
+    with pytest.raises(ValueError, match="non-negative"):
+        DiceStream(-1)
+
+
+def test_peek_does_not_roll():
+    stream = DiceStream(2, block_size=8)
+    upcoming = stream.peek(30)
+    assert upcoming.dtype == np.int16
+    assert np.array_equal(roll_many(stream, 30), upcoming)
+
+
+def test_faces_are_uniform():
+    dice = DiceStream(0).peek(60_000)
+    counts = np.bincount(dice, minlength=7)
+    assert counts[0] == 0
+    assert np.all(np.abs(counts[1:] - 10_000) < 400)
+
+
+def test_environment_rolls_from_its_stream():
+    game_env = raw_env()
+    game_env.reset(seed=4)
+    upcoming = game_env.dice_stream.peek(10)
+    assert game_env.die == DiceStream(4).roll()
+
+    rolled = []
+    for _ in range(10):
+        side = game_env.possible_agents.index(game_env.agent_selection)
+        game_env.step(int(np.argmax(game_env.action_masks[side])))
+        rolled.append(game_env.die)
+    assert np.array_equal(rolled, upcoming)
+
+
+def test_unseeded_resets_continue_the_stream():
+    game_env = raw_env()
+    game_env.reset(seed=9)
+    upcoming = game_env.dice_stream.peek(1)
+    game_env.reset()
+    assert game_env.die == upcoming[0]
+
+
+@pytest.mark.parametrize("seed", [np.int64(3), np.uint64(3), np.int32(3)])
+def test_numpy_integer_seeds(seed):
+    game_env = raw_env()
+    game_env.reset(seed=seed)
+    assert game_env.die == DiceStream(3).roll()
+    with pytest.raises(ValueError, match="non-negative"):
+        DiceStream(np.int64(-1))
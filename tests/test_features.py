@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+
+from knucklebones_ml import VectorKnucklebonesEnv, features, logic
+
+
+def reference_features(board, die):
+    """Build the features of one board cell by cell."""
+    columns = []
+    for side in range(2):
+        for column in range(3):
+            cells = board[side, :, column]
+            score = logic.evaluate_column_scores(board)[side, column]
+            one_hot = [cells[row] == face for face in range(1, 7) for row in range(3)]
+            counts = [(cells == face).sum() / 3 for face in range(1, 7)]
+            threats = [
+                score - column_score(cells[cells != face]) for face in range(1, 7)
+            ]
+            columns += [
+                *one_hot,
+                *counts,
+                (cells != 0).sum() / 3,
+                score / 54,
+                *(t / 54 for t in threats),
+            ]
+
+    scores = logic.evaluate_board_scores(board)
+    mask = logic.get_valid_actions(board)[0]
+    gains, losses = [], []
+    for column in range(3):
+        after = board.copy()
+        if mask[column]:
+            logic.apply_action(die, after, 0, column)
+        change = logic.evaluate_column_scores(after) - logic.evaluate_column_scores(
+            board
+        )
+        gains.append(change[0, column] / 54)
+        losses.append(-change[1, column] / 54)
+    return np.array(
+        [
+            *columns,
+            *(np.arange(1, 7) == die),
+            *gains,
+            *losses,
+            *(scores / 162),
+            (scores[0] - scores[1]) / 162,
+            *mask,
+        ],
+        dtype=np.float32,
+    )
+
+
+def column_score(cells):
+    return sum(face * (cells == face).sum() ** 2 for face in range(1, 7))
+
+
+def test_encode_observation_matches_reference(random_boards):
+    boards = random_boards(200, 16, seed=4)
+    dice = np.random.default_rng(0).integers(1, 7, size=200)
+    encoded = features.encode_observation(
+        {"board": boards, "die": dice, "action_mask": None}
+    )
+    assert encoded.shape == (200, features.FEATURE_SIZE)
+    assert encoded.dtype == np.float32
+    for board, die, row in zip(boards, dice, encoded, strict=True):
+        np.testing.assert_allclose(row, reference_features(board, die), atol=1e-6)
+
+
+def test_single_observation_and_out():
+    venv = VectorKnucklebonesEnv(16)
+    observations = venv.reset(seed=0)
+    for _ in range(10):
+        observations, *_ = venv.step(np.argmax(observations["action_mask"], axis=1))
+
+    out = np.full((16, features.FEATURE_SIZE), np.nan, dtype=np.float32)
+    assert features.encode_observation(observations, out=out) is out
+    single = {name: value[3] for name, value in observations.items()}
+    assert np.array_equal(features.encode_observation(single), out[3])
+    assert np.array_equal(out[:, -3:], observations["action_mask"])
+
+    codes = logic.encode_columns(observations["board"])
+    assert np.array_equal(features.encode_codes(codes, observations["die"]), out)
+
+    with pytest.raises(ValueError, match="float32"):
+        features.encode_observation(observations, out=np.zeros((16, 3)))
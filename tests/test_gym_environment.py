@@ -0,0 +1,78 @@
+import gymnasium as gym
+import numpy as np
+import pytest
+from gymnasium.utils.env_checker import check_env
+
+from knucklebones_ml import KnucklebonesGymEnv
+from knucklebones_ml.agents import ColumnFillAgent, SequentialAgent
+
+
+def test_env_checker():
+    check_env(gym.make("Knucklebones-v0").unwrapped)
+
+
+def test_observation_layout():
+    env = KnucklebonesGymEnv(agent_side=1)
+    obs, info = env.reset(seed=0)
+    assert obs.shape == (22,)
+    assert obs.dtype == np.int16
+
+    # The opponent already moved, its die is on the second side of the board
+    board = obs[:18].reshape(2, 3, 3)
+    assert np.count_nonzero(board[0]) == 0
+    assert np.count_nonzero(board[1]) == 1
+    assert obs[18] == env.game.die
+    assert np.array_equal(obs[19:], info["action_mask"])
+    assert np.array_equal(board, env.game.board[::-1])
+
+
+@pytest.mark.parametrize("agent_side", [0, 1])
+def test_full_game(agent_side):
+    env = KnucklebonesGymEnv(
+        opponent=ColumnFillAgent(0), agent_side=agent_side, illegal_reward=-10
+    )
+    learner = SequentialAgent(1)
+    _, info = env.reset(seed=1)
+    total = 0.0
+    terminated = truncated = False
+    while not (terminated or truncated):
+        observation = {"action_mask": info["action_mask"]}
+        _, reward, terminated, truncated, info = env.step(
+            learner.select_action(observation)
+        )
+        total += reward
+        # Control always returns to the learner until the game ends
+        assert terminated or env.game.agent_selection == env.learner
+
+    scores = env.game.scores
+    won = scores[agent_side] > scores[1 - agent_side]
+    assert terminated
+    assert not truncated
+    assert (total > 0) == won
+
+
+def test_illegal_move_and_truncation():
+    env = KnucklebonesGymEnv(agent_side=0)
+    env.reset(seed=0)
+    while env.game.action_masks[0, 0]:
+        env.step(0)
+    _, reward, terminated, truncated, _ = env.step(0)
+    assert (reward, terminated, truncated) == (-10, True, False)
+
+    env = KnucklebonesGymEnv(agent_side=0, max_steps=4)
+    env.reset(seed=0)
+    env.step(0)
+    _, _, terminated, truncated, _ = env.step(1)
+    assert (terminated, truncated) == (False, True)
+
+
+@pytest.mark.parametrize("mode", ["sync", "async"])
+def test_make_vec(mode):
+    envs = gym.make_vec("Knucklebones-v0", num_envs=2, vectorization_mode=mode)
+    obs, info = envs.reset(seed=0)
+    assert obs.shape == (2, 22)
+    for _ in range(30):
+        actions = np.argmax(info["action_mask"], axis=1)
+        _, rewards, _, _, info = envs.step(actions)
+        assert rewards.shape == (2,)
+    envs.close()
@@ -0,0 +1,103 @@
+import numpy as np
+import pytest
+
+from knucklebones_ml import VectorKnucklebonesEnv, logic
+from knucklebones_ml.agents import ComboAgent, PupserAgent, SmartAgent, StupidAgent
+from knucklebones_ml.bots import PLAYER_LIST
+
+
+# Reference implementations following the legacy list-based players of bots.py,
+# where side_0 and side_1 hold the dice of each column
+def columns(board):
+    return [[int(d) for d in board[:, i] if d] for i in range(3)]
+
+
+def rel_score_after(board, die, column):
+    after = logic.apply_action(die, board.copy(), 0, column)
+    scores = logic.evaluate_board_scores(after)
+    return scores[0] - scores[1]
+
+
+def smart(die, board):
+    best_row, best_score = -1, float("-inf")
+    for i, row in enumerate(columns(board[0])):
+        if len(row) < 3 and rel_score_after(board, die, i) >= best_score:
+            best_row, best_score = i, rel_score_after(board, die, i)
+    return best_row
+
+
+def stupid(die, board):
+    best_row, best_score = -1, float("inf")
+    for i, row in enumerate(columns(board[0])):
+        if len(row) < 3 and rel_score_after(board, die, i) <= best_score:
+            best_row, best_score = i, rel_score_after(board, die, i)
+    return best_row
+
+
+def combo(die, board):
+    legal = -1
+    for idx, row in enumerate(columns(board[0])):
+        if len(row) < 3:
+            legal = idx
+            if die in row:
+                return idx
+    return legal
+
+
+def pupser(die, board):
+    side_0, side_1 = columns(board[0]), columns(board[1])
+    best_delta, best_play = float("-inf"), -1
+    for idx, erow in enumerate(side_1):
+        if len(side_0[idx]) < 3:
+            points = (
+                erow.count(die) ** 2 * die + (side_0[idx].count(die) + 1) ** 2 * die
+            )
+            for i in range(1, 7):
+                if i in side_0[idx]:
+                    empty = (
+                        9
+                        - len(side_1[0])
+                        + len(side_1[1])
+                        + len(side_1[2])
+                        + erow.count(die)
+                    )
+                    prob = 0
+                    for p in range(empty):
+                        prob += 1 / 6 * (5 / 6) ** p
+                    points -= prob * (i * (side_0[idx].count(i)) ** 2)
+            if points > best_delta:
+                best_delta, best_play = points, idx
+    return best_play
+
+
+@pytest.mark.parametrize(
+    ("agent", "reference"),
+    [
+        (SmartAgent(), smart),
+        (StupidAgent(), stupid),
+        (ComboAgent(), combo),
+        (PupserAgent(), pupser),
+    ],
+)
+def test_matches_legacy_player(agent, reference):
+    env = VectorKnucklebonesEnv(num_envs=100)
+    observations = env.reset(seed=0)
+    for _ in range(30):
+        actions = agent.select_actions(observations)
+        for i in range(100):
+            single = {name: value[i] for name, value in observations.items()}
+            expected = reference(int(single["die"]), single["board"])
+            assert actions[i] == expected
+            assert agent.select_action(single) == expected
+        observations, *_ = env.step(actions)
+
+
+def test_player_list():
+    for player in PLAYER_LIST.values():
+        agent = player["constructor"](0)
+        board = logic.get_board(3, 3)
+        obs = {"board": board, "die": 1, "action_mask": np.array([0, 1, 1])}
+        assert agent.select_action(obs) in {1, 2}
+
+    sequential = PLAYER_LIST["sequential"]["constructor"](0)
+    assert sequential.column_order.tolist() == [0, 1, 2]
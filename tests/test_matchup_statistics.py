@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+
+from knucklebones_ml import agents
+from knucklebones_ml.simulation import (
+    Histogram,
+    MatchupStatistics,
+    RunningMoments,
+    collect_matchup_statistics,
+    simulate_matchup,
+)
+
+
+def test_running_moments_merge_batches():
+    values = np.random.default_rng(0).normal(5, 3, size=1000)
+    moments, other = RunningMoments(), RunningMoments()
+    for batch in np.array_split(values[:600], 7):
+        moments.update(batch)
+    other.update(values[600:])
+    moments.merge(other)
+    moments.merge(RunningMoments())
+
+    assert moments.count == 1000
+    assert moments.mean == pytest.approx(values.mean())
+    assert moments.variance == pytest.approx(values.var(ddof=1))
+    assert (moments.minimum, moments.maximum) == (values.min(), values.max())
+    assert np.isnan(RunningMoments().std)
+
+
+def test_histogram_quantiles():
+    values = np.random.default_rng(1).integers(-20, 30, size=501)
+    histogram = Histogram(-50, 50)
+    histogram.update(values[:100])
+    part = Histogram(-50, 50)
+    part.update(values[100:])
+    histogram.merge(part)
+
+    quantiles = np.linspace(0, 1, 21)
+    assert np.array_equal(histogram.quantile(quantiles), np.quantile(values, quantiles))
+    assert np.isnan(Histogram(0, 3).quantile(0.5))
+    with pytest.raises(ValueError, match="same range"):
+        histogram.merge(Histogram(0, 3))
+
+    clipped = Histogram(0, 3)
+    clipped.update([-5, 1, 9])
+    assert clipped.counts.tolist() == [1, 1, 0, 1]
+
+
+def test_statistics_match_history():
+    kwargs = {"num_games": 40, "seed": 2, "games_per_shard": 15}
+    factories = (agents.RandomAgent, agents.SmartAgent)
+    history = simulate_matchup(*factories, num_workers=1, **kwargs)
+    statistics = collect_matchup_statistics(*factories, num_workers=1, **kwargs)
+    pooled = collect_matchup_statistics(*factories, num_workers=2, **kwargs)
+
+    df = history.to_dataframe()
+    df["margin"] = df.a1_score.astype(int) - df.a2_score
+    report = statistics.report()
+    expected = df[["num_turns", "a1_score", "a2_score", "margin"]].describe()
+    np.testing.assert_allclose(report.to_dataframe(), expected)
+    np.testing.assert_allclose(pooled.report().to_dataframe(), expected)
+    assert np.array_equal(pooled.action_counts, statistics.action_counts)
+
+    assert report.num_games == 40
+    assert report.win_rate == (df.margin > 0).mean()
+    assert report.win_rate + report.draw_rate + report.loss_rate == pytest.approx(1)
+    assert report.distributions["a1_score"].sum() == 40
+    assert statistics.action_counts.sum() == history.num_turns.sum()
+    frequencies = report.action_frequencies
+    assert np.allclose(np.nansum(frequencies, axis=2), 1)
+
+
+def test_empty_report():
+    report = MatchupStatistics().report()
+    assert report.num_games == 0
+    assert report.win_rate == 0
+    assert np.isnan(report.summary["margin"]["mean"])
+    assert np.isnan(report.action_frequencies).all()
@@ -0,0 +1,45 @@
+import numpy as np
+
+from knucklebones_ml import logic, packing
+
+
+def test_encode_decode(sample_board_empty, sample_board_full, sample_board_mixed):
+    assert packing.encode(sample_board_empty) == 0
+    for board in (sample_board_full, sample_board_mixed):
+        code = packing.encode(board)
+        assert code.dtype == np.uint64
+        assert code < 2**54
+        assert np.array_equal(packing.decode(code), board)
+
+    # Top cell of the middle column on side 1
+    board = logic.get_board(3, 3)
+    board[1, 0, 1] = 5
+    assert packing.encode(board) == 5 << (9 * 4 + 6)
+
+
+def test_encode_decode_batch(random_boards):
+    boards = random_boards(300, 20)
+    codes = packing.encode(boards)
+    assert codes.shape == (300,)
+    assert np.array_equal(packing.decode(codes), boards)
+    assert np.array_equal(
+        packing.decode(codes.reshape(3, 100)), boards.reshape(3, 100, 2, 3, 3)
+    )
+    assert np.unique(codes).size == np.unique(boards.reshape(300, -1), axis=0).shape[0]
+
+
+def test_packed_rules(sample_board_full, random_boards):
+    boards = random_boards(300, 20)
+    boards[0] = sample_board_full
+    codes = packing.encode(boards)
+
+    assert np.array_equal(
+        packing.get_valid_actions(codes), logic.get_valid_actions_batch(boards)
+    )
+    assert np.array_equal(
+        packing.board_is_full(codes), logic.board_is_full_batch(boards)
+    )
+    assert np.array_equal(packing.column_codes(codes), logic.encode_columns(boards))
+    assert np.array_equal(
+        packing.decode(packing.flip_sides(codes)), np.flip(boards, axis=1)
+    )
@@ -2,9 +2,11 @@ from typing import Literal, cast
 from unittest.mock import patch
 
 import numpy as np
+import pytest
 from pettingzoo import test
 
 import knucklebones_ml
+from knucklebones_ml import logic
 
 
 def test_pettingzoo_api():
@@ -14,7 +16,7 @@ def test_pettingzoo_api():
 
 def test_api_step(sample_board_empty):
     env = knucklebones_ml.env()
-    env.reset(69)  # Seed chosen to roll a 2 on first two turns
+    env.reset(123)  # Seed chosen to roll a 2 on first two turns
     die_value = 2
 
     agent_iter = iter(env.agent_iter())
@@ -50,7 +52,7 @@ def test_api_step(sample_board_empty):
 
 def test_api_render():
     env = knucklebones_ml.env("human")
-    env.reset(69)  # Seed chosen to roll a 2 on first turn
+    env.reset(123)  # Seed chosen to roll a 2 on first turn
     output = env.render()
     expected_output = """Current Agent: player_0
 Current Die: 2
@@ -92,3 +94,173 @@ def test_api_truncation():
     env.step(0)
     truncation = env.last()[3]
     assert truncation  # truncated flag should be True after 5 steps
+
+
+def reference_rewards(previous_board, board, side):
+    """Reward calculation of the environment from full board evaluations."""
+    scores = logic.evaluate_board_scores(board)
+    previous_scores = logic.evaluate_board_scores(previous_board)
+    change = (
+        (scores[side] - scores[1 - side])
+        - (previous_scores[side] - previous_scores[1 - side])
+    ) / 60
+    abs_score = np.tanh(scores[side] / 60)
+    played_reward = 0.1 * (0.8 * change + 0.2 * abs_score)
+    idle_reward = -change * 0.1
+    if logic.board_is_full(board):
+        if scores[side] > scores[1 - side]:
+            played_reward += 10 * abs_score
+            idle_reward -= 10 * abs_score
+        elif scores[side] < scores[1 - side]:
+            played_reward -= 10 * abs_score
+            idle_reward += 10 * abs_score
+    return played_reward, idle_reward
+
+
+def test_incremental_state():
+    env = knucklebones_ml.env()
+    rng = np.random.default_rng(3)
+    for seed in range(5):
+        env.reset(seed)
+        for agent in env.agent_iter():
+            obs, _, terminated, truncated, _ = env.last()
+            if terminated or truncated:
+                env.step(None)
+                continue
+
+            state = env.unwrapped
+            assert np.array_equal(
+                obs["action_mask"], logic.get_valid_actions(obs["board"])[0]
+            )
+
+            side = env.possible_agents.index(agent)
+            previous_board = state.board.copy()
+            env.step(to_action(rng.choice(np.flatnonzero(obs["action_mask"]))))
+
+            assert np.array_equal(state.column_codes, logic.encode_columns(state.board))
+            assert np.array_equal(
+                state.column_scores, logic.evaluate_column_scores(state.board)
+            )
+            assert np.array_equal(
+                state.scores, logic.evaluate_board_scores(state.board)
+            )
+            assert np.array_equal(
+                state.action_masks, logic.get_valid_actions(state.board)
+            )
+
+            played_reward, idle_reward = reference_rewards(
+                previous_board, state.board, side
+            )
+            assert state.rewards[agent] == played_reward
+            assert state.rewards[env.possible_agents[1 - side]] == idle_reward
+
+
+def test_raw_env_pettingzoo_api():
+    env = knucklebones_ml.raw_env()
+    test.api_test(env, verbose_progress=True)
+
+
+def test_raw_env_illegal_move():
+    wrapped, raw = knucklebones_ml.env(), knucklebones_ml.raw_env()
+    for game_env in (wrapped, raw):
+        game_env.reset(5)
+        for action in (0, 1, 0, 2, 0, 1):
+            game_env.step(to_action(action))
+        # Column 0 of player_0 is full after three placements
+        assert game_env.last()[0]["action_mask"][0] == 0
+        game_env.step(0)
+
+    assert raw.rewards == wrapped.rewards
+    assert raw._cumulative_rewards == wrapped._cumulative_rewards  # noqa: SLF001
+    assert raw.terminations == wrapped.terminations
+    assert raw.truncations == wrapped.truncations
+    assert raw.agent_selection == wrapped.agent_selection
+    assert raw.last()[1] == -10
+
+    for game_env in (wrapped, raw):
+        for _ in game_env.agent_iter():
+            assert game_env.last()[2]
+            game_env.step(None)
+        assert not game_env.agents
+
+
+def test_raw_env_illegal_move_raises():
+    env = knucklebones_ml.raw_env(illegal_reward=None)
+    env.reset(5)
+    for action in (0, 1, 0, 2, 0, 1):
+        env.step(to_action(action))
+    with pytest.raises(ValueError, match=r"Column 0 is full."):
+        env.step(0)
+
+
+def containers(env):
+    return [
+        env.options,
+        env.agents,
+        env.terminations,
+        env.truncations,
+        env.rewards,
+        env._cumulative_rewards,  # noqa: SLF001
+        env.infos,
+        env.infos["player_0"],
+        env.infos["player_1"],
+    ]
+
+
+def test_raw_env_reuses_state():
+    env = knucklebones_ml.raw_env()
+    env.reset(0, options={"max_steps": 3})
+    board = env.board
+    before = containers(env)
+    for _ in range(3):
+        env.step(0)
+    assert env.last()[3]
+    env.step(None)  # Dead steps remove the agents from the containers
+    env.step(None)
+    assert not env.agents
+
+    env.reset(0)
+    assert env.board is board
+    assert all(new is old for new, old in zip(containers(env), before, strict=True))
+    assert env.options["max_steps"] is None
+    assert env.agents == env.possible_agents
+    assert list(env.rewards) == env.possible_agents
+    assert np.all(env.board == 0)
+    assert np.all(env.action_masks == 1)
+    assert np.all(env.scores == 0)
+    assert env.agent_selection == "player_0"
+    assert not env.truncations["player_0"]
+
+
+def test_view_observations():
+    copy_env = knucklebones_ml.raw_env()
+    view_env = knucklebones_ml.raw_env(observation_mode="view")
+    copy_env.reset(7)
+    view_env.reset(7)
+    observations = {agent: view_env.observe(agent) for agent in view_env.agents}
+
+    rng = np.random.default_rng(7)
+    for agent in view_env.agent_iter():
+        obs, _, terminated, truncated, _ = view_env.last()
+        assert obs is observations[agent]
+        for observed in view_env.agents:
+            expected = copy_env.observe(observed)
+            observation = view_env.observe(observed)
+            assert observation["die"] == expected["die"]
+            assert np.array_equal(observation["board"], expected["board"])
+            assert np.array_equal(observation["action_mask"], expected["action_mask"])
+
+        if terminated or truncated:
+            action = None
+        else:
+            action = to_action(rng.choice(np.flatnonzero(obs["action_mask"])))
+        view_env.step(action)
+        copy_env.step(action)
+
+    with pytest.raises(ValueError, match="read-only"):
+        observations["player_1"]["board"][0, 0, 0] = 1
+
+
+def test_unknown_observation_mode():
+    with pytest.raises(ValueError, match=r"Unknown observation mode 'shared'\."):
+        knucklebones_ml.env(observation_mode="shared")
@@ -0,0 +1,73 @@
+import json
+
+import numpy as np
+import pytest
+
+from knucklebones_ml import EnvProfiler, env, raw_env
+
+STEP_PHASES = {"rules", "rewards", "rng", "bookkeeping"}
+
+
+def play_game(game_env, seed=0):
+    game_env.reset(seed=seed)
+    for _ in game_env.agent_iter():
+        obs, _, terminated, truncated, _ = game_env.last()
+        action = None if terminated or truncated else np.argmax(obs["action_mask"])
+        game_env.step(action)
+
+
+def test_profiler_is_disabled_by_default():
+    assert raw_env().profiler is None
+    assert env().unwrapped.profiler is None
+
+
+def test_profiler_collects_phases_and_counters():
+    profiler = EnvProfiler()
+    game_env = raw_env(profiler=profiler)
+    for seed in range(3):
+        play_game(game_env, seed)
+
+    snapshot = profiler.snapshot()
+    counters = snapshot["counters"]
+    assert counters["resets"] == 3
+    assert counters["games_finished"] == 3
+    assert counters["dead_steps"] == 3 * 2
+    assert counters["steps"] >= 3 * 17
+    assert counters["observations"] == counters["steps"] + counters["dead_steps"]
+    assert set(snapshot["timers_ns"]) == STEP_PHASES | {"reset", "observe"}
+    assert all(t > 0 for t in snapshot["timers_ns"].values())
+    assert snapshot["ns_per_step"]["rules"] == (
+        snapshot["timers_ns"]["rules"] / counters["steps"]
+    )
+
+    profiler.reset()
+    assert profiler.snapshot() == {"timers_ns": {}, "counters": {}, "ns_per_step": {}}
+
+
+@pytest.mark.parametrize("make_env", [env, raw_env])
+def test_profiler_counts_illegal_moves(make_env):
+    profiler = EnvProfiler()
+    game_env = make_env(profiler=profiler)
+    game_env.reset(seed=0)
+    for action in (0, 1, 0, 2, 0, 1):
+        game_env.step(action)
+    assert profiler.counters["illegal_moves"] == 0
+
+    # Column 0 of player_0 is full
+    game_env.step(0)
+    assert profiler.counters["illegal_moves"] == 1
+    assert profiler.counters["games_finished"] == 1
+    assert all(game_env.terminations.values())
+    assert sorted(game_env.rewards.values()) == [-10, 0]
+
+
+def test_profiler_dump(tmp_path):
+    dump_path = tmp_path / "profile.jsonl"
+    profiler = EnvProfiler(dump_path=dump_path, dump_interval=0)
+    play_game(raw_env(profiler=profiler))
+
+    lines = dump_path.read_text().splitlines()
+    assert len(lines) == profiler.counters["steps"] + profiler.counters["dead_steps"]
+    records = [json.loads(line) for line in lines]
+    assert records[-1]["counters"]["steps"] == profiler.counters["steps"]
+    assert records[0]["time"] <= records[-1]["time"]
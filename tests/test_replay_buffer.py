@@ -0,0 +1,202 @@
+import numpy as np
+import pytest
+
+from knucklebones_ml import VectorKnucklebonesEnv, agents, logic, packing, raw_env
+from knucklebones_ml.data import ReplayBuffer
+from knucklebones_ml.data._replay import _SumTree
+
+
+def fill_from_game(buffer, seed=0):
+    game_env = raw_env()
+    game_env.reset(seed=seed)
+    player = agents.RandomAgent(seed)
+    num_actions = 0
+    for agent in game_env.agent_iter():
+        obs, reward, terminated, truncated, _ = game_env.last()
+        action = None if terminated or truncated else player.select_action(obs)
+        buffer.add_turn(agent, obs, reward, terminated, truncated, action)
+        game_env.step(action)
+        num_actions += action is not None
+    return num_actions
+
+
+def fill_from_vector_env(buffer, num_envs=8, num_steps=5):
+    """Play random moves, storing num_envs * (num_steps - 2) transitions."""
+    venv = VectorKnucklebonesEnv(num_envs)
+    obs = venv.reset(seed=0)
+    buffer.discard_pending()
+    rng = np.random.default_rng(0)
+    for _ in range(num_steps):
+        actions = np.argmax(obs["action_mask"] * rng.random((num_envs, 3)), axis=1)
+        players = venv.turns.copy()
+        next_obs, rewards, terminations, _, infos = venv.step(actions)
+        buffer.add_vector_step(obs, players, actions, rewards, terminations, infos)
+        obs = next_obs
+
+
+def sorted_rows(buffer):
+    """Sort the transitions, ignoring the die of final positions."""
+    columns = dict(buffer.columns)
+    columns["next_die"] = np.where(columns["done"], 0, columns["next_die"])
+    columns["reward"] = np.round(columns["reward"], 5)
+    return sorted(zip(*columns.values(), strict=True))
+
+
+def test_add_turn_stores_one_transition_per_action():
+    buffer = ReplayBuffer(1000)
+    num_actions = fill_from_game(buffer)
+    assert len(buffer) == num_actions
+
+    columns = buffer.columns
+    boards = packing.decode(columns["board"][: len(buffer)])
+    next_boards = packing.decode(columns["next_board"][: len(buffer)])
+    assert not boards[0].any()
+    assert np.count_nonzero(next_boards[0]) == 2  # Both players placed a die
+    assert columns["done"][: len(buffer)].sum() == 2  # The last move of each player
+    assert np.array_equal(
+        packing.get_valid_actions(columns["board"][: len(buffer)])[:, 0],
+        np.unpackbits(columns["action_mask"][: len(buffer), None], axis=1)[:, :4:-1],
+    )
+
+
+def test_add_matches_add_turn():
+    game_env = raw_env()
+    game_env.reset(seed=1)
+    obs = game_env.observe("player_0")
+    game_env.step(0)
+    game_env.step(1)
+    next_obs, reward, *_ = game_env.last()
+
+    buffer = ReplayBuffer(4)
+    buffer.add(obs, 0, reward, next_obs, done=False)
+    sample = buffer.sample(1)
+    assert np.array_equal(sample["board"][0], obs["board"])
+    assert np.array_equal(sample["next_board"][0], next_obs["board"])
+    assert sample["die"][0] == obs["die"]
+    assert np.array_equal(sample["next_action_mask"][0], next_obs["action_mask"])
+    assert sample["reward"][0] == np.float32(reward)
+    assert not sample["done"][0]
+
+
+def test_add_vector_step_matches_add_turn():
+    game_env = raw_env()
+    game_env.reset(seed=2)
+    venv = VectorKnucklebonesEnv(1)
+    venv.reset()
+    venv.dice[:] = game_env.die
+    obs = venv.observe()
+    turn_buffer, vector_buffer = ReplayBuffer(300), ReplayBuffer(300)
+    player = agents.RandomAgent(2)
+    num_games = 0
+
+    # Both environments play the same games, rolling the dice of the single one
+    for agent in game_env.agent_iter(max_iter=240):
+        turn_obs, reward, terminated, truncated, _ = game_env.last()
+        action = None if terminated or truncated else player.select_action(turn_obs)
+        turn_buffer.add_turn(agent, turn_obs, reward, terminated, truncated, action)
+        game_env.step(action)
+        if action is None:
+            if game_env.agents:
+                continue
+            num_games += 1
+            game_env.reset()
+            venv.dice[:] = game_env.die
+            obs = venv.observe()
+            continue
+
+        assert np.array_equal(obs["board"][0], turn_obs["board"])
+        players = venv.turns.copy()
+        actions = np.array([action])
+        _, rewards, terminations, _, infos = venv.step(actions)
+        vector_buffer.add_vector_step(
+            obs, players, actions, rewards, terminations, infos
+        )
+        venv.dice[:] = game_env.die
+        obs = venv.observe()
+
+    assert len(vector_buffer) == len(turn_buffer) > 200
+    assert vector_buffer.columns["done"].sum() == 2 * num_games
+    # Both players' last transitions are stored in a different order at game end
+    assert sorted_rows(vector_buffer) == sorted_rows(turn_buffer)
+
+
+def test_ring_buffer_keeps_the_latest_transitions():
+    buffer = ReplayBuffer(10)
+    fill_from_vector_env(buffer, num_envs=8, num_steps=5)
+    assert len(buffer) == 10
+    assert buffer.position == 24 % 10
+
+    reference = ReplayBuffer(24)
+    fill_from_vector_env(reference, num_envs=8, num_steps=5)
+    order = (np.arange(14, 24) - 14 + buffer.position) % 10
+    for name, column in buffer.columns.items():
+        assert np.array_equal(column[order], reference.columns[name][14:24])
+
+    large = ReplayBuffer(5)
+    fill_from_vector_env(large, num_envs=8, num_steps=3)
+    assert len(large) == 5
+
+
+def test_uniform_sample():
+    buffer = ReplayBuffer(100, seed=0)
+    fill_from_vector_env(buffer)
+    sample = buffer.sample(32)
+    assert sample["board"].shape == (32, 2, 3, 3)
+    assert sample["action_mask"].shape == (32, 3)
+    assert np.array_equal(
+        sample["action_mask"], logic.get_valid_actions_batch(sample["board"])[:, 0]
+    )
+    assert np.all(sample["weights"] == 1)
+    assert np.all(sample["indices"] < len(buffer))
+
+    with pytest.raises(ValueError, match="empty"):
+        ReplayBuffer(10).sample(1)
+
+
+def test_sum_tree_matches_prefix_sums():
+    rng = np.random.default_rng(0)
+    values = rng.random(13)
+    tree = _SumTree(13)
+    tree.rebuild(values)
+    assert np.isclose(tree.total, values.sum())
+
+    values[[2, 7]] = [5.0, 0.0]
+    tree.update(np.array([2, 7]), values[[2, 7]])
+    targets = rng.random(100) * values.sum()
+    expected = np.searchsorted(np.cumsum(values), targets, side="right")
+    assert np.array_equal(tree.find(targets), expected)
+
+
+def test_prioritized_sample():
+    buffer = ReplayBuffer(64, prioritized=True, alpha=1.0, seed=0)
+    fill_from_vector_env(buffer)
+    buffer.update_priorities(np.arange(len(buffer)), np.ones(len(buffer)))
+    buffer.update_priorities(np.array([7]), np.array([100.0]))
+
+    sample = buffer.sample(256)
+    assert np.mean(sample["indices"] == 7) == pytest.approx(100 / 123, abs=0.01)
+    assert sample["weights"].max() == 1
+    assert np.all(sample["weights"][sample["indices"] == 7] < 1)
+    assert buffer.max_priority == pytest.approx(100, rel=1e-3)
+
+
+def test_memory_mapped_buffer_survives_reopening(tmp_path):
+    with ReplayBuffer(50, tmp_path / "replay", prioritized=True) as buffer:
+        fill_from_vector_env(buffer)
+        buffer.update_priorities(np.array([3]), np.array([9.0]))
+        columns = {name: column.copy() for name, column in buffer.columns.items()}
+
+    reopened = ReplayBuffer(50, tmp_path / "replay", prioritized=True)
+    assert len(reopened) == 24
+    assert reopened.position == 24
+    for name, column in reopened.columns.items():
+        assert isinstance(column, np.memmap)
+        assert np.array_equal(column, columns[name])
+    sample = reopened.sample(1000)
+    assert np.mean(sample["indices"] == 3) > 0.05
+
+    fill_from_vector_env(reopened, num_steps=6)
+    assert len(reopened) == 50
+
+    with pytest.raises(ValueError, match="capacity"):
+        ReplayBuffer(60, tmp_path / "replay")
@@ -0,0 +1,151 @@
+import numpy as np
+import pytest
+
+from knucklebones_ml import VectorKnucklebonesEnv, logic
+from knucklebones_ml.agents import ExpectimaxAgent, MCTSAgent, RandomAgent
+from knucklebones_ml.agents._search_agents import TranspositionTable
+
+
+def test_transposition_table_eviction():
+    table = TranspositionTable(capacity=2)
+    table.put(1, 1.0)
+    table.put(2, 2.0)
+    assert table.get(1) == 1.0  # 2 is now the least recently used entry
+    table.put(3, 3.0)
+
+    assert len(table) == 2
+    assert table.get(2) is None
+    assert table.get(3) == 3.0
+    assert (table.hits, table.misses) == (2, 1)
+
+
+def test_expectimax_depth_one_is_greedy(sample_board_mixed):
+    agent = ExpectimaxAgent(depth=1)
+    obs = {
+        "board": sample_board_mixed,
+        "die": 4,
+        "action_mask": logic.get_valid_actions(sample_board_mixed)[0],
+    }
+    values = agent.action_values(obs)
+    assert values[0] == 53 + 4 - 32
+    assert values[1:] == [float("-inf")] * 2
+    assert agent.select_action(obs) == 0
+
+
+def test_expectimax_values_match_brute_force(sample_board_mixed):
+    board = sample_board_mixed.copy()
+    board[0, :, 0] = [0, 0, 4]
+    obs = {"board": board, "die": 6, "action_mask": np.array([1, 0, 0])}
+
+    def margin(b):  # noqa: ANN202
+        scores = logic.evaluate_board_scores(b)
+        return scores[0] - scores[1]
+
+    # My die goes to column 0, then the opponent picks its best reply for each die
+    after = logic.apply_action(6, board.copy(), 0, 0)
+    expected = 0.0
+    for die in range(1, 7):
+        expected += min(
+            margin(logic.apply_action(die, after.copy(), 1, column))
+            for column in np.flatnonzero(logic.get_valid_actions(after)[1])
+        )
+    expected /= 6
+
+    agent = ExpectimaxAgent(depth=2)
+    assert agent.action_values(obs)[0] == pytest.approx(expected)
+    assert len(agent.table) == 1
+
+
+def test_expectimax_table_is_bounded():
+    board = logic.get_board(3, 3)
+    obs = {"board": board, "die": 3, "action_mask": np.array([1, 1, 1])}
+
+    agent = ExpectimaxAgent(depth=3, table_size=10)
+    agent.select_action(obs)
+    assert len(agent.table) == 10
+
+    # With room for the whole tree, searching again only hits the cache
+    agent = ExpectimaxAgent(depth=3)
+    action = agent.select_action(obs)
+    misses = agent.table.misses
+    assert agent.select_action(obs) == action
+    assert agent.table.misses == misses
+
+
+def test_expectimax_shares_equivalent_positions():
+    board = logic.get_board(3, 3)
+    obs = {"board": board, "die": 3, "action_mask": np.array([1, 1, 1])}
+
+    # Placing the die in any of the empty columns leads to equivalent positions
+    agent = ExpectimaxAgent(depth=2)
+    values = agent.action_values(obs)
+    assert values[0] == values[1] == values[2]
+    assert len(agent.table) == 1
+    assert (agent.table.hits, agent.table.misses) == (2, 1)
+
+
+def test_expectimax_batch_falls_back_to_single_games():
+    env = VectorKnucklebonesEnv(num_envs=20)
+    observations = env.reset(seed=0)
+    for _ in range(4):
+        observations, *_ = env.step(np.argmax(observations["action_mask"], axis=1))
+
+    agent = ExpectimaxAgent(depth=2)
+    actions = agent.select_actions(observations)
+    assert actions.shape == (20,)
+    for i in range(20):
+        single = {name: value[i] for name, value in observations.items()}
+        assert actions[i] == agent.select_action(single)
+
+
+def test_expectimax_invalid_depth():
+    with pytest.raises(ValueError, match="depth must be at least 1"):
+        ExpectimaxAgent(depth=0)
+
+
+def test_mcts_respects_the_action_mask(sample_board_mixed):
+    obs = {
+        "board": sample_board_mixed,
+        "die": 4,
+        "action_mask": logic.get_valid_actions(sample_board_mixed)[0],
+    }
+    agent = MCTSAgent(seed=0, simulations=100, batch_size=16)
+    visits = agent.action_visits(obs)
+    assert visits.tolist() == [100, 0, 0]
+    assert agent.select_action(obs) == 0
+
+
+def test_mcts_uses_the_rollout_policy():
+    class CountingAgent(RandomAgent):
+        calls = 0
+
+        def select_actions(self, observations):  # noqa: ANN202
+            CountingAgent.calls += len(observations["die"])
+            return super().select_actions(observations)
+
+    board = logic.get_board(3, 3)
+    obs = {"board": board, "die": 3, "action_mask": np.array([1, 1, 1])}
+    agent = MCTSAgent(seed=0, rollout_policy=CountingAgent(0), simulations=50)
+    visits = agent.action_visits(obs)
+    assert visits.sum() == 50
+    assert CountingAgent.calls >= 50 * 8
+
+    # The search is reproducible with a seed
+    again = MCTSAgent(seed=0, rollout_policy=CountingAgent(0), simulations=50)
+    assert np.array_equal(again.action_visits(obs), visits)
+
+
+def test_mcts_finds_a_winning_move():
+    # Filling column 0 ends the game in a 73 to 65 win, column 1 leaves the
+    # opponent ahead with moves to play
+    board = logic.get_board(3, 3)
+    board[0] = [[0, 0, 2], [6, 0, 2], [6, 1, 2]]
+    board[1] = [[0, 0, 5], [0, 5, 5], [0, 5, 5]]
+    obs = {"board": board, "die": 6, "action_mask": np.array([1, 1, 0])}
+    agent = MCTSAgent(seed=0, simulations=200)
+    assert agent.select_action(obs) == 0
+
+
+def test_mcts_invalid_budget():
+    with pytest.raises(ValueError, match="must be at least 1"):
+        MCTSAgent(simulations=0)
@@ -0,0 +1,167 @@
+from functools import partial
+
+import numpy as np
+import pytest
+
+from knucklebones_ml import agents, logic, packing
+from knucklebones_ml.simulation import (
+    HistoryReader,
+    HistoryRecorder,
+    SimulationHistory,
+    simulate_matchup,
+)
+
+
+def test_simulate_matchup():
+    history = simulate_matchup(
+        agents.RandomAgent, agents.AggressiveAgent, num_games=30, seed=1, num_workers=1
+    )
+    assert len(history) == 30
+    assert np.array_equal(history.game_id, np.arange(30))
+    assert np.all(history.num_turns >= 17)  # At least 9 dice on one side
+    assert not history.truncated.any()
+
+    df = history.to_dataframe()
+    assert list(df.columns) == [
+        "game_id",
+        "num_turns",
+        "a1_score",
+        "a2_score",
+        "truncated",
+    ]
+
+
+def test_simulate_matchup_is_deterministic():
+    factory = partial(agents.RandomAgent)
+    kwargs = {"num_games": 25, "seed": 3, "games_per_shard": 10}
+    single = simulate_matchup(factory, factory, num_workers=1, **kwargs)
+    pooled = simulate_matchup(factory, factory, num_workers=2, **kwargs)
+
+    assert np.array_equal(single.game_id, pooled.game_id)
+    assert np.array_equal(single.a1_score, pooled.a1_score)
+    assert np.array_equal(single.a2_score, pooled.a2_score)
+    assert np.array_equal(single.num_turns, pooled.num_turns)
+
+
+def test_simulate_matchup_truncation():
+    history = simulate_matchup(
+        agents.RandomAgent, agents.RandomAgent, num_games=5, max_steps=4, num_workers=1
+    )
+    assert history.truncated.all()
+    assert np.all(history.num_turns == 4)
+
+
+def test_simulate_matchup_invalid_num_games():
+    with pytest.raises(ValueError, match="num_games must be at least 1"):
+        simulate_matchup(agents.RandomAgent, agents.RandomAgent, num_games=0)
+
+
+def test_concatenate_histories():
+    assert len(SimulationHistory.concatenate([])) == 0
+    history = simulate_matchup(
+        agents.RandomAgent, agents.RandomAgent, num_games=4, num_workers=1
+    )
+    merged = SimulationHistory.concatenate([history, history])
+    assert np.array_equal(merged.a1_score, np.tile(history.a1_score, 2))
+
+
+def test_history_recorder(tmp_path, sample_board_mixed):
+    with HistoryRecorder(tmp_path, chunk_size=4) as recorder:
+        for turn in range(10):
+            recorder.record(7, turn, sample_board_mixed, 3, turn % 3, [53, 32])
+        recorder.record(7, 10, sample_board_mixed, 3, None, [53, 32])
+    assert recorder.num_chunks == 3
+
+    reader = HistoryReader(tmp_path)
+    assert len(reader) == 11
+    chunks = list(reader.iter_chunks(["turn_number"]))
+    assert [chunk["turn_number"].size for chunk in chunks] == [4, 4, 3]
+    assert isinstance(chunks[0]["turn_number"], np.memmap)
+
+    columns = reader.read()
+    assert np.array_equal(columns["turn_number"], np.arange(11))
+    assert np.array_equal(columns["action"], [0, 1, 2, 0, 1, 2, 0, 1, 2, 0, -1])
+    assert np.all(packing.decode(columns["board"]) == sample_board_mixed)
+    assert reader.to_dataframe(["a1_score", "a2_score"]).shape == (11, 2)
+
+
+def test_simulate_matchup_history(tmp_path):
+    history = simulate_matchup(
+        agents.RandomAgent,
+        agents.RandomAgent,
+        num_games=12,
+        seed=0,
+        num_workers=2,
+        games_per_shard=5,
+        history_path=tmp_path,
+    )
+    turns = HistoryReader(tmp_path).to_dataframe()
+
+    assert np.array_equal(turns.game_id.unique(), history.game_id)
+    last_turns = turns.groupby("game_id").last()
+    assert np.all(last_turns.action == -1)
+    assert np.array_equal(last_turns.turn_number, history.num_turns)
+    assert np.array_equal(last_turns.a1_score, history.a1_score)
+    assert np.array_equal(last_turns.a2_score, history.a2_score)
+
+    boards = packing.decode(turns.board.to_numpy())
+    assert np.array_equal(
+        logic.evaluate_board_scores_batch(boards),
+        turns[["a1_score", "a2_score"]].to_numpy(),
+    )
+
+
+class FailingAgent(agents.RandomAgent):
+    """A random agent raising on its 10th move."""
+
+    FAILING_MOVE = 10
+
+    def __init__(self, seed=None) -> None:
+        super().__init__(seed)
+        self.moves = 0
+
+    def select_action(self, observation):
+        """Select a random action, or raise on the 10th move."""
+        self.moves += 1
+        if self.moves == self.FAILING_MOVE:
+            msg = "Agent failure"
+            raise RuntimeError(msg)
+        return super().select_action(observation)
+
+
+def test_simulate_matchup_history_survives_failures(tmp_path):
+    with pytest.raises(RuntimeError, match="Agent failure"):
+        simulate_matchup(
+            FailingAgent,
+            agents.RandomAgent,
+            seed=0,
+            num_workers=1,
+            history_path=tmp_path,
+        )
+
+    # The turns before the failure are flushed, up to the move that raised
+    turns = HistoryReader(tmp_path).to_dataframe()
+    games = [game for _, game in turns.groupby("game_id")]
+    for game in games:
+        assert np.array_equal(game.turn_number, np.arange(len(game)))
+    assert all(game.action.iloc[-1] == -1 for game in games[:-1])
+    assert np.all(games[-1].action >= 0)
+    failing_moves = (turns.turn_number % 2 == 0) & (turns.action >= 0)
+    assert failing_moves.sum() == FailingAgent.FAILING_MOVE - 1
+
+
+def test_simulate_matchup_history_replaces_earlier_runs(tmp_path):
+    kwargs = {"seed": 1, "num_workers": 1, "history_path": tmp_path}
+    factories = (agents.RandomAgent, agents.RandomAgent)
+    simulate_matchup(*factories, num_games=6, games_per_shard=2, **kwargs)
+    with HistoryRecorder(tmp_path, chunk_size=4, prefix="other") as recorder:
+        for turn in range(10):
+            recorder.record(99, turn, np.zeros((2, 3, 3)), 1, 0, [0, 0])
+
+    history = simulate_matchup(*factories, num_games=3, games_per_shard=2, **kwargs)
+    with HistoryRecorder(tmp_path, chunk_size=100, prefix="other") as recorder:
+        recorder.record(99, 0, np.zeros((2, 3, 3)), 1, 0, [0, 0])
+
+    turns = HistoryReader(tmp_path).to_dataframe()
+    assert np.array_equal(np.unique(turns.game_id), [*history.game_id, 99])
+    assert np.count_nonzero(turns.game_id == 99) == 1
@@ -0,0 +1,56 @@
+import numpy as np
+
+from knucklebones_ml import logic, symmetry
+
+
+def test_canonicalize(sample_board_mixed):
+    canonical, permutation = symmetry.canonicalize(sample_board_mixed)
+    assert canonical.shape == (2, 3, 3)
+    assert sorted(permutation) == [0, 1, 2]
+
+    # Every column pair keeps its dice, sorted with the empty cells on top
+    for j, column in enumerate(permutation):
+        for side in range(2):
+            dice = np.sort(sample_board_mixed[side, :, column])
+            dice = np.concatenate([dice[dice == 0], dice[dice != 0]])
+            assert np.array_equal(canonical[side, :, j], dice)
+
+    again, identity = symmetry.canonicalize(canonical)
+    assert np.array_equal(again, canonical)
+    assert np.array_equal(identity, [0, 1, 2])
+
+
+def test_equivalent_boards_share_a_representative(random_boards):
+    rng = np.random.default_rng(0)
+    boards = random_boards(300, 18)
+    canonical, _ = symmetry.canonicalize_batch(boards)
+
+    shuffled = boards[:, :, :, rng.permutation(3)]
+    shuffled = rng.permuted(shuffled, axis=2)  # Reorders the dice within columns
+    shuffled_canonical, _ = symmetry.canonicalize_batch(shuffled)
+
+    assert np.array_equal(canonical, shuffled_canonical)
+    assert np.array_equal(
+        logic.evaluate_board_scores_batch(canonical),
+        logic.evaluate_board_scores_batch(boards),
+    )
+
+
+def test_actions_map_back(random_boards):
+    boards = random_boards(300, 12, seed=1)
+    canonical, permutations = symmetry.canonicalize_batch(boards)
+    assert np.array_equal(
+        logic.get_valid_actions_batch(canonical),
+        np.take_along_axis(
+            logic.get_valid_actions_batch(boards), permutations[:, None, :], axis=-1
+        ),
+    )
+
+    # Playing on the canonical board and mapping the action back gives
+    # equivalent positions
+    for i in np.flatnonzero(logic.get_valid_actions_batch(canonical)[:, 0, 0]):
+        after = logic.apply_action(5, canonical[i].copy(), 0, 0)
+        original = logic.apply_action(5, boards[i].copy(), 0, permutations[i, 0])
+        assert np.array_equal(
+            symmetry.canonicalize(after)[0], symmetry.canonicalize(original)[0]
+        )
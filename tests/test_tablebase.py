@@ -0,0 +1,173 @@
+import numpy as np
+import pytest
+
+from knucklebones_ml import logic, packing, symmetry, tablebase
+from knucklebones_ml.agents import RandomAgent, TablebaseAgent
+
+
+def endgame_boards(num_boards, own_dice, seed=0):
+    """Fill the enemy side at random, then the side to move up to `own_dice` dice."""
+    rng = np.random.default_rng(seed)
+    boards = logic.get_boards(num_boards, 3, 3)
+    for board in boards:
+        for _ in range(rng.integers(1, 7)):
+            columns = np.flatnonzero(logic.get_valid_actions(board)[1])
+            logic.apply_action(rng.integers(1, 7), board, 1, rng.choice(columns))
+        while (board[0] != 0).sum() < own_dice:
+            columns = np.flatnonzero(logic.get_valid_actions(board)[0])
+            logic.apply_action(rng.integers(1, 7), board, 0, rng.choice(columns))
+    return boards
+
+
+@pytest.fixture(scope="module")
+def last_move_table(tmp_path_factory):
+    boards = endgame_boards(40, 8)
+    path = tmp_path_factory.mktemp("tablebase") / "k1.npy"
+    stats = tablebase.generate_tablebase(path, packing.encode(boards), max_empty=1)
+    return boards, path, stats
+
+
+def test_last_moves_are_solved_exactly(last_move_table):
+    boards, path, stats = last_move_table
+    table = tablebase.Tablebase(path)
+    assert stats["exact"] == 1.0
+    assert len(table) == stats["entries"] == 6 * stats["positions_by_empty"][1]
+    assert np.all(np.diff(table.records["key"].astype(np.float64)) > 0)
+
+    dice = np.arange(len(boards)) % 6 + 1
+    result = table.probe(boards, dice)
+    assert result["found"].all()
+    for board, die, i in zip(boards, dice, range(len(boards)), strict=True):
+        column = np.flatnonzero(logic.get_valid_actions(board)[0])
+        assert result["action"][i] == column.item()
+
+        scores = logic.evaluate_board_scores(
+            logic.apply_action(die, board.copy(), 0, column.item())
+        )
+        margin = scores[0] - scores[1]
+        assert result["margin"][i] == margin
+        outcome = [result["win"][i], result["draw"][i], result["loss"][i]]
+        assert outcome == [margin > 0, margin == 0, margin < 0]
+
+
+def test_probe_misses_and_observations(last_move_table):
+    boards, path, _ = last_move_table
+    table = tablebase.Tablebase(path)
+    empty = logic.get_board(3, 3)
+    result = table.probe(np.stack([empty, boards[0]]), np.array([3, 3]))
+    assert result["found"].tolist() == [False, True]
+    assert np.isnan(result["win"][0])
+    assert result["action"][0] == -1
+
+    mask = logic.get_valid_actions(boards[0])[0]
+    observation = {"board": boards[0], "die": 3, "action_mask": mask}
+    assert table.probe_observation(observation)["action"] == np.argmax(mask)
+    assert table.probe_observation({"board": empty, "die": 3}) is None
+
+
+def test_probe_maps_actions_back_to_symmetric_boards(tmp_path):
+    boards = endgame_boards(30, 7, seed=1)
+    tablebase.generate_tablebase(
+        tmp_path / "k2.npy", packing.encode(boards), max_plies=2, num_workers=1
+    )
+    table = tablebase.Tablebase(tmp_path / "k2.npy")
+    mirrored = boards[:, :, :, ::-1]
+    for die in range(1, 7):
+        dice = np.full(len(boards), die)
+        result, flipped = table.probe(boards, dice), table.probe(mirrored, dice)
+        assert result["found"].all()
+        assert np.array_equal(flipped["action"], 2 - result["action"])
+        assert np.array_equal(flipped["margin"], result["margin"])
+        masks = logic.get_valid_actions(boards)[:, 0]
+        assert masks[np.arange(len(boards)), result["action"]].all()
+
+        totals = result["win"] + result["draw"] + result["loss"]
+        np.testing.assert_allclose(totals, 1, rtol=1e-5)
+        assert np.all((result["unresolved"] >= 0) & (result["unresolved"] <= 1))
+
+
+def test_tablebase_does_not_depend_on_workers(tmp_path):
+    boards = packing.encode(endgame_boards(20, 7, seed=2))
+    kwargs = {"max_empty": 2, "max_plies": 2, "chunk_size": 4}
+    tablebase.generate_tablebase(tmp_path / "a.npy", boards, num_workers=1, **kwargs)
+    tablebase.generate_tablebase(tmp_path / "b.npy", boards, num_workers=2, **kwargs)
+    assert np.array_equal(np.load(tmp_path / "a.npy"), np.load(tmp_path / "b.npy"))
+
+
+def test_position_keys_are_unique():
+    codes = symmetry.canonicalize_codes(
+        logic.encode_columns(endgame_boards(50, 6, seed=3))
+    )[0]
+    codes = np.unique(codes, axis=0)
+    keys = tablebase.position_keys(codes[:, None], np.arange(1, 7))
+    assert np.unique(keys).size == keys.size
+
+
+def test_tablebase_agent(last_move_table, tmp_path):
+    boards, path, _ = last_move_table
+    agent = TablebaseAgent(path=path, fallback="RandomAgent")
+    masks = logic.get_valid_actions(boards)[:, 0]
+    observations = {
+        "board": np.concatenate([boards, logic.get_boards(5, 3, 3)]),
+        "die": np.full(len(boards) + 5, 2),
+        "action_mask": np.concatenate([masks, np.ones((5, 3), dtype=masks.dtype)]),
+    }
+    actions = agent.select_actions(observations)
+    assert np.array_equal(actions[: len(boards)], np.argmax(masks, axis=1))
+    assert (agent.hits, agent.misses) == (len(boards), 5)
+    single = {name: value[0] for name, value in observations.items()}
+    assert agent.select_action(single) == actions[0]
+    assert isinstance(agent.fallback, RandomAgent)
+
+    with pytest.raises(ValueError, match="Unknown fallback"):
+        TablebaseAgent(path=path, fallback="Tablebase")
+    np.save(tmp_path / "other.npy", np.zeros(3))
+    with pytest.raises(ValueError, match="not a tablebase"):
+        tablebase.Tablebase(tmp_path / "other.npy")
+
+
+def test_empty_tablebase(tmp_path):
+    boards = logic.get_boards(3, 3, 3)
+    stats = tablebase.generate_tablebase(tmp_path / "empty.npy", packing.encode(boards))
+    assert stats["entries"] == 0
+    table = tablebase.Tablebase(tmp_path / "empty.npy")
+    result = table.probe(boards, np.array([1, 2, 3]))
+    assert not result["found"].any()
+    assert np.isnan(result["win"]).all()
+    assert np.array_equal(result["action"], [-1, -1, -1])
+
+    agent = TablebaseAgent(path=tmp_path / "empty.npy", fallback="ColumnFillAgent")
+    observations = {
+        "board": boards,
+        "die": np.array([1, 2, 3]),
+        "action_mask": np.ones((3, 3), dtype=np.int8),
+    }
+    assert np.all(agent.select_actions(observations) >= 0)
+    assert agent.misses == 3
+
+
+def test_progress_is_reported_after_every_chunk(tmp_path, monkeypatch):
+    events = []
+    solve_chunk = tablebase._solve_chunk  # noqa: SLF001
+
+    def logged_solve_chunk(chunk):  # noqa: ANN202
+        events.append("solve")
+        return solve_chunk(chunk)
+
+    monkeypatch.setattr(tablebase, "_solve_chunk", logged_solve_chunk)
+    boards = packing.encode(endgame_boards(12, 8, seed=4))
+    tablebase.generate_tablebase(
+        tmp_path / "table.npy",
+        boards,
+        max_empty=1,
+        num_workers=1,
+        chunk_size=4,
+        progress=lambda solved, total: events.append((solved, total)),
+    )
+    total = events[-1][1]
+    assert total > 4
+    assert events == [
+        event
+        for start in range(0, total, 4)
+        for event in ("solve", (min(start + 4, total), total))
+    ]
@@ -0,0 +1,97 @@
+import json
+
+import numpy as np
+import pytest
+
+from knucklebones_ml.simulation import (
+    Entrant,
+    MatchupResult,
+    _tournament,
+    fit_ratings,
+    run_tournament,
+)
+
+ENTRANTS = {
+    "random": Entrant("RandomAgent"),
+    "aggressive": Entrant("AggressiveAgent"),
+    "expectimax": Entrant("ExpectimaxAgent", {"depth": 1}),
+}
+
+
+def test_fit_ratings():
+    matchups = [
+        MatchupResult("a", "b", wins=300, losses=100, draws=0, truncated=0),
+        MatchupResult("b", "a", wins=100, losses=300, draws=0, truncated=0),
+        MatchupResult("b", "c", wins=150, losses=150, draws=100, truncated=0),
+        MatchupResult("x", "a", wins=100, losses=0, draws=0, truncated=0),
+    ]
+    ratings, errors = fit_ratings(["a", "b", "c"], matchups, prior=0)
+
+    assert ratings.sum() == pytest.approx(0)
+    assert ratings[0] - ratings[1] == pytest.approx(400 * np.log10(3), rel=1e-4)
+    assert ratings[1] == pytest.approx(ratings[2])
+    assert np.all(errors > 0)
+    assert errors[0] < errors[2]  # a played more games than c
+
+
+def test_run_tournament(tmp_path):
+    checkpoint = tmp_path / "tournament.json"
+    result = run_tournament(
+        ENTRANTS,
+        games_per_matchup=10,
+        seed=0,
+        num_workers=1,
+        checkpoint_path=checkpoint,
+    )
+
+    assert len(result.matchups) == 6
+    assert {(m.player_0, m.player_1) for m in result.matchups} == {
+        (a, b) for a in ENTRANTS for b in ENTRANTS if a != b
+    }
+    assert all(m.wins + m.losses + m.draws == 10 for m in result.matchups)
+    assert np.all(result.lower < result.ratings)
+    assert np.all(result.ratings < result.upper)
+    assert result.to_dataframe()["name"][2] == "random"
+
+    saved = json.loads(checkpoint.read_text())
+    assert saved["seed"] == 0
+    assert len(saved["matchups"]) == 6
+
+    # An interrupted run replays only the missing matchups, with the same results
+    saved["matchups"] = saved["matchups"][:4]
+    checkpoint.write_text(json.dumps(saved))
+    resumed = run_tournament(
+        ENTRANTS, games_per_matchup=10, num_workers=2, checkpoint_path=checkpoint
+    )
+    assert set(resumed.matchups) == set(result.matchups)
+    assert np.allclose(resumed.ratings, result.ratings)
+
+
+def test_run_tournament_skips_finished_matchups(tmp_path, monkeypatch):
+    checkpoint = tmp_path / "tournament.json"
+    entrants = {name: ENTRANTS[name] for name in ("random", "aggressive")}
+    run_tournament(
+        entrants, games_per_matchup=5, num_workers=1, checkpoint_path=checkpoint
+    )
+
+    def fail(task):  # noqa: ANN202
+        raise AssertionError(task)
+
+    monkeypatch.setattr(_tournament, "_play_matchup", fail)
+    result = run_tournament(entrants, games_per_matchup=5, checkpoint_path=checkpoint)
+    assert len(result.matchups) == 2
+
+    with pytest.raises(ValueError, match="different games_per_matchup"):
+        run_tournament(entrants, games_per_matchup=6, checkpoint_path=checkpoint)
+
+    changed = entrants | {"random": Entrant("ColumnFillAgent")}
+    with pytest.raises(ValueError, match="different random"):
+        run_tournament(changed, games_per_matchup=5, checkpoint_path=checkpoint)
+
+
+def test_invalid_entrants():
+    with pytest.raises(ValueError, match="Unknown agent 'NoAgent'"):
+        run_tournament({"a": Entrant("RandomAgent"), "b": Entrant("NoAgent")})
+
+    with pytest.raises(ValueError, match="at least 2 entrants"):
+        run_tournament({"a": Entrant("RandomAgent")})
@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+
+from knucklebones_ml import logic, transitions
+
+
+def test_reachable_codes():
+    assert transitions.REACHABLE_CODES.sum() == 1 + 6 + 6**2 + 6**3
+    assert transitions.REACHABLE_CODES[logic.encode_columns(np.array([[1], [2], [3]]))]
+    assert not transitions.REACHABLE_CODES[
+        logic.encode_columns(np.array([[1], [0], [3]]))
+    ]
+
+
+def test_every_entry_matches_apply_action():
+    codes = np.flatnonzero(transitions.REACHABLE_CODES)
+    own, enemy, dice = np.meshgrid(codes, codes, np.arange(1, 7), indexing="ij")
+    own, enemy, dice = own.ravel(), enemy.ravel(), dice.ravel()
+    playable = logic.COLUMN_CELLS[own, 0] == 0
+
+    boards = np.zeros((own.size, 2, 3, 1), dtype=np.int16)
+    boards[:, 0, :, 0] = logic.COLUMN_CELLS[own]
+    boards[:, 1, :, 0] = logic.COLUMN_CELLS[enemy]
+    before = logic.evaluate_board_scores_batch(boards)
+    after_boards = boards.copy()
+    after_boards[playable] = logic.apply_action_batch(
+        dice[playable], boards[playable], 0, 0
+    )
+    after = logic.evaluate_board_scores_batch(after_boards)
+    expected_codes = logic.encode_columns(after_boards)[:, :, 0]
+
+    new_own, new_enemy, own_deltas, enemy_deltas = transitions.lookup(own, enemy, dice)
+    assert np.array_equal(new_own[playable], expected_codes[playable, 0])
+    assert np.all(new_own[~playable] == -1)
+    assert np.array_equal(new_enemy[playable], expected_codes[playable, 1])
+    assert np.array_equal(own_deltas[playable], (after - before)[playable, 0])
+    assert np.array_equal(enemy_deltas[playable], (after - before)[playable, 1])
+
+    # The scalar reference on a sample of entries
+    rng = np.random.default_rng(0)
+    for i in rng.choice(np.flatnonzero(playable), size=500, replace=False):
+        board = logic.get_board(3, 1)
+        board[:, :, 0] = logic.COLUMN_CELLS[[own[i], enemy[i]]]
+        logic.apply_action(dice[i], board, 0, 0)
+        assert np.array_equal(
+            logic.encode_columns(board)[:, 0], [new_own[i], new_enemy[i]]
+        )
+
+
+def test_apply_action_codes(sample_board_mixed):
+    codes = logic.encode_columns(sample_board_mixed)
+    expected = logic.apply_action(4, sample_board_mixed.copy(), 0, 0)
+    assert transitions.apply_action(4, codes, 0, 0) is codes
+    assert np.array_equal(codes, logic.encode_columns(expected))
+
+    with pytest.raises(ValueError, match=r"Column 1 is full."):
+        transitions.apply_action(4, codes, 0, 1)
+
+
+def test_apply_action_codes_batch():
+    rng = np.random.default_rng(1)
+    boards = logic.get_boards(400, 3, 3)
+    codes = logic.encode_columns(boards)
+    for _ in range(15):
+        sides = rng.integers(0, 2, size=400)
+        valid = logic.get_valid_actions_batch(boards)[np.arange(400), sides]
+        playable = valid.any(axis=1) & ~logic.board_is_full_batch(boards)
+        dice = rng.integers(1, 7, size=400)[playable]
+        actions = np.argmax(valid[playable] * rng.random((dice.size, 3)), axis=1)
+
+        played = boards[playable]
+        logic.apply_action_batch(dice, played, sides[playable], actions)
+        boards[playable] = played
+        played = codes[playable]
+        transitions.apply_action_batch(dice, played, sides[playable], actions)
+        codes[playable] = played
+
+        assert np.array_equal(codes, logic.encode_columns(boards))
+
+    full = np.flatnonzero(logic.board_is_full_batch(boards))[0]
+    column = np.flatnonzero(logic.get_valid_actions(boards[full])[0] == 0)[0]
+    with pytest.raises(ValueError, match=rf"Column {column} is full on board 0."):
+        transitions.apply_action_batch(1, codes[[full]], 0, column)
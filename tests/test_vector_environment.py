@@ -0,0 +1,67 @@
+import numpy as np
+
+import knucklebones_ml
+from knucklebones_ml import VectorKnucklebonesEnv
+
+
+def test_vector_env_matches_single_env():
+    num_envs = 8
+    venv = VectorKnucklebonesEnv(num_envs)
+    obs = venv.reset(seed=1)
+    envs = [knucklebones_ml.env() for _ in range(num_envs)]
+    for i, game_env in enumerate(envs):
+        game_env.reset()
+        game_env.unwrapped.die = obs["die"][i]  # Share the dice of the vector env
+
+    rng = np.random.default_rng(2)
+    finished = 0
+    for _ in range(60):
+        actions = np.argmax(obs["action_mask"] * rng.random((num_envs, 3)), axis=1)
+        obs, rewards, terminations, truncations, infos = venv.step(actions)
+
+        for i, game_env in enumerate(envs):
+            game_env.step(actions[i])
+            assert game_env.rewards["player_0"] == rewards[i, 0]
+            assert game_env.rewards["player_1"] == rewards[i, 1]
+            assert game_env.terminations["player_0"] == terminations[i]
+            assert game_env.truncations["player_0"] == truncations[i]
+
+            if terminations[i]:
+                j = np.flatnonzero(infos["done_indices"] == i)[0]
+                assert np.array_equal(
+                    infos["final_boards"][j], game_env.unwrapped.board
+                )
+                game_env.reset()
+                finished += 1
+
+            game_env.unwrapped.die = obs["die"][i]
+            expected = game_env.last()[0]
+            assert np.array_equal(obs["board"][i], expected["board"])
+            assert np.array_equal(obs["action_mask"][i], expected["action_mask"])
+
+    assert finished > 0
+
+
+def test_vector_env_illegal_action():
+    venv = VectorKnucklebonesEnv(2)
+    venv.reset(seed=0)
+    venv.boards[0, 0, :, 1] = 4
+    _, rewards, terminations, truncations, infos = venv.step(np.array([1, 1]))
+
+    assert np.array_equal(rewards[0], [-10, 0])
+    assert terminations[0]
+    assert truncations[0]
+    assert not terminations[1]
+    assert np.array_equal(infos["done_indices"], [0])
+    assert np.all(venv.boards[0] == 0)
+
+
+def test_vector_env_truncation():
+    venv = VectorKnucklebonesEnv(4, max_steps=5)
+    venv.reset(seed=0)
+    for _ in range(4):
+        _, _, _, truncations, _ = venv.step(np.zeros(4, dtype=int))
+        assert not truncations.any()
+    _, _, _, truncations, _ = venv.step(np.zeros(4, dtype=int))
+    assert truncations.all()
+    assert np.all(venv.timesteps == 0)